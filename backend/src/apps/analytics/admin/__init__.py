@@ -11,6 +11,7 @@ from unfold.contrib.filters.admin import RangeDateFilter
 from unfold.decorators import display
 
 from apps.analytics.models import AnalyticsEvent, DailyStats, EventType, CustomerStats
+from apps.analytics.services import dashboard
 
 
 @admin.register(DailyStats)
@@ -137,16 +138,7 @@ class DailyStatsAdmin(ModelAdmin):
     @display(description='Топ товаров по кликам')
     def show_top_products(self, obj):
         """Показывает топ-10 товаров по кликам за день."""
-        top_products = AnalyticsEvent.objects.filter(
-            event_date=obj.date,
-            event_type__in=[EventType.PRODUCT_CLICK, EventType.PRODUCT_VIEW],
-            product__isnull=False
-        ).values(
-            'product__id', 'product__title', 'product__slug'
-        ).annotate(
-            clicks=Count('id', filter=Q(event_type=EventType.PRODUCT_CLICK)),
-            views=Count('id', filter=Q(event_type=EventType.PRODUCT_VIEW)),
-        ).order_by('-clicks', '-views')[:10]
+        top_products = dashboard.top_products(obj.date)
 
         if not top_products:
             return format_html('<span style="color: #9ca3af;">Нет данных</span>')
@@ -177,13 +169,7 @@ class DailyStatsAdmin(ModelAdmin):
     @display(description='Топ поисковых запросов')
     def show_top_searches(self, obj):
         """Показывает топ-10 поисковых запросов за день."""
-        top_searches = AnalyticsEvent.objects.filter(
-            event_date=obj.date,
-            event_type=EventType.SEARCH,
-            search_query__gt=''
-        ).values('search_query').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
+        top_searches = dashboard.top_searches(obj.date)
 
         if not top_searches:
             return format_html('<span style="color: #9ca3af;">Нет данных</span>')
@@ -212,15 +198,7 @@ class DailyStatsAdmin(ModelAdmin):
     @display(description='Топ категорий')
     def show_top_categories(self, obj):
         """Показывает топ категорий по кликам за день."""
-        top_categories = AnalyticsEvent.objects.filter(
-            event_date=obj.date,
-            event_type=EventType.CATEGORY_VIEW,
-            category__isnull=False
-        ).values(
-            'category__id', 'category__title'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
+        top_categories = dashboard.top_categories(obj.date)
 
         if not top_categories:
             return format_html('<span style="color: #9ca3af;">Нет данных</span>')
@@ -249,16 +227,7 @@ class DailyStatsAdmin(ModelAdmin):
     @display(description='Активность корзины по товарам')
     def show_cart_products(self, obj):
         """Показывает товары с активностью в корзине."""
-        cart_activity = AnalyticsEvent.objects.filter(
-            event_date=obj.date,
-            event_type__in=[EventType.CART_ADD, EventType.CART_REMOVE],
-            product__isnull=False
-        ).values(
-            'product__id', 'product__title'
-        ).annotate(
-            adds=Count('id', filter=Q(event_type=EventType.CART_ADD)),
-            removes=Count('id', filter=Q(event_type=EventType.CART_REMOVE)),
-        ).order_by('-adds')[:10]
+        cart_activity = dashboard.cart_products(obj.date)
 
         if not cart_activity:
             return format_html('<span style="color: #9ca3af;">Нет данных</span>')
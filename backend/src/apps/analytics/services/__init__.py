@@ -1 +1,14 @@
 """Analytics services."""
+from apps.analytics.services.dashboard import (
+    cart_products,
+    top_categories,
+    top_products,
+    top_searches,
+)
+
+__all__ = [
+    'cart_products',
+    'top_categories',
+    'top_products',
+    'top_searches',
+]
@@ -0,0 +1,81 @@
+"""
+Cached queries behind the DailyStats admin widgets.
+
+Each widget aggregates one day of AnalyticsEvent rows. The results are
+cached per day for ANALYTICS_WIDGET_CACHE_TTL seconds and recomputed by
+one worker at a time, so several staff members opening the dashboard
+don't run the same aggregation in parallel.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from apps.analytics.models import AnalyticsEvent, EventType
+from apps.core.services.computation import cached_computation
+
+TTL = settings.ANALYTICS_WIDGET_CACHE_TTL
+
+
+@cached_computation('analytics:top_products', ttl=TTL)
+def top_products(day: date) -> list[dict]:
+    """Top 10 products of the day by clicks, then views."""
+    return list(
+        AnalyticsEvent.objects.filter(
+            event_date=day,
+            event_type__in=[EventType.PRODUCT_CLICK, EventType.PRODUCT_VIEW],
+            product__isnull=False
+        ).values(
+            'product__id', 'product__title', 'product__slug'
+        ).annotate(
+            clicks=Count('id', filter=Q(event_type=EventType.PRODUCT_CLICK)),
+            views=Count('id', filter=Q(event_type=EventType.PRODUCT_VIEW)),
+        ).order_by('-clicks', '-views')[:10]
+    )
+
+
+@cached_computation('analytics:top_searches', ttl=TTL)
+def top_searches(day: date) -> list[dict]:
+    """Top 10 search queries of the day."""
+    return list(
+        AnalyticsEvent.objects.filter(
+            event_date=day,
+            event_type=EventType.SEARCH,
+            search_query__gt=''
+        ).values('search_query').annotate(
+            count=Count('id')
+        ).order_by('-count')[:10]
+    )
+
+
+@cached_computation('analytics:top_categories', ttl=TTL)
+def top_categories(day: date) -> list[dict]:
+    """Top 10 categories of the day by views."""
+    return list(
+        AnalyticsEvent.objects.filter(
+            event_date=day,
+            event_type=EventType.CATEGORY_VIEW,
+            category__isnull=False
+        ).values(
+            'category__id', 'category__title'
+        ).annotate(
+            count=Count('id')
+        ).order_by('-count')[:10]
+    )
+
+
+@cached_computation('analytics:cart_products', ttl=TTL)
+def cart_products(day: date) -> list[dict]:
+    """Top 10 products of the day by cart additions, with removals."""
+    return list(
+        AnalyticsEvent.objects.filter(
+            event_date=day,
+            event_type__in=[EventType.CART_ADD, EventType.CART_REMOVE],
+            product__isnull=False
+        ).values(
+            'product__id', 'product__title'
+        ).annotate(
+            adds=Count('id', filter=Q(event_type=EventType.CART_ADD)),
+            removes=Count('id', filter=Q(event_type=EventType.CART_REMOVE)),
+        ).order_by('-adds')[:10]
+    )
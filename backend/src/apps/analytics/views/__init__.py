@@ -3,14 +3,32 @@ from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
 from apps.analytics.models import AnalyticsEvent
 from apps.analytics.serializers import BatchTrackEventSerializer, TrackEventSerializer
+from apps.core.async_views import AsyncAPIView
+from apps.core.throttling import TokenBucketThrottle
 from apps.products.models import Category, Product
 
 
-class TrackEventView(APIView):
+async def _existing_ids(events: list[dict]) -> tuple[set[int], set[int]]:
+    """
+    Существующие product_id и category_id из событий.
+
+    Два запроса на пакет вместо двух на событие; ссылки на удалённые
+    товары и категории сохраняются как NULL.
+    """
+    product_ids = {event['product_id'] for event in events if event.get('product_id')}
+    category_ids = {event['category_id'] for event in events if event.get('category_id')}
+
+    if product_ids:
+        product_ids = {pk async for pk in Product.objects.filter(id__in=product_ids).values_list('id', flat=True)}
+    if category_ids:
+        category_ids = {pk async for pk in Category.objects.filter(id__in=category_ids).values_list('id', flat=True)}
+    return product_ids, category_ids
+
+
+class TrackEventView(AsyncAPIView):
     """
     Трекинг событий аналитики.
 
@@ -18,36 +36,23 @@ class TrackEventView(APIView):
     """
 
     permission_classes = [AllowAny]  # Разрешаем анонимные события
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'analytics_track'
 
-    def post(self, request):
+    async def post(self, request):
         serializer = TrackEventSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         data = serializer.validated_data
         user = request.user if request.user.is_authenticated else None
-
-        # Получаем связанные объекты
-        product = None
-        category = None
-
-        if data.get('product_id'):
-            try:
-                product = Product.objects.get(id=data['product_id'])
-            except Product.DoesNotExist:
-                pass
-
-        if data.get('category_id'):
-            try:
-                category = Category.objects.get(id=data['category_id'])
-            except Category.DoesNotExist:
-                pass
+        product_ids, category_ids = await _existing_ids([data])
 
         # Создаём событие
-        AnalyticsEvent.objects.create(
+        await AnalyticsEvent.objects.acreate(
             user=user,
             event_type=data['event_type'],
-            product=product,
-            category=category,
+            product_id=data.get('product_id') if data.get('product_id') in product_ids else None,
+            category_id=data.get('category_id') if data.get('category_id') in category_ids else None,
             search_query=data.get('search_query', ''),
             metadata=data.get('metadata', {}),
             session_id=data.get('session_id', ''),
@@ -57,7 +62,7 @@ class TrackEventView(APIView):
         return Response({'status': 'ok'}, status=status.HTTP_201_CREATED)
 
 
-class BatchTrackEventView(APIView):
+class BatchTrackEventView(AsyncAPIView):
     """
     Пакетный трекинг событий.
 
@@ -65,43 +70,33 @@ class BatchTrackEventView(APIView):
     """
 
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'analytics_batch'
 
-    def post(self, request):
+    async def post(self, request):
         serializer = BatchTrackEventSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
+        events = serializer.validated_data['events']
         user = request.user if request.user.is_authenticated else None
         today = timezone.now().date()
+        product_ids, category_ids = await _existing_ids(events)
 
-        events_to_create = []
-        for event_data in serializer.validated_data['events']:
-            product = None
-            category = None
-
-            if event_data.get('product_id'):
-                try:
-                    product = Product.objects.get(id=event_data['product_id'])
-                except Product.DoesNotExist:
-                    pass
-
-            if event_data.get('category_id'):
-                try:
-                    category = Category.objects.get(id=event_data['category_id'])
-                except Category.DoesNotExist:
-                    pass
-
-            events_to_create.append(AnalyticsEvent(
+        events_to_create = [
+            AnalyticsEvent(
                 user=user,
                 event_type=event_data['event_type'],
-                product=product,
-                category=category,
+                product_id=event_data.get('product_id') if event_data.get('product_id') in product_ids else None,
+                category_id=event_data.get('category_id') if event_data.get('category_id') in category_ids else None,
                 search_query=event_data.get('search_query', ''),
                 metadata=event_data.get('metadata', {}),
                 session_id=event_data.get('session_id', ''),
                 event_date=today,
-            ))
+            )
+            for event_data in events
+        ]
 
-        AnalyticsEvent.objects.bulk_create(events_to_create)
+        await AnalyticsEvent.objects.abulk_create(events_to_create)
 
         return Response(
             {'status': 'ok', 'count': len(events_to_create)},
@@ -1,17 +1,28 @@
-from django.contrib import admin
-from unfold.admin import ModelAdmin, TabularInline
+from collections import Counter
 
-from apps.bot.models import Broadcast, BroadcastLog, BotAdmin
+from django.contrib import admin
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+from unfold.admin import ModelAdmin
 
+from apps.bot.models import (
+    Broadcast,
+    BroadcastLog,
+    BroadcastLogStatus,
+    BroadcastSegment,
+    BroadcastStatus,
+    BotAdmin,
+    NotificationOutbox,
+    OutboxStatus,
+)
+from apps.bot.services.outbox import kick_dispatcher
+from apps.bot.services.segments import count_segment
 
-class BroadcastLogInline(TabularInline):
-    model = BroadcastLog
-    extra = 0
-    readonly_fields = ['user', 'telegram_id', 'status', 'error_message', 'sent_at']
-    can_delete = False
 
-    def has_add_permission(self, request, obj=None):
-        return False
+# Error messages shown in the histogram on the broadcast page
+TOP_ERRORS_LIMIT = 10
 
 
 @admin.register(Broadcast)
@@ -21,17 +32,21 @@ class BroadcastAdmin(ModelAdmin):
         'recipients_display',
         'content_type',
         'status',
+        'scheduled_at',
         'total_recipients',
         'sent_count',
         'failed_count',
         'created_at',
     ]
     list_filter = ['status', 'content_type', 'created_at']
+    list_select_related = ['segment']
     search_fields = ['text', 'recipients_usernames']
     readonly_fields = [
         'recipients_usernames',
+        'segment',
         'status',
         'total_recipients',
+        'recipients_materialized',
         'sent_count',
         'failed_count',
         'created_by',
@@ -39,12 +54,13 @@ class BroadcastAdmin(ModelAdmin):
         'started_at',
         'completed_at',
         'created_at',
+        'show_delivery_summary',
+        'show_error_histogram',
     ]
-    inlines = [BroadcastLogInline]
 
     fieldsets = (
         ('Получатели', {
-            'fields': ('recipients_usernames',),
+            'fields': ('segment', 'recipients_usernames'),
         }),
         ('Контент', {
             'fields': ('content_type', 'text', 'file_id'),
@@ -52,16 +68,113 @@ class BroadcastAdmin(ModelAdmin):
         ('Статус', {
             'fields': ('status',),
         }),
+        ('Расписание', {
+            'fields': ('scheduled_at', ('window_start', 'window_end'), 'max_per_minute'),
+            'description': 'Окно и лимит распределяют отправку во времени; время местное',
+        }),
         ('Статистика', {
-            'fields': ('total_recipients', 'sent_count', 'failed_count'),
+            'fields': ('total_recipients', 'recipients_materialized', 'sent_count', 'failed_count'),
+        }),
+        ('Доставка', {
+            'fields': ('show_delivery_summary', 'show_error_histogram'),
         }),
         ('Информация', {
             'fields': ('created_by', 'created_by_telegram_id', 'created_at', 'started_at', 'completed_at'),
         }),
     )
 
+    actions = ['cancel_broadcasts']
+
+    @admin.action(description='Отменить рассылку')
+    def cancel_broadcasts(self, request, queryset):
+        # Sending stops before the next batch; already sent messages stay sent
+        updated = queryset.filter(
+            status__in=[BroadcastStatus.DRAFT, BroadcastStatus.PENDING, BroadcastStatus.SENDING],
+        ).update(status=BroadcastStatus.CANCELLED, completed_at=timezone.now())
+        self.message_user(request, f'Отменено: {updated}')
+
+    def _delivery_stats(self, obj) -> tuple[Counter, Counter]:
+        """
+        Считает логи по статусам и ошибкам одним GROUP BY запросом.
+
+        Результат кешируется на объекте: его используют два поля страницы.
+        """
+        if not hasattr(obj, '_delivery_stats'):
+            by_status, by_error = Counter(), Counter()
+            rows = (
+                BroadcastLog.objects
+                .filter(broadcast=obj)
+                .order_by()
+                .values('status', 'error_message')
+                .annotate(count=Count('id'))
+            )
+            for row in rows:
+                by_status[row['status']] += row['count']
+                if row['error_message']:
+                    by_error[row['error_message']] += row['count']
+            obj._delivery_stats = (by_status, by_error)
+        return obj._delivery_stats
+
+    def _logs_url(self, obj, **filters) -> str:
+        query = '&'.join(f'{key}={value}' for key, value in {'broadcast__id__exact': obj.pk, **filters}.items())
+        return f"{reverse('admin:bot_broadcastlog_changelist')}?{query}"
+
+    @admin.display(description='Статусы доставки')
+    def show_delivery_summary(self, obj):
+        """Количество логов по каждому статусу со ссылками на отфильтрованный список."""
+        if not obj.pk:
+            return '-'
+
+        by_status, _ = self._delivery_stats(obj)
+        if not by_status:
+            return format_html('<span style="color: #9ca3af;">Нет логов</span>')
+
+        items = format_html_join(
+            ' · ',
+            '<a href="{}" style="color: #6366f1;">{}: {}</a>',
+            (
+                (self._logs_url(obj, status__exact=status.value), status.label, by_status.get(status.value, 0))
+                for status in BroadcastLogStatus
+            ),
+        )
+        return format_html(
+            '{}<br><a href="{}">Все логи ({})</a>',
+            items,
+            self._logs_url(obj),
+            sum(by_status.values()),
+        )
+
+    @admin.display(description='Частые ошибки')
+    def show_error_histogram(self, obj):
+        """Топ сообщений об ошибках с количеством."""
+        if not obj.pk:
+            return '-'
+
+        _, by_error = self._delivery_stats(obj)
+        if not by_error:
+            return format_html('<span style="color: #9ca3af;">Ошибок нет</span>')
+
+        rows = format_html_join(
+            '',
+            '<tr><td style="padding: 4px 8px;">{}</td>'
+            '<td style="text-align: right; padding: 4px 8px;">{}</td></tr>',
+            ((message[:200], count) for message, count in by_error.most_common(TOP_ERRORS_LIMIT)),
+        )
+        return format_html(
+            '<table style="width: 100%; border-collapse: collapse;">'
+            '<thead><tr style="background: #f9fafb;">'
+            '<th style="text-align: left; padding: 8px;">Ошибка</th>'
+            '<th style="text-align: right; padding: 8px;">Кол-во</th>'
+            '</tr></thead>'
+            '<tbody>{}</tbody>'
+            '</table>',
+            rows,
+        )
+
     @admin.display(description='Получатели')
     def recipients_display(self, obj):
+        if obj.segment_id:
+            return f"#{obj.segment}"
         usernames = obj.recipients_usernames or []
         if not usernames:
             return '-'
@@ -70,14 +183,81 @@ class BroadcastAdmin(ModelAdmin):
         return f"@{usernames[0]}, @{usernames[1]}... (+{len(usernames) - 2})"
 
 
+@admin.register(BroadcastSegment)
+class BroadcastSegmentAdmin(ModelAdmin):
+    list_display = ['name', 'slug', 'is_active', 'created_at']
+    list_filter = ['is_active']
+    search_fields = ['name', 'slug', 'description']
+    prepopulated_fields = {'slug': ('name',)}
+    readonly_fields = ['show_audience_size', 'created_at']
+
+    fieldsets = (
+        (None, {
+            'fields': ('name', 'slug', 'description', 'is_active'),
+            'description': 'В боте сегмент выбирается командой /broadcast и вводом #код.',
+        }),
+        ('Фильтры', {
+            'fields': (
+                'joined_within_days',
+                'ordered_within_days',
+                'favorite_category',
+                ('event_type', 'event_within_days'),
+            ),
+            'description': 'Заполненные фильтры объединяются через И.',
+        }),
+        ('Аудитория', {
+            'fields': ('show_audience_size', 'created_at'),
+        }),
+    )
+
+    @admin.display(description='Получателей сейчас')
+    def show_audience_size(self, obj):
+        if not obj.pk:
+            return '-'
+        return count_segment(obj)
+
+
 @admin.register(BroadcastLog)
 class BroadcastLogAdmin(ModelAdmin):
-    list_display = ['id', 'broadcast', 'telegram_id', 'status', 'sent_at']
+    list_display = ['id', 'broadcast', 'user', 'telegram_id', 'status', 'error_message', 'sent_at']
     list_filter = ['status', 'broadcast']
+    list_select_related = ['broadcast', 'user']
+    list_per_page = 100
+    # Avoid an unfiltered COUNT(*) over all logs on every page
+    show_full_result_count = False
     search_fields = ['telegram_id', 'error_message']
     readonly_fields = ['broadcast', 'user', 'telegram_id', 'status', 'error_message', 'sent_at', 'created_at']
 
 
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(ModelAdmin):
+    list_display = ['id', 'kind', 'telegram_id', 'order', 'status', 'attempts', 'available_at', 'sent_at']
+    list_filter = ['status', 'kind']
+    list_select_related = ['order']
+    list_per_page = 100
+    show_full_result_count = False
+    search_fields = ['telegram_id', 'order__id']
+    readonly_fields = [
+        'kind', 'telegram_id', 'order', 'method', 'payload', 'status',
+        'attempts', 'last_error', 'available_at', 'created_at', 'sent_at',
+    ]
+    actions = ['retry_now']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Отправить повторно')
+    def retry_now(self, request, queryset):
+        # Строки в отправке не трогаем, иначе сообщение уйдёт дважды
+        updated = queryset.exclude(status__in=[OutboxStatus.SENT, OutboxStatus.SENDING]).update(
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            available_at=timezone.now(),
+        )
+        kick_dispatcher()
+        self.message_user(request, f'Поставлено в очередь: {updated}')
+
+
 @admin.register(BotAdmin)
 class BotAdminAdmin(ModelAdmin):
     list_display = ['username', 'telegram_id', 'first_name', 'is_active', 'created_at']
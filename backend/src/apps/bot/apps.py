@@ -5,3 +5,6 @@ class BotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.bot'
     verbose_name = 'Telegram Bot'
+
+    def ready(self):
+        from apps.bot import signals  # noqa: F401
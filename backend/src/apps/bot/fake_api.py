@@ -0,0 +1,275 @@
+"""
+Fake Telegram Bot API for load and integration testing.
+
+A dependency-free ASGI app that answers the Bot API methods the project
+uses, with configurable latency, 429 flood-wait injection, blocked users
+and throughput counters. Run it with:
+
+    python manage.py fakebotapi --port 8081 --latency 0.05 --max-per-second 30
+
+and point the project at it:
+
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8081
+
+Counters are served at GET /__stats__ and reset with POST /__reset__.
+"""
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from email import policy
+from email.parser import BytesParser
+from urllib.parse import parse_qsl
+
+
+@dataclass
+class FakeBotAPIConfig:
+    """Behaviour knobs of the fake server."""
+    latency: float = 0.0  # seconds added to every call
+    latency_jitter: float = 0.0  # extra random 0..jitter seconds
+    flood_rate: float = 0.0  # probability of a random 429 response
+    retry_after: int = 1  # retry_after returned with 429
+    max_per_second: int = 0  # global send limit, 0 = unlimited
+    blocked_chat_ids: set[int] = field(default_factory=set)  # answer 403 "blocked"
+
+
+# Methods that deliver a message to a chat (subject to limits and blocks)
+SEND_METHODS = {
+    'sendMessage': None,
+    'sendPhoto': 'photo',
+    'sendVideo': 'video',
+    'sendDocument': 'document',
+    'sendVoice': 'voice',
+}
+
+
+class FakeBotAPI:
+    """ASGI application emulating api.telegram.org."""
+
+    def __init__(self, config: FakeBotAPIConfig | None = None):
+        self.config = config or FakeBotAPIConfig()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset counters."""
+        self.started_at = time.monotonic()
+        self.calls: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.delivered = 0
+        self.uploads = 0
+        self._message_id = 0
+        self._recent: deque = deque()
+        self.webhook_url = ''
+
+    def stats(self) -> dict:
+        """Throughput counters."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        total = sum(self.calls.values())
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'total_calls': total,
+            'calls_per_second': round(total / elapsed, 2),
+            'delivered': self.delivered,
+            'delivered_per_second': round(self.delivered / elapsed, 2),
+            'uploads': self.uploads,
+            'by_method': dict(self.calls),
+            'by_status': {str(code): count for code, count in self.statuses.items()},
+        }
+
+    # === ASGI ===
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        status, payload = await self.handle(scope, body)
+        raw = json.dumps(payload).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(raw)).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': raw})
+
+    async def handle(self, scope, body: bytes) -> tuple[int, dict]:
+        """Route a request: /bot<token>/<method> or service endpoints."""
+        path = scope['path']
+
+        if path == '/__stats__':
+            return 200, self.stats()
+        if path == '/__reset__':
+            self.reset()
+            return 200, {'ok': True}
+
+        parts = path.strip('/').split('/')
+        if len(parts) != 2 or not parts[0].startswith('bot'):
+            return 404, {'ok': False, 'error_code': 404, 'description': 'Not Found'}
+
+        method = parts[1]
+        params = self._parse_params(scope, body)
+        self.calls[method] += 1
+
+        delay = self.config.latency + random.uniform(0, self.config.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        status, payload = self._dispatch(method, params)
+        self.statuses[status] += 1
+        return status, payload
+
+    # === Bot API ===
+
+    def _dispatch(self, method: str, params: dict) -> tuple[int, dict]:
+        if method == 'getMe':
+            return self._ok({
+                'id': 1000000001,
+                'is_bot': True,
+                'first_name': 'Fake Bot',
+                'username': 'fake_bot',
+                'can_join_groups': True,
+                'can_read_all_group_messages': False,
+                'supports_inline_queries': True,
+            })
+
+        if method == 'setWebhook':
+            self.webhook_url = params.get('url', '')
+            return self._ok(True)
+
+        if method == 'deleteWebhook':
+            self.webhook_url = ''
+            return self._ok(True)
+
+        if method == 'getWebhookInfo':
+            return self._ok({
+                'url': self.webhook_url,
+                'has_custom_certificate': False,
+                'pending_update_count': 0,
+            })
+
+        if method in SEND_METHODS:
+            return self._send(method, params)
+
+        return 404, {'ok': False, 'error_code': 404, 'description': 'Not Found: method not found'}
+
+    def _send(self, method: str, params: dict) -> tuple[int, dict]:
+        try:
+            chat_id = int(params.get('chat_id'))
+        except (TypeError, ValueError):
+            return self._error(400, 'Bad Request: chat_id is empty')
+
+        if self._flooded():
+            return 429, {
+                'ok': False,
+                'error_code': 429,
+                'description': f'Too Many Requests: retry after {self.config.retry_after}',
+                'parameters': {'retry_after': self.config.retry_after},
+            }
+
+        if chat_id in self.config.blocked_chat_ids:
+            return self._error(403, 'Forbidden: bot was blocked by the user')
+
+        self._message_id += 1
+        self.delivered += 1
+        self.uploads += params.get('_uploads', 0)
+        message = {
+            'message_id': self._message_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+        }
+
+        media_field = SEND_METHODS[method]
+        if media_field is None:
+            message['text'] = params.get('text', '')
+        else:
+            file_id = str(params.get(media_field) or f'fake-{media_field}-{self._message_id}')
+            media = {'file_id': file_id, 'file_unique_id': file_id[-16:]}
+            if media_field == 'photo':
+                message['photo'] = [{**media, 'width': 1280, 'height': 1280}]
+            elif media_field == 'voice':
+                message['voice'] = {**media, 'duration': 1}
+            elif media_field == 'video':
+                message['video'] = {**media, 'width': 1280, 'height': 720, 'duration': 1}
+            else:
+                message['document'] = media
+            if params.get('caption'):
+                message['caption'] = params['caption']
+
+        return self._ok(message)
+
+    def _flooded(self) -> bool:
+        if self.config.flood_rate and random.random() < self.config.flood_rate:
+            return True
+
+        if self.config.max_per_second:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.config.max_per_second:
+                return True
+            self._recent.append(now)
+
+        return False
+
+    # === Helpers ===
+
+    @staticmethod
+    def _parse_params(scope, body: bytes) -> dict:
+        """Parse JSON or form-encoded parameters (python-telegram-bot sends forms)."""
+        if not body:
+            return dict(parse_qsl(scope.get('query_string', b'').decode()))
+
+        headers = dict(scope.get('headers') or [])
+        content_type = headers.get(b'content-type', b'').decode()
+
+        if content_type.startswith('application/json'):
+            try:
+                return json.loads(body)
+            except ValueError:
+                return {}
+
+        if content_type.startswith('multipart/form-data'):
+            message = BytesParser(policy=policy.HTTP).parsebytes(
+                f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+            )
+            params = {}
+            for part in message.iter_parts():
+                name = part.get_param('name', header='content-disposition')
+                if part.get_filename():
+                    # Uploaded file: the fake only needs to know it arrived
+                    params[name] = ''
+                    params['_uploads'] = params.get('_uploads', 0) + 1
+                else:
+                    params[name] = part.get_content()
+            return params
+
+        # Form bodies (python-telegram-bot); values stay strings
+        return dict(parse_qsl(body.decode('utf-8', errors='replace')))
+
+    @staticmethod
+    def _ok(result) -> tuple[int, dict]:
+        return 200, {'ok': True, 'result': result}
+
+    @staticmethod
+    def _error(code: int, description: str) -> tuple[int, dict]:
+        return code, {'ok': False, 'error_code': code, 'description': description}
@@ -1,5 +1,6 @@
 """Bot handlers."""
 from apps.bot.handlers.start import start_command
 from apps.bot.handlers.broadcast import handle_broadcast_command, handle_message
+from apps.bot.handlers.inline import handle_inline_query
 
-__all__ = ['start_command', 'handle_broadcast_command', 'handle_message']
+__all__ = ['start_command', 'handle_broadcast_command', 'handle_message', 'handle_inline_query']
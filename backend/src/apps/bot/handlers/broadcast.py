@@ -1,10 +1,10 @@
 """
 Broadcast handler for admin mass messaging.
 
-Uses database for conversation state (webhook-compatible).
+Conversation state lives in the configured store (Redis or database),
+so it survives between webhook requests.
 """
 import re
-from asgiref.sync import sync_to_async
 
 from telegram import ReplyKeyboardMarkup, ReplyKeyboardRemove, Update
 from telegram.ext import ContextTypes
@@ -12,10 +12,14 @@ from telegram.ext import ContextTypes
 from apps.bot.models import (
     Broadcast,
     BroadcastContentType,
-    BotAdmin,
-    ConversationState,
+    BroadcastSegment,
+    BroadcastStatus,
 )
-from apps.users.models import User
+from apps.bot.services.admins import ais_bot_admin
+from apps.bot.services.broadcast_schedule import BroadcastSchedule, parse_schedule
+from apps.bot.services.conversation import get_conversation_store
+from apps.bot.services.recipients import afind_users_by_usernames
+from apps.bot.services.segments import acount_segment
 
 
 # Conversation states
@@ -23,6 +27,7 @@ STATE_ENTER_USERNAMES = 'broadcast_enter_usernames'
 STATE_CHOOSE_TYPE = 'broadcast_choose_type'
 STATE_RECEIVE_CONTENT = 'broadcast_receive_content'
 STATE_CONFIRM = 'broadcast_confirm'
+STATE_SCHEDULE = 'broadcast_schedule'
 
 # Content type mapping
 CONTENT_TYPE_MAP = {
@@ -45,7 +50,7 @@ CONTENT_TYPE_KEYBOARD = ReplyKeyboardMarkup(
 )
 
 CONFIRM_KEYBOARD = ReplyKeyboardMarkup(
-    [['✅ Запустить', '❌ Отмена']],
+    [['✅ Запустить', '🕒 Запланировать'], ['❌ Отмена']],
     one_time_keyboard=True,
     resize_keyboard=True,
 )
@@ -73,58 +78,37 @@ def _parse_usernames(text: str) -> list[str]:
     return result
 
 
-@sync_to_async
-def _find_users_by_usernames(usernames: list[str]) -> tuple[list[dict], list[str]]:
-    """
-    Find users by their telegram usernames.
-    Returns (found_users, not_found_usernames).
-    """
-    from django.db.models import Q
-
-    found = []
-    not_found = []
-
-    for username in usernames:
-        # Search in both telegram_username and username fields
-        user = User.objects.filter(
-            Q(telegram_username__iexact=username) | Q(username__iexact=username),
-            telegram_id__isnull=False,
-        ).first()
-
-        if user:
-            found.append({
-                'id': user.id,
-                'telegram_id': user.telegram_id,
-                'username': user.telegram_username or user.username,
-            })
-        else:
-            not_found.append(username)
-
-    return found, not_found
+async def _find_segment(slug: str) -> tuple[BroadcastSegment | None, int]:
+    """Find active segment by slug. Returns (segment, audience_size)."""
+    segment = await BroadcastSegment.objects.filter(slug=slug, is_active=True).afirst()
+    if not segment:
+        return None, 0
+    return segment, await acount_segment(segment)
 
 
 async def handle_broadcast_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle /broadcast command."""
     user = update.effective_user
 
-    # Check admin
-    admin = await BotAdmin.aget_and_update(
+    # Check admin (cached; fills telegram_id on first use)
+    is_admin = await ais_bot_admin(
         telegram_id=user.id,
         username=user.username,
     )
 
-    if not admin:
+    if not is_admin:
         await update.message.reply_text("⛔ У вас нет прав для создания рассылок.")
         return
 
     # Set state
-    await ConversationState.aset_state(user.id, STATE_ENTER_USERNAMES, {})
+    await get_conversation_store().aset_state(user.id, STATE_ENTER_USERNAMES, {})
 
     await update.message.reply_text(
         "📢 *Создание рассылки*\n\n"
         "*Шаг 1/3:* Введите @username получателей\n\n"
         "Формат: `@user1 @user2 @user3`\n"
-        "или через запятую: `@user1, @user2, @user3`",
+        "или через запятую: `@user1, @user2, @user3`\n"
+        "или сохранённый сегмент: `#код_сегмента`",
         parse_mode='Markdown',
         reply_markup=CANCEL_KEYBOARD,
     )
@@ -135,7 +119,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user = update.effective_user
 
     # Get current state
-    state, data = await ConversationState.aget_state(user.id)
+    state, data = await get_conversation_store().aget_state(user.id)
 
     if not state:
         return
@@ -152,19 +136,28 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     elif state == STATE_CONFIRM:
         await _handle_confirm(update, user.id, data)
 
+    elif state == STATE_SCHEDULE:
+        await _handle_schedule(update, user.id, data)
+
 
 async def _handle_enter_usernames(update: Update, user_id: int, data: dict) -> None:
     """Handle username input."""
     text = update.message.text
 
     if text == '❌ Отмена':
-        await ConversationState.aclear(user_id)
+        await get_conversation_store().aclear(user_id)
         await update.message.reply_text(
             "Рассылка отменена.",
             reply_markup=ReplyKeyboardRemove(),
         )
         return
 
+    # Saved segment: #slug
+    segment_match = re.fullmatch(r'\s*#([\w-]+)\s*', text or '')
+    if segment_match:
+        await _handle_enter_segment(update, user_id, data, segment_match.group(1).lower())
+        return
+
     # Parse usernames
     usernames = _parse_usernames(text)
 
@@ -179,7 +172,7 @@ async def _handle_enter_usernames(update: Update, user_id: int, data: dict) -> N
         return
 
     # Find users in database
-    found_users, not_found = await _find_users_by_usernames(usernames)
+    found_users, not_found = await afind_users_by_usernames(usernames)
 
     if not found_users:
         await update.message.reply_text(
@@ -204,7 +197,8 @@ async def _handle_enter_usernames(update: Update, user_id: int, data: dict) -> N
     # Save found users to state
     data['recipients'] = found_users
     data['recipients_usernames'] = [u['username'] for u in found_users]
-    await ConversationState.aset_state(user_id, STATE_CHOOSE_TYPE, data)
+    data['recipients_count'] = len(found_users)
+    await get_conversation_store().aset_state(user_id, STATE_CHOOSE_TYPE, data)
 
     await update.message.reply_text(
         f"{response}\n\n"
@@ -214,12 +208,44 @@ async def _handle_enter_usernames(update: Update, user_id: int, data: dict) -> N
     )
 
 
+async def _handle_enter_segment(update: Update, user_id: int, data: dict, slug: str) -> None:
+    """Handle saved segment selection."""
+    segment, audience_size = await _find_segment(slug)
+
+    if not segment:
+        await update.message.reply_text(
+            f"❌ Сегмент `#{slug}` не найден или отключён.",
+            parse_mode='Markdown',
+            reply_markup=CANCEL_KEYBOARD,
+        )
+        return
+
+    if not audience_size:
+        await update.message.reply_text(
+            f"❌ В сегменте «{segment.name}» сейчас нет получателей.",
+            reply_markup=CANCEL_KEYBOARD,
+        )
+        return
+
+    data['segment_id'] = segment.id
+    data['segment_name'] = segment.name
+    data['recipients_count'] = audience_size
+    await get_conversation_store().aset_state(user_id, STATE_CHOOSE_TYPE, data)
+
+    await update.message.reply_text(
+        f"✅ Сегмент «{segment.name}»: {audience_size} чел.\n\n"
+        f"*Шаг 2/3:* Выберите тип контента:",
+        parse_mode='Markdown',
+        reply_markup=CONTENT_TYPE_KEYBOARD,
+    )
+
+
 async def _handle_choose_type(update: Update, user_id: int, data: dict) -> None:
     """Handle content type selection."""
     text = update.message.text
 
     if text == '❌ Отмена':
-        await ConversationState.aclear(user_id)
+        await get_conversation_store().aclear(user_id)
         await update.message.reply_text(
             "Рассылка отменена.",
             reply_markup=ReplyKeyboardRemove(),
@@ -237,7 +263,7 @@ async def _handle_choose_type(update: Update, user_id: int, data: dict) -> None:
 
     # Update state
     data['content_type'] = content_type
-    await ConversationState.aset_state(user_id, STATE_RECEIVE_CONTENT, data)
+    await get_conversation_store().aset_state(user_id, STATE_RECEIVE_CONTENT, data)
 
     prompts = {
         BroadcastContentType.TEXT: "✏️ *Шаг 3/3:* Отправьте текст сообщения:",
@@ -304,14 +330,17 @@ async def _handle_receive_content(
     # Update state with content
     data['text'] = text
     data['file_id'] = file_id
-    await ConversationState.aset_state(user_id, STATE_CONFIRM, data)
+    await get_conversation_store().aset_state(user_id, STATE_CONFIRM, data)
 
     # Build summary
-    recipients_count = len(data.get('recipients', []))
+    recipients_count = data.get('recipients_count', len(data.get('recipients', [])))
     recipients_usernames = data.get('recipients_usernames', [])
-    recipients_list = ', '.join(f"@{u}" for u in recipients_usernames[:5])
-    if len(recipients_usernames) > 5:
-        recipients_list += f" и ещё {len(recipients_usernames) - 5}..."
+    if data.get('segment_id'):
+        recipients_list = f"#{data.get('segment_name')}"
+    else:
+        recipients_list = ', '.join(f"@{u}" for u in recipients_usernames[:5])
+        if len(recipients_usernames) > 5:
+            recipients_list += f" и ещё {len(recipients_usernames) - 5}..."
 
     type_names = {
         BroadcastContentType.TEXT: 'Текст',
@@ -370,13 +399,27 @@ async def _handle_confirm(update: Update, user_id: int, data: dict) -> None:
     text = update.message.text
 
     if text == '❌ Отмена':
-        await ConversationState.aclear(user_id)
+        await get_conversation_store().aclear(user_id)
         await update.message.reply_text(
             "Рассылка отменена.",
             reply_markup=ReplyKeyboardRemove(),
         )
         return
 
+    if text == '🕒 Запланировать':
+        await get_conversation_store().aset_state(user_id, STATE_SCHEDULE, data)
+        await update.message.reply_text(
+            "🕒 *Расписание рассылки* (время московское)\n\n"
+            "Укажите любые части:\n"
+            "• начало: `25.12 09:00`\n"
+            "• окно доставки: `10:00-20:00`\n"
+            "• лимит: `300/мин`\n\n"
+            "Например: `25.12 09:00 10:00-20:00 300/мин`",
+            parse_mode='Markdown',
+            reply_markup=CANCEL_KEYBOARD,
+        )
+        return
+
     if text != '✅ Запустить':
         await update.message.reply_text(
             "Пожалуйста, выберите действие:",
@@ -384,28 +427,76 @@ async def _handle_confirm(update: Update, user_id: int, data: dict) -> None:
         )
         return
 
-    # Create broadcast record
+    await _create_broadcast(update, user_id, data)
+
+
+async def _handle_schedule(update: Update, user_id: int, data: dict) -> None:
+    """Handle schedule input."""
+    text = update.message.text
+
+    if text == '❌ Отмена':
+        await get_conversation_store().aclear(user_id)
+        await update.message.reply_text(
+            "Рассылка отменена.",
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        return
+
+    schedule = parse_schedule(text or '')
+    if schedule is None:
+        await update.message.reply_text(
+            "❌ Не удалось разобрать расписание.\n\n"
+            "Пример: `25.12 09:00 10:00-20:00 300/мин`",
+            parse_mode='Markdown',
+            reply_markup=CANCEL_KEYBOARD,
+        )
+        return
+
+    await _create_broadcast(update, user_id, data, schedule)
+
+
+async def _create_broadcast(
+    update: Update,
+    user_id: int,
+    data: dict,
+    schedule: BroadcastSchedule | None = None,
+) -> None:
+    """Create the broadcast and start it now or leave it to the scheduler."""
     recipients_usernames = data.get('recipients_usernames', [])
+    schedule = schedule or BroadcastSchedule()
+    scheduled = schedule != BroadcastSchedule()
 
-    broadcast = await sync_to_async(Broadcast.objects.create)(
+    broadcast = await Broadcast.objects.acreate(
         recipients_usernames=recipients_usernames,
+        segment_id=data.get('segment_id'),
         content_type=data['content_type'],
         text=data.get('text') or '',
         file_id=data.get('file_id') or '',
         created_by_telegram_id=user_id,
+        status=BroadcastStatus.PENDING,
+        scheduled_at=schedule.scheduled_at,
+        window_start=schedule.window_start,
+        window_end=schedule.window_end,
+        max_per_minute=schedule.max_per_minute,
     )
 
-    # Launch Celery task
-    from apps.bot.tasks import send_broadcast_task
-    send_broadcast_task.delay(broadcast.id)
+    # Scheduled broadcasts are started by the bot.run_scheduled_broadcasts beat task
+    if not scheduled:
+        from apps.bot.tasks import send_broadcast_task
+        send_broadcast_task.delay(broadcast.id)
 
-    recipients_count = len(recipients_usernames)
+    recipients_count = data.get('recipients_count', len(recipients_usernames))
 
     # Clear state
-    await ConversationState.aclear(user_id)
+    await get_conversation_store().aclear(user_id)
+
+    if scheduled:
+        title = f"🕒 *Рассылка #{broadcast.id} запланирована*\n{schedule.describe()}"
+    else:
+        title = f"🚀 *Рассылка #{broadcast.id} запущена!*"
 
     await update.message.reply_text(
-        f"🚀 *Рассылка #{broadcast.id} запущена!*\n\n"
+        f"{title}\n\n"
         f"👥 Получателей: {recipients_count} чел.\n\n"
         f"Статус можно отслеживать в админ-панели.",
         parse_mode='Markdown',
@@ -0,0 +1,90 @@
+"""
+Inline mode handler: `@bot розы` shares product cards in any chat.
+
+Inline mode must be enabled for the bot in @BotFather (/setinline).
+"""
+import logging
+
+from django.conf import settings
+from telegram import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    InlineQueryResultArticle,
+    InlineQueryResultPhoto,
+    InputTextMessageContent,
+    Update,
+)
+from telegram.ext import ContextTypes
+
+from apps.bot.services.inline_search import IndexedProduct, aget_product_index
+
+logger = logging.getLogger(__name__)
+
+# Telegram accepts at most 50 results per answer
+RESULTS_PER_PAGE = 50
+# Seconds Telegram may cache an answer for the same query
+ANSWER_CACHE_TIME = 60
+
+
+def _caption(product: IndexedProduct) -> str:
+    caption = f"🌸 {product.title}\n💰 {product.price_display}"
+    if product.old_price and product.old_price > product.price:
+        old_price = f"{product.old_price // 100:,}".replace(',', ' ') + ' ₽'
+        caption += f" (было {old_price})"
+    return caption
+
+
+def _reply_markup() -> InlineKeyboardMarkup | None:
+    if not settings.TELEGRAM_MINI_APP_URL:
+        return None
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton('Открыть магазин', url=settings.TELEGRAM_MINI_APP_URL),
+    ]])
+
+
+def build_result(product: IndexedProduct):
+    """Photo card when the image has a public URL, text article otherwise."""
+    caption = _caption(product)
+    reply_markup = _reply_markup()
+
+    # Telegram fetches photos itself, so only absolute URLs work
+    if product.image_url and product.image_url.startswith('http'):
+        return InlineQueryResultPhoto(
+            id=str(product.id),
+            photo_url=product.image_url,
+            thumbnail_url=product.image_url,
+            title=product.title,
+            description=product.price_display,
+            caption=caption,
+            reply_markup=reply_markup,
+        )
+
+    return InlineQueryResultArticle(
+        id=str(product.id),
+        title=product.title,
+        description=f"{product.price_display} · {product.category_title}",
+        input_message_content=InputTextMessageContent(caption),
+        reply_markup=reply_markup,
+    )
+
+
+async def handle_inline_query(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Answer an inline query from the in-memory product index."""
+    inline_query = update.inline_query
+    try:
+        offset = int(inline_query.offset or 0)
+    except ValueError:
+        offset = 0
+
+    index = await aget_product_index()
+    products = index.search(inline_query.query, limit=RESULTS_PER_PAGE + 1, offset=offset)
+
+    has_more = len(products) > RESULTS_PER_PAGE
+    products = products[:RESULTS_PER_PAGE]
+
+    await inline_query.answer(
+        [build_result(product) for product in products],
+        cache_time=ANSWER_CACHE_TIME,
+        is_personal=False,
+        next_offset=str(offset + RESULTS_PER_PAGE) if has_more else '',
+    )
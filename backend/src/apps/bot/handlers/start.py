@@ -1,17 +1,15 @@
 """
 Start command handler.
 """
-from asgiref.sync import sync_to_async
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from apps.users.models import User
 
 
-@sync_to_async
-def _get_or_create_user(telegram_id: int, username: str | None, first_name: str | None) -> User:
+async def _get_or_create_user(telegram_id: int, username: str | None, first_name: str | None) -> User:
     """Get or create user by telegram_id and update username."""
-    user, created = User.objects.get_or_create(
+    user, created = await User.objects.aget_or_create(
         telegram_id=telegram_id,
         defaults={
             'username': f'tg_{telegram_id}',
@@ -25,7 +23,7 @@ def _get_or_create_user(telegram_id: int, username: str | None, first_name: str
         username_lower = username.lower()
         if user.telegram_username != username_lower:
             user.telegram_username = username_lower
-            user.save(update_fields=['telegram_username'])
+            await user.asave(update_fields=['telegram_username'])
 
     return user
 
@@ -0,0 +1,90 @@
+"""
+Django management command to benchmark concurrent bot update processing.
+
+Feeds many simultaneous /start updates from distinct users through the
+webhook application (handlers + async ORM), replies go to the fake Bot API:
+
+    python manage.py fakebotapi --latency 0.05 &
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8081 TELEGRAM_BOT_TOKEN=0:fake \\
+        python manage.py benchbotupdates -n 1000 -c 100
+"""
+import asyncio
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from telegram import Update
+
+from apps.bot.views import get_application
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """Measure throughput and latency of concurrent update processing."""
+
+    help = 'Benchmark concurrent /start updates through the bot application'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--updates', type=int, default=500, help='Number of updates')
+        parser.add_argument('-c', '--concurrency', type=int, default=50, help='Updates in flight')
+        parser.add_argument('--first-id', type=int, default=9_000_000_000, help='First synthetic telegram_id')
+        parser.add_argument('--keep-users', action='store_true', help='Do not delete created users')
+
+    def handle(self, *args, **options):
+        if settings.TELEGRAM_API_BASE_URL.startswith('https://api.telegram.org'):
+            self.stdout.write(self.style.ERROR(
+                'Refusing to send replies to the real Bot API. Set TELEGRAM_API_BASE_URL to the fake server.'
+            ))
+            return
+
+        first_id = options['first_id']
+        ids = range(first_id, first_id + options['updates'])
+
+        try:
+            latencies, elapsed = asyncio.run(self._run(ids, options['concurrency']))
+        finally:
+            if not options['keep_users']:
+                User.objects.filter(telegram_id__in=list(ids)).delete()
+
+        latencies.sort()
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        self.stdout.write(
+            f"{len(latencies)} updates, concurrency {options['concurrency']}: "
+            f"{elapsed:.2f}s ({len(latencies) / elapsed:.1f} updates/s), "
+            f"p50={statistics.median(latencies):.1f} ms, p99={p99:.1f} ms"
+        )
+
+    async def _run(self, ids, concurrency: int) -> tuple[list[float], float]:
+        application = await get_application()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+
+        async def process(update_id: int, telegram_id: int) -> None:
+            update = Update.de_json(_start_update(update_id, telegram_id), application.bot)
+            async with semaphore:
+                started = time.perf_counter()
+                await application.process_update(update)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(process(n, telegram_id) for n, telegram_id in enumerate(ids, 1)))
+        finally:
+            await application.shutdown()
+        return latencies, time.perf_counter() - started
+
+
+def _start_update(update_id: int, telegram_id: int) -> dict:
+    user = {'id': telegram_id, 'is_bot': False, 'first_name': 'Bench', 'username': f'bench{telegram_id}'}
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': telegram_id, 'type': 'private'},
+            'from': user,
+            'text': '/start',
+            'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}],
+        },
+    }
@@ -0,0 +1,91 @@
+"""
+Django management command to benchmark inline search index lookups.
+
+    python manage.py benchinlinesearch               # current catalog
+    python manage.py benchinlinesearch --synthetic 20000
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.bot.services.inline_search import (
+    IndexedProduct,
+    ProductSearchIndex,
+    load_indexed_products,
+    tokenize,
+)
+
+# Lookup latency budget for inline answers
+P99_TARGET_MS = 20.0
+
+_WORDS = [
+    'розы', 'пионы', 'тюльпаны', 'хризантемы', 'лилии', 'гортензия', 'эустома', 'ромашки',
+    'букет', 'композиция', 'корзина', 'коробка', 'белые', 'красные', 'розовые', 'микс',
+    'нежный', 'яркий', 'весенний', 'свадебный', 'мини', 'большой', 'авторский', 'сезонный',
+]
+
+
+def _synthetic_products(count: int) -> list[IndexedProduct]:
+    rng = random.Random(42)
+    return [
+        IndexedProduct(
+            id=i,
+            title=' '.join(rng.sample(_WORDS, 3)) + f' {i}',
+            slug=f'product-{i}',
+            price=rng.randrange(150000, 1500000, 10000),
+            old_price=None,
+            category_title=rng.choice(['Букеты', 'Композиции', 'Розы', 'Подарки']),
+            image_url=f'https://cdn.example.com/products/{i}.jpg',
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+class Command(BaseCommand):
+    """Measure p50/p99 latency of inline search lookups."""
+
+    help = f'Benchmark inline search index lookups (target p99 < {P99_TARGET_MS:.0f} ms)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', type=int, default=0, help='Index N generated products instead of the DB')
+        parser.add_argument('--queries', type=int, default=10000, help='Number of lookups')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        products = _synthetic_products(options['synthetic']) if options['synthetic'] else load_indexed_products()
+        index = ProductSearchIndex(products)
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f'Index: {len(index)} products, built in {build_ms:.1f} ms')
+
+        if not len(index):
+            self.stdout.write(self.style.WARNING('No active products to search'))
+            return
+
+        # Keystroke-like queries: prefixes of 1-2 real words
+        rng = random.Random(7)
+        vocabulary = sorted({token for product in products[:1000] for token in tokenize(product.title)})
+        queries = []
+        for _ in range(options['queries']):
+            words = rng.sample(vocabulary, min(len(vocabulary), rng.choice([1, 1, 2])))
+            words[-1] = words[-1][:rng.randint(1, len(words[-1]))]
+            queries.append(' '.join(words))
+
+        timings = []
+        for query in queries:
+            t0 = time.perf_counter()
+            index.search(query, limit=51)
+            timings.append((time.perf_counter() - t0) * 1000)
+
+        timings.sort()
+        p50 = statistics.median(timings)
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        self.stdout.write(
+            f'{len(timings)} lookups: p50={p50:.3f} ms, p99={p99:.3f} ms, max={timings[-1]:.3f} ms'
+        )
+
+        if p99 < P99_TARGET_MS:
+            self.stdout.write(self.style.SUCCESS(f'p99 within {P99_TARGET_MS:.0f} ms target'))
+        else:
+            self.stdout.write(self.style.ERROR(f'p99 exceeds {P99_TARGET_MS:.0f} ms target'))
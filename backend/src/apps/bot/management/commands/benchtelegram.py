@@ -0,0 +1,104 @@
+"""
+Django management command to benchmark Telegram senders offline.
+
+Run against the fake server (no database or real bot needed):
+    python manage.py fakebotapi --latency 0.05 &
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8081 TELEGRAM_BOT_TOKEN=0:fake \
+        python manage.py benchtelegram -n 500
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from telegram import Bot
+
+from apps.bot.models import Broadcast, BroadcastContentType
+from apps.bot.services.broadcaster import BroadcastSender, SendResult
+from apps.bot.services.notifications import send_order_notification
+from apps.bot.services.telegram_api import get_bot_base_url, get_telegram_client
+from apps.bot.tasks.broadcast import _send
+
+
+class Command(BaseCommand):
+    """Measure send throughput of notifications and broadcasts."""
+
+    help = 'Benchmark order notifications and broadcast senders against TELEGRAM_API_BASE_URL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--messages', type=int, default=200, help='Messages per sender')
+        parser.add_argument('--chat-id', type=int, default=100000, help='First recipient chat id')
+        parser.add_argument(
+            '--only',
+            choices=['notifications', 'broadcast', 'sender'],
+            help='Run a single benchmark',
+        )
+
+    def handle(self, *args, **options):
+        if settings.TELEGRAM_API_BASE_URL.startswith('https://api.telegram.org'):
+            self.stdout.write(self.style.ERROR(
+                'Refusing to benchmark the real Bot API. Set TELEGRAM_API_BASE_URL to the fake server.'
+            ))
+            return
+
+        count = options['messages']
+        chat_ids = range(options['chat_id'], options['chat_id'] + count)
+        only = options['only']
+
+        self.stdout.write(f'Bot API: {settings.TELEGRAM_API_BASE_URL}, {count} messages per sender')
+
+        if only in (None, 'notifications'):
+            self._report('send_order_notification', *self._bench_notifications(chat_ids))
+        if only in (None, 'broadcast'):
+            self._report('send_broadcast_task (_send)', *self._bench_broadcast(chat_ids))
+        if only in (None, 'sender'):
+            self._report('BroadcastSender.send_to_user', *asyncio.run(self._bench_sender(chat_ids)))
+
+        self.stdout.write('')
+        self.stdout.write('Client metrics:')
+        for method, stats in get_telegram_client().metrics.snapshot().items():
+            self.stdout.write(f'  {method}: {stats}')
+
+    def _bench_notifications(self, chat_ids) -> tuple[int, int, float]:
+        items = [{'title': 'Букет', 'qty': 1, 'line_total': 350000}]
+        started = time.perf_counter()
+        ok = sum(
+            send_order_notification(
+                telegram_id=chat_id,
+                order_id=chat_id,
+                items=items,
+                total=350000,
+                delivery_fee=0,
+                delivery_address='ул. Тестовая, 1',
+            )
+            for chat_id in chat_ids
+        )
+        return ok, len(chat_ids), time.perf_counter() - started
+
+    def _bench_broadcast(self, chat_ids) -> tuple[int, int, float]:
+        # Unsaved instance: _send only reads content fields
+        broadcast = Broadcast(content_type=BroadcastContentType.TEXT, text='Benchmark')
+        client = get_telegram_client()
+        started = time.perf_counter()
+        ok = sum(_send(client, chat_id, broadcast).ok for chat_id in chat_ids)
+        return ok, len(chat_ids), time.perf_counter() - started
+
+    async def _bench_sender(self, chat_ids) -> tuple[int, int, float]:
+        broadcast = Broadcast(content_type=BroadcastContentType.TEXT, text='Benchmark')
+        bot = Bot(token=settings.TELEGRAM_BOT_TOKEN or '0:fake', base_url=get_bot_base_url())
+        sender = BroadcastSender(bot)
+
+        async with bot:
+            started = time.perf_counter()
+            ok = 0
+            for chat_id in chat_ids:
+                outcome = await sender.send_to_user(chat_id, broadcast)
+                ok += outcome.result == SendResult.SUCCESS
+            return ok, len(chat_ids), time.perf_counter() - started
+
+    def _report(self, name: str, ok: int, total: int, elapsed: float) -> None:
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            f'{name}: {ok}/{total} ok in {elapsed:.2f}s '
+            f'({rate:.1f} msg/s, {elapsed / total * 1000:.1f} ms/msg)'
+        )
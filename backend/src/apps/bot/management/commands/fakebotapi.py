@@ -0,0 +1,43 @@
+"""
+Django management command to run the fake Telegram Bot API server.
+
+Point the project at it with TELEGRAM_API_BASE_URL=http://127.0.0.1:8081
+"""
+from django.core.management.base import BaseCommand
+
+from apps.bot.fake_api import FakeBotAPI, FakeBotAPIConfig
+
+
+class Command(BaseCommand):
+    """Run a local fake Bot API for load and integration testing."""
+
+    help = 'Run a fake Telegram Bot API server (latency, 429 and blocked users injection)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Bind host')
+        parser.add_argument('--port', type=int, default=8081, help='Bind port')
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every call')
+        parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency, seconds')
+        parser.add_argument('--flood-rate', type=float, default=0.0, help='Probability of a random 429 (0..1)')
+        parser.add_argument('--retry-after', type=int, default=1, help='retry_after returned with 429')
+        parser.add_argument('--max-per-second', type=int, default=0, help='Send limit before 429, 0 = unlimited')
+        parser.add_argument('--blocked', default='', help='Comma-separated chat ids answering 403 "blocked"')
+
+    def handle(self, *args, **options):
+        import uvicorn
+
+        blocked = {int(chat_id) for chat_id in options['blocked'].split(',') if chat_id.strip()}
+        config = FakeBotAPIConfig(
+            latency=options['latency'],
+            latency_jitter=options['jitter'],
+            flood_rate=options['flood_rate'],
+            retry_after=options['retry_after'],
+            max_per_second=options['max_per_second'],
+            blocked_chat_ids=blocked,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Fake Bot API on http://{options['host']}:{options['port']} "
+            f"(stats: /__stats__, reset: /__reset__)"
+        ))
+        uvicorn.run(FakeBotAPI(config), host=options['host'], port=options['port'], log_level='warning')
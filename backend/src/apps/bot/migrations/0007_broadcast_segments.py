@@ -0,0 +1,41 @@
+# Generated by Django 5.2.10 on 2026-10-19 00:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0006_change_segment_to_recipients_usernames'),
+        ('products', '0002_favorite_action'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, verbose_name='Название')),
+                ('slug', models.SlugField(help_text='Используется в боте: #код', max_length=60, unique=True, verbose_name='Код')),
+                ('description', models.TextField(blank=True, verbose_name='Описание')),
+                ('joined_within_days', models.PositiveIntegerField(blank=True, null=True, verbose_name='Зарегистрировались за N дней')),
+                ('ordered_within_days', models.PositiveIntegerField(blank=True, null=True, verbose_name='Заказывали за N дней')),
+                ('event_type', models.CharField(blank=True, choices=[('app_open', 'Открытие приложения'), ('product_view', 'Просмотр товара'), ('product_click', 'Клик на товар'), ('cart_add', 'Добавление в корзину'), ('cart_remove', 'Удаление из корзины'), ('category_view', 'Просмотр категории'), ('search', 'Поисковый запрос'), ('checkout_start', 'Начало оформления'), ('order_complete', 'Заказ оформлен')], max_length=30, verbose_name='Событие аналитики')),
+                ('event_within_days', models.PositiveIntegerField(blank=True, help_text='Период для события аналитики (по умолчанию 30 дней)', null=True, verbose_name='Событие за N дней')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('favorite_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='broadcast_segments', to='products.category', verbose_name='Добавляли в избранное из категории')),
+            ],
+            options={
+                'verbose_name': 'Сегмент аудитории',
+                'verbose_name_plural': 'Сегменты аудитории',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='segment',
+            field=models.ForeignKey(blank=True, help_text='Сохранённый сегмент аудитории (вместо списка username)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='broadcasts', to='bot.broadcastsegment', verbose_name='Сегмент'),
+        ),
+    ]
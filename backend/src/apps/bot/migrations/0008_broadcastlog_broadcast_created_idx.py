@@ -0,0 +1,19 @@
+# Generated by Django 5.2.10 on 2026-10-19 00:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0007_broadcast_segments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='broadcastlog',
+            index=models.Index(fields=['broadcast', '-created_at'], name='bot_broadca_broadca_64afb6_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.10 on 2026-10-19 00:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0008_broadcastlog_broadcast_created_idx'),
+        ('products', '0002_favorite_action'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelegramFileCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bot_id', models.BigIntegerField(verbose_name='ID бота')),
+                ('file_version', models.CharField(help_text='Имя файла в хранилище на момент загрузки', max_length=255, verbose_name='Версия файла')),
+                ('file_id', models.CharField(max_length=255, verbose_name='Telegram file_id')),
+                ('file_unique_id', models.CharField(blank=True, max_length=64, verbose_name='Telegram file_unique_id')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Загружено')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='telegram_files', to='products.productimage', verbose_name='Фото товара')),
+            ],
+            options={
+                'verbose_name': 'Файл в Telegram',
+                'verbose_name_plural': 'Файлы в Telegram',
+                'constraints': [models.UniqueConstraint(fields=('image', 'bot_id', 'file_version'), name='bot_telegramfilecache_unique_version')],
+            },
+        ),
+    ]
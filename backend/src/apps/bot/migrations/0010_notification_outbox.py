@@ -0,0 +1,39 @@
+# Generated by Django 5.2.10 on 2026-10-19 00:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0009_telegramfilecache'),
+        ('orders', '0002_add_payment_method'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('order_created', 'Заказ оформлен')], max_length=32, verbose_name='Тип')),
+                ('telegram_id', models.BigIntegerField(verbose_name='Telegram ID')),
+                ('method', models.CharField(default='sendMessage', max_length=32, verbose_name='Метод Bot API')),
+                ('payload', models.JSONField(default=dict, help_text='Параметры метода без chat_id', verbose_name='Параметры')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=20, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Отправить не раньше')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено в')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='orders.order', verbose_name='Заказ')),
+            ],
+            options={
+                'verbose_name': 'Уведомление (outbox)',
+                'verbose_name_plural': 'Уведомления (outbox)',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='bot_notific_status_c13f3a_idx')],
+            },
+        ),
+    ]
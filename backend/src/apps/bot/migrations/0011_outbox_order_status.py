@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0010_notification_outbox'),
+        ('orders', '0002_add_payment_method'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='kind',
+            field=models.CharField(choices=[('order_created', 'Заказ оформлен'), ('order_status', 'Статус заказа')], max_length=32, verbose_name='Тип'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationoutbox',
+            index=models.Index(fields=['order', 'kind', 'status'], name='bot_notific_order_i_8b8f63_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.10 on 2026-10-19 01:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0011_outbox_order_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='max_per_minute',
+            field=models.PositiveIntegerField(blank=True, help_text='Пусто — без ограничения (с окном — равномерно до его конца)', null=True, verbose_name='Не больше в минуту'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='scheduled_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Начать не раньше'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='window_end',
+            field=models.TimeField(blank=True, help_text='Если меньше начала, окно переходит через полночь', null=True, verbose_name='Окно доставки до'),
+        ),
+        migrations.AddField(
+            model_name='broadcast',
+            name='window_start',
+            field=models.TimeField(blank=True, help_text='Местное время. Отправка идёт только внутри окна', null=True, verbose_name='Окно доставки с'),
+        ),
+        migrations.AddIndex(
+            model_name='broadcast',
+            index=models.Index(fields=['status', 'scheduled_at'], name='bot_broadca_status_5b81fb_idx'),
+        ),
+    ]
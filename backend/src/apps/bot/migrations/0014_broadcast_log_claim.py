@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0013_outbox_sending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcastlog',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Взято в отправку'),
+        ),
+        migrations.AlterField(
+            model_name='broadcastlog',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Ожидает'), ('sending', 'Отправляется'), ('sent', 'Отправлено'), ('failed', 'Ошибка'), ('blocked', 'Заблокирован')], db_index=True, default='pending', max_length=20, verbose_name='Статус'),
+        ),
+    ]
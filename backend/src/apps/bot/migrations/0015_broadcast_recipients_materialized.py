@@ -0,0 +1,25 @@
+# Generated by Django 5.2.10 on 2026-10-19 02:17
+
+from django.db import migrations, models
+
+
+def mark_started_broadcasts(apps, schema_editor):
+    # Progress of older runs is unknown: treat started broadcasts as complete, as before
+    Broadcast = apps.get_model('bot', 'Broadcast')
+    Broadcast.objects.exclude(status__in=['draft', 'pending']).update(recipients_materialized=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0014_broadcast_log_claim'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='recipients_materialized',
+            field=models.BooleanField(default=False, verbose_name='Аудитория сформирована'),
+        ),
+        migrations.RunPython(mark_started_broadcasts, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,9 @@ from apps.bot.models.broadcast import (
 )
 from apps.bot.models.admin import BotAdmin
 from apps.bot.models.conversation import ConversationState
+from apps.bot.models.media import TelegramFileCache
+from apps.bot.models.outbox import NotificationKind, NotificationOutbox, OutboxStatus
+from apps.bot.models.segment import BroadcastSegment
 
 __all__ = [
     'Broadcast',
@@ -14,6 +17,11 @@ __all__ = [
     'BroadcastStatus',
     'BroadcastContentType',
     'BroadcastLogStatus',
+    'BroadcastSegment',
     'BotAdmin',
     'ConversationState',
+    'TelegramFileCache',
+    'NotificationKind',
+    'NotificationOutbox',
+    'OutboxStatus',
 ]
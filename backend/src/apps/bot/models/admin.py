@@ -3,7 +3,6 @@ Bot admin model for managing Telegram bot administrators.
 """
 from django.db import models
 from django.conf import settings
-from asgiref.sync import sync_to_async
 
 
 class BotAdmin(models.Model):
@@ -76,18 +75,11 @@ class BotAdmin(models.Model):
         Check if user is an active admin.
 
         Checks by telegram_id first, then by username.
+        Served from the admin cache (see apps.bot.services.admins).
         """
-        if telegram_id:
-            if cls.objects.filter(telegram_id=telegram_id, is_active=True).exists():
-                return True
+        from apps.bot.services.admins import is_bot_admin
 
-        if username:
-            # Normalize username
-            if not username.startswith('@'):
-                username = f'@{username}'
-            return cls.objects.filter(username__iexact=username, is_active=True).exists()
-
-        return False
+        return is_bot_admin(telegram_id=telegram_id, username=username)
 
     @classmethod
     def get_and_update(cls, telegram_id: int, username: str = None) -> 'BotAdmin | None':
@@ -122,4 +114,21 @@ class BotAdmin(models.Model):
 
         Called when admin uses a command - fills telegram_id if it was empty.
         """
-        return await sync_to_async(cls.get_and_update)(telegram_id, username)
+        admin = None
+
+        # Try by telegram_id first
+        if telegram_id:
+            admin = await cls.objects.filter(telegram_id=telegram_id, is_active=True).afirst()
+
+        # Try by username if not found
+        if not admin and username:
+            if not username.startswith('@'):
+                username = f'@{username}'
+            admin = await cls.objects.filter(username__iexact=username, is_active=True).afirst()
+
+            # Update telegram_id if found by username
+            if admin and not admin.telegram_id:
+                admin.telegram_id = telegram_id
+                await admin.asave(update_fields=['telegram_id'])
+
+        return admin
@@ -1,8 +1,8 @@
 """
 Broadcast models for Telegram mass messaging.
 """
-from django.db import models
 from django.conf import settings
+from django.db import models
 
 
 class BroadcastStatus(models.TextChoices):
@@ -38,6 +38,15 @@ class Broadcast(models.Model):
         verbose_name='Получатели (usernames)',
         help_text='Список username получателей',
     )
+    segment = models.ForeignKey(
+        'bot.BroadcastSegment',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='broadcasts',
+        verbose_name='Сегмент',
+        help_text='Сохранённый сегмент аудитории (вместо списка username)',
+    )
 
     # Content
     content_type = models.CharField(
@@ -67,6 +76,31 @@ class Broadcast(models.Model):
         db_index=True,
     )
 
+    # Schedule (see apps.bot.services.broadcast_schedule)
+    scheduled_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начать не раньше',
+    )
+    window_start = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name='Окно доставки с',
+        help_text='Местное время. Отправка идёт только внутри окна',
+    )
+    window_end = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name='Окно доставки до',
+        help_text='Если меньше начала, окно переходит через полночь',
+    )
+    max_per_minute = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Не больше в минуту',
+        help_text='Пусто — без ограничения (с окном — равномерно до его конца)',
+    )
+
     # Creator
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -87,6 +121,11 @@ class Broadcast(models.Model):
         default=0,
         verbose_name='Всего получателей',
     )
+    # Все логи получателей созданы; до этого total_recipients растёт по пачкам
+    recipients_materialized = models.BooleanField(
+        default=False,
+        verbose_name='Аудитория сформирована',
+    )
     sent_count = models.PositiveIntegerField(
         default=0,
         verbose_name='Отправлено',
@@ -116,6 +155,9 @@ class Broadcast(models.Model):
         verbose_name = 'Рассылка'
         verbose_name_plural = 'Рассылки'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'scheduled_at']),
+        ]
 
     def __str__(self):
         return f"Рассылка #{self.pk} ({self.get_status_display()})"
@@ -131,6 +173,7 @@ class Broadcast(models.Model):
 class BroadcastLogStatus(models.TextChoices):
     """Log entry status choices."""
     PENDING = 'pending', 'Ожидает'
+    SENDING = 'sending', 'Отправляется'
     SENT = 'sent', 'Отправлено'
     FAILED = 'failed', 'Ошибка'
     BLOCKED = 'blocked', 'Заблокирован'
@@ -177,6 +220,12 @@ class BroadcastLog(models.Model):
         blank=True,
         verbose_name='Отправлено в',
     )
+    # Когда запись взята на отправку; зависшие в SENDING забираются повторно
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взято в отправку',
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Создано',
@@ -188,6 +237,7 @@ class BroadcastLog(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['broadcast', 'status']),
+            models.Index(fields=['broadcast', '-created_at']),
         ]
 
     def __str__(self):
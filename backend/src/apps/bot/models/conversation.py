@@ -2,7 +2,6 @@
 Conversation state model for storing bot conversation states in DB.
 """
 from django.db import models
-from asgiref.sync import sync_to_async
 
 
 class ConversationState(models.Model):
@@ -48,7 +47,8 @@ class ConversationState(models.Model):
     @classmethod
     async def aget_state(cls, telegram_id: int) -> tuple[str, dict]:
         """Get current state and data for user (async)."""
-        return await sync_to_async(cls.get_state)(telegram_id)
+        obj, _ = await cls.objects.aget_or_create(telegram_id=telegram_id)
+        return obj.state, obj.data
 
     @classmethod
     def set_state(cls, telegram_id: int, state: str, data: dict = None) -> None:
@@ -62,7 +62,10 @@ class ConversationState(models.Model):
     @classmethod
     async def aset_state(cls, telegram_id: int, state: str, data: dict = None) -> None:
         """Set state and optionally update data (async)."""
-        await sync_to_async(cls.set_state)(telegram_id, state, data)
+        defaults = {'state': state}
+        if data is not None:
+            defaults['data'] = data
+        await cls.objects.aupdate_or_create(telegram_id=telegram_id, defaults=defaults)
 
     @classmethod
     def update_data(cls, telegram_id: int, **kwargs) -> None:
@@ -74,7 +77,9 @@ class ConversationState(models.Model):
     @classmethod
     async def aupdate_data(cls, telegram_id: int, **kwargs) -> None:
         """Update data fields (async)."""
-        await sync_to_async(cls.update_data)(telegram_id, **kwargs)
+        obj, _ = await cls.objects.aget_or_create(telegram_id=telegram_id)
+        obj.data.update(kwargs)
+        await obj.asave()
 
     @classmethod
     def clear(cls, telegram_id: int) -> None:
@@ -84,4 +89,4 @@ class ConversationState(models.Model):
     @classmethod
     async def aclear(cls, telegram_id: int) -> None:
         """Clear state and data (async)."""
-        await sync_to_async(cls.clear)(telegram_id)
+        await cls.objects.filter(telegram_id=telegram_id).aupdate(state='', data={})
@@ -0,0 +1,55 @@
+"""
+Telegram file_id cache for uploaded media.
+"""
+from django.db import models
+
+
+class TelegramFileCache(models.Model):
+    """
+    Telegram file_id of a product image uploaded by the bot.
+
+    file_id is only valid for the bot that uploaded it, and file_version
+    (the storage name of the image) changes when the image is replaced,
+    so both are part of the key.
+    """
+
+    image = models.ForeignKey(
+        'products.ProductImage',
+        on_delete=models.CASCADE,
+        related_name='telegram_files',
+        verbose_name='Фото товара',
+    )
+    bot_id = models.BigIntegerField(
+        verbose_name='ID бота',
+    )
+    file_version = models.CharField(
+        max_length=255,
+        verbose_name='Версия файла',
+        help_text='Имя файла в хранилище на момент загрузки',
+    )
+    file_id = models.CharField(
+        max_length=255,
+        verbose_name='Telegram file_id',
+    )
+    file_unique_id = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='Telegram file_unique_id',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Загружено',
+    )
+
+    class Meta:
+        verbose_name = 'Файл в Telegram'
+        verbose_name_plural = 'Файлы в Telegram'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['image', 'bot_id', 'file_version'],
+                name='bot_telegramfilecache_unique_version',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.image_id}@{self.bot_id}: {self.file_id[:16]}..."
@@ -0,0 +1,99 @@
+"""
+Transactional outbox for user notifications.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class NotificationKind(models.TextChoices):
+    """Notification kind choices."""
+    ORDER_CREATED = 'order_created', 'Заказ оформлен'
+    ORDER_STATUS = 'order_status', 'Статус заказа'
+
+
+class OutboxStatus(models.TextChoices):
+    """Outbox row status choices."""
+    PENDING = 'pending', 'Ожидает'
+    SENDING = 'sending', 'Отправляется'
+    SENT = 'sent', 'Отправлено'
+    FAILED = 'failed', 'Ошибка'
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notification waiting to be delivered to Telegram.
+
+    Written in the same transaction as the business change (e.g. order
+    creation), so only committed changes are ever notified. Rows are
+    drained by apps.bot.services.outbox.dispatch_outbox.
+    """
+
+    kind = models.CharField(
+        max_length=32,
+        choices=NotificationKind.choices,
+        verbose_name='Тип',
+    )
+    telegram_id = models.BigIntegerField(
+        verbose_name='Telegram ID',
+    )
+    order = models.ForeignKey(
+        'orders.Order',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='notifications',
+        verbose_name='Заказ',
+    )
+
+    # Bot API call to make
+    method = models.CharField(
+        max_length=32,
+        default='sendMessage',
+        verbose_name='Метод Bot API',
+    )
+    payload = models.JSONField(
+        default=dict,
+        verbose_name='Параметры',
+        help_text='Параметры метода без chat_id',
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING,
+        verbose_name='Статус',
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток',
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка',
+    )
+
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить не раньше',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создано',
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено в',
+    )
+
+    class Meta:
+        verbose_name = 'Уведомление (outbox)'
+        verbose_name_plural = 'Уведомления (outbox)'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['order', 'kind', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} → {self.telegram_id} ({self.get_status_display()})"
@@ -0,0 +1,86 @@
+"""
+Saved broadcast audience segments.
+"""
+from django.db import models
+
+from apps.analytics.models import EventType
+
+
+class BroadcastSegment(models.Model):
+    """
+    Saved broadcast audience.
+
+    Each filled filter narrows the audience (filters are combined with AND).
+    Only active users with a known telegram_id are ever included.
+    Resolution happens in the database, see apps.bot.services.segments.
+    """
+
+    name = models.CharField(
+        max_length=120,
+        verbose_name='Название',
+    )
+    slug = models.SlugField(
+        max_length=60,
+        unique=True,
+        verbose_name='Код',
+        help_text='Используется в боте: #код',
+    )
+    description = models.TextField(
+        blank=True,
+        verbose_name='Описание',
+    )
+
+    # User
+    joined_within_days = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Зарегистрировались за N дней',
+    )
+
+    # Order
+    ordered_within_days = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Заказывали за N дней',
+    )
+
+    # FavoriteAction
+    favorite_category = models.ForeignKey(
+        'products.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='broadcast_segments',
+        verbose_name='Добавляли в избранное из категории',
+    )
+
+    # AnalyticsEvent
+    event_type = models.CharField(
+        max_length=30,
+        choices=EventType.choices,
+        blank=True,
+        verbose_name='Событие аналитики',
+    )
+    event_within_days = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Событие за N дней',
+        help_text='Период для события аналитики (по умолчанию 30 дней)',
+    )
+
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name='Активен',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Создан',
+    )
+
+    class Meta:
+        verbose_name = 'Сегмент аудитории'
+        verbose_name_plural = 'Сегменты аудитории'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
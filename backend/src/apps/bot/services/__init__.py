@@ -1,4 +1,67 @@
 """Bot services."""
+from apps.bot.services.admins import ais_bot_admin, invalidate_admin_cache, is_bot_admin
 from apps.bot.services.broadcaster import BroadcastSender, SendResult, SendOutcome
+from apps.bot.services.conversation import (
+    BaseConversationStore,
+    DatabaseConversationStore,
+    RedisConversationStore,
+    get_conversation_store,
+)
+from apps.bot.services.telegram_api import (
+    AsyncTelegramClient,
+    TelegramClient,
+    TelegramResponse,
+    close_async_telegram_client,
+    get_async_telegram_client,
+    get_bot_base_url,
+    get_telegram_client,
+)
+from apps.bot.services.inline_search import (
+    ProductSearchIndex,
+    get_product_index,
+    invalidate_product_index,
+)
+from apps.bot.services.media import get_cached_file_id, send_product_photo
+from apps.bot.services.order_status import enqueue_status_notification
+from apps.bot.services.outbox import dispatch_outbox, enqueue_notification
+from apps.bot.services.ratelimit import UpdateRateLimiter, get_update_rate_limiter
+from apps.bot.services.recipients import find_users_by_usernames, normalize_username
+from apps.bot.services.segments import build_segment_queryset, count_segment, materialize_segment
+from apps.bot.services.updates import UpdateDeduplicator, get_update_deduplicator
 
-__all__ = ['BroadcastSender', 'SendResult', 'SendOutcome']
+__all__ = [
+    'ais_bot_admin',
+    'invalidate_admin_cache',
+    'is_bot_admin',
+    'BroadcastSender',
+    'SendResult',
+    'SendOutcome',
+    'BaseConversationStore',
+    'DatabaseConversationStore',
+    'RedisConversationStore',
+    'get_conversation_store',
+    'AsyncTelegramClient',
+    'TelegramClient',
+    'TelegramResponse',
+    'close_async_telegram_client',
+    'get_async_telegram_client',
+    'get_bot_base_url',
+    'get_telegram_client',
+    'ProductSearchIndex',
+    'get_product_index',
+    'invalidate_product_index',
+    'get_cached_file_id',
+    'send_product_photo',
+    'enqueue_status_notification',
+    'dispatch_outbox',
+    'enqueue_notification',
+    'UpdateRateLimiter',
+    'get_update_rate_limiter',
+    'find_users_by_usernames',
+    'normalize_username',
+    'build_segment_queryset',
+    'count_segment',
+    'materialize_segment',
+    'UpdateDeduplicator',
+    'get_update_deduplicator',
+]
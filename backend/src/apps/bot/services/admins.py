@@ -0,0 +1,107 @@
+"""
+Cached bot admin authorization.
+
+Active admins are kept as two sets (telegram_ids and usernames) in the
+two-tier 'hot' cache (apps.core.cache): process memory in front of Redis.
+BotAdmin save/delete signals delete the key after commit, which evicts
+the local copies of every process over pub/sub, so a revoked admin loses
+access as soon as the invalidation is delivered (milliseconds). Should a
+message be lost, local copies still expire after HOT_CACHE_LOCAL_TIMEOUT.
+"""
+import logging
+from dataclasses import dataclass
+
+from apps.bot.models import BotAdmin
+from apps.core.cache import hot_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'bot:admins:v1'
+CACHE_TIMEOUT = 60 * 60  # 1 hour, safety net in case a signal is missed
+
+
+@dataclass(frozen=True)
+class AdminSnapshot:
+    """Active admins at a point in time."""
+    telegram_ids: frozenset
+    usernames: frozenset
+
+    def match(self, telegram_id: int | None, username: str | None) -> tuple[bool, bool]:
+        """Return (matched_by_id, matched_by_username)."""
+        by_id = bool(telegram_id) and telegram_id in self.telegram_ids
+        by_username = bool(username) and normalize_admin_username(username) in self.usernames
+        return by_id, by_username
+
+
+def normalize_admin_username(username: str) -> str:
+    """Normalize to the stored '@username' form, lowercased."""
+    username = username.strip().lower()
+    if not username.startswith('@'):
+        username = f'@{username}'
+    return username
+
+
+def _active_admins():
+    return BotAdmin.objects.filter(is_active=True).values_list('telegram_id', 'username')
+
+
+def _make_snapshot(rows) -> AdminSnapshot:
+    return AdminSnapshot(
+        telegram_ids=frozenset(telegram_id for telegram_id, _ in rows if telegram_id),
+        usernames=frozenset(normalize_admin_username(username) for _, username in rows if username),
+    )
+
+
+def _load_from_db() -> AdminSnapshot:
+    return _make_snapshot(list(_active_admins()))
+
+
+def get_admin_snapshot() -> AdminSnapshot:
+    """Get active admins: process memory, then Redis, then database."""
+    snapshot = hot_cache.get(CACHE_KEY)
+    if snapshot is None:
+        snapshot = _load_from_db()
+        # add(): never overwrite a snapshot stored after a newer change
+        hot_cache.add(CACHE_KEY, snapshot, CACHE_TIMEOUT)
+    return snapshot
+
+
+async def aget_admin_snapshot() -> AdminSnapshot:
+    """Async version of get_admin_snapshot (no thread hop on a local hit)."""
+    snapshot = await hot_cache.aget(CACHE_KEY)
+    if snapshot is None:
+        snapshot = _make_snapshot([row async for row in _active_admins()])
+        await hot_cache.aadd(CACHE_KEY, snapshot, CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_admin_cache() -> None:
+    """Drop the cached admins in every process (called from BotAdmin signals)."""
+    hot_cache.delete(CACHE_KEY)
+
+
+def is_bot_admin(telegram_id: int | None = None, username: str | None = None) -> bool:
+    """Check if user is an active admin (set lookup, no SQL when cached)."""
+    by_id, by_username = get_admin_snapshot().match(telegram_id, username)
+    return by_id or by_username
+
+
+async def ais_bot_admin(telegram_id: int, username: str | None = None) -> bool:
+    """
+    Check admin rights for a bot user (async).
+
+    An admin added by username only gets telegram_id filled on first use;
+    that is the only case that touches the database once the cache is warm.
+    """
+    snapshot = await aget_admin_snapshot()
+    by_id, by_username = snapshot.match(telegram_id, username)
+
+    if by_id:
+        return True
+
+    if by_username:
+        # First use: backfill telegram_id (save() invalidates the cache)
+        admin = await BotAdmin.aget_and_update(telegram_id, username)
+        return admin is not None
+
+    return False
@@ -0,0 +1,179 @@
+"""
+Broadcast scheduling: start times, daily delivery windows and rate caps.
+
+A broadcast may have:
+    scheduled_at                  - do not start before this moment
+    window_start / window_end     - send only between these local times
+                                    (TIME_ZONE, e.g. 10:00-20:00 Moscow;
+                                    end < start means an overnight window)
+    max_per_minute                - send at most this many messages a minute
+
+Paced broadcasts (with a window or a rate cap) are sent by the
+bot.run_scheduled_broadcasts beat task a quota at a time, so a big send is
+spread out instead of landing on peak checkout hours. Without an explicit
+rate, a windowed broadcast spreads what is left evenly over the rest of
+the current window.
+"""
+import math
+import re
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from apps.bot.models import Broadcast
+
+
+def is_paced(broadcast: Broadcast) -> bool:
+    """True if the broadcast is sent by the scheduler in per-tick quotas."""
+    return has_window(broadcast) or bool(broadcast.max_per_minute)
+
+
+def has_window(broadcast: Broadcast) -> bool:
+    return broadcast.window_start is not None and broadcast.window_end is not None
+
+
+def is_due(broadcast: Broadcast, now: datetime | None = None) -> bool:
+    """Start time reached (or not set)."""
+    now = now or timezone.now()
+    return broadcast.scheduled_at is None or broadcast.scheduled_at <= now
+
+
+def in_window(broadcast: Broadcast, now: datetime | None = None) -> bool:
+    """Now is inside the daily delivery window (always True without one)."""
+    if not has_window(broadcast):
+        return True
+    current = timezone.localtime(now or timezone.now()).time()
+    start, end = broadcast.window_start, broadcast.window_end
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+def _next_local(now: datetime, at: time) -> datetime:
+    """Next moment (after now) the local clock shows the given time."""
+    local_now = timezone.localtime(now)
+    moment = local_now.replace(hour=at.hour, minute=at.minute, second=0, microsecond=0)
+    if moment <= local_now:
+        moment += timedelta(days=1)
+    return moment
+
+
+def window_seconds_left(broadcast: Broadcast, now: datetime | None = None) -> float | None:
+    """Seconds until the current window closes, None without a window."""
+    if not has_window(broadcast):
+        return None
+    now = now or timezone.now()
+    return (_next_local(now, broadcast.window_end) - timezone.localtime(now)).total_seconds()
+
+
+def next_start(broadcast: Broadcast, now: datetime | None = None) -> datetime:
+    """When sending can (re)start: start time, then the next window opening."""
+    now = now or timezone.now()
+    start = max(now, broadcast.scheduled_at) if broadcast.scheduled_at else now
+    if in_window(broadcast, start):
+        return start
+    return _next_local(start, broadcast.window_start)
+
+
+def tick_quota(broadcast: Broadcast, pending: int, tick: float, now: datetime | None = None) -> int | None:
+    """
+    Messages the broadcast may send during one scheduler tick.
+
+    None means no limit (the tick deadline still applies).
+    """
+    per_minute = broadcast.max_per_minute
+    if not per_minute:
+        seconds_left = window_seconds_left(broadcast, now)
+        if seconds_left is None:
+            return None
+        # Spread the rest over the remaining window
+        per_minute = pending / max(seconds_left / 60, 1)
+    return max(1, math.ceil(per_minute * tick / 60))
+
+
+@dataclass(frozen=True)
+class BroadcastSchedule:
+    """Schedule entered by an admin in the bot."""
+    scheduled_at: datetime | None = None
+    window_start: time | None = None
+    window_end: time | None = None
+    max_per_minute: int | None = None
+
+    def describe(self) -> str:
+        """Human readable summary for bot replies."""
+        parts = []
+        if self.scheduled_at:
+            parts.append(f"старт {timezone.localtime(self.scheduled_at):%d.%m.%Y %H:%M}")
+        if self.window_start is not None:
+            parts.append(f"окно {self.window_start:%H:%M}–{self.window_end:%H:%M}")
+        if self.max_per_minute:
+            parts.append(f"не больше {self.max_per_minute}/мин")
+        return ', '.join(parts) or 'сразу'
+
+
+_START_RE = re.compile(r'(?<![\d:])(\d{1,2})\.(\d{1,2})(?:\.(\d{4}))?\s+(\d{1,2}):(\d{2})(?![\d-])')
+_WINDOW_RE = re.compile(r'(\d{1,2}):(\d{2})\s*[-–]\s*(\d{1,2}):(\d{2})')
+_RATE_RE = re.compile(r'(\d+)\s*/\s*мин', re.IGNORECASE)
+# What may remain between the parts
+_SEPARATORS_RE = re.compile(r'[\s,;]+')
+
+
+def _take(pattern: re.Pattern, text: str) -> tuple[re.Match | None, str]:
+    """First match of the pattern and the text with the match cut out."""
+    match = pattern.search(text)
+    if match is None:
+        return None, text
+    return match, f'{text[:match.start()]} {text[match.end():]}'
+
+
+def parse_schedule(text: str, now: datetime | None = None) -> BroadcastSchedule | None:
+    """
+    Parse '25.12 09:00 10:00-20:00 300/мин' (every part optional).
+
+    Times are local (TIME_ZONE); a date without a year means the next
+    such date. Returns None if nothing could be parsed, a value is invalid
+    or anything besides the parts is left (e.g. a date without a time).
+    """
+    now = now or timezone.now()
+    local_now = timezone.localtime(now)
+    schedule = {}
+
+    # The window goes first, so its start isn't read as a start time
+    window, text = _take(_WINDOW_RE, text)
+    rate, text = _take(_RATE_RE, text)
+    start, text = _take(_START_RE, text)
+    if _SEPARATORS_RE.sub('', text):
+        return None
+
+    try:
+        if start:
+            day, month, year, hour, minute = start.groups()
+            scheduled_at = local_now.replace(
+                year=int(year) if year else local_now.year,
+                month=int(month),
+                day=int(day),
+                hour=int(hour),
+                minute=int(minute),
+                second=0,
+                microsecond=0,
+            )
+            if not year and scheduled_at < local_now:
+                scheduled_at = scheduled_at.replace(year=scheduled_at.year + 1)
+            schedule['scheduled_at'] = scheduled_at
+
+        if window:
+            start_h, start_m, end_h, end_m = map(int, window.groups())
+            schedule['window_start'] = time(start_h, start_m)
+            schedule['window_end'] = time(end_h, end_m)
+            if schedule['window_start'] == schedule['window_end']:
+                return None
+    except ValueError:
+        return None
+
+    if rate:
+        if not int(rate.group(1)):
+            return None
+        schedule['max_per_minute'] = int(rate.group(1))
+
+    return BroadcastSchedule(**schedule) if schedule else None
@@ -0,0 +1,123 @@
+"""
+Conversation state stores for the bot.
+
+The store is selected with settings.TELEGRAM_CONVERSATION_STORE:
+- RedisConversationStore: one hash per user with TTL, one round trip
+  per call, native asyncio client (default).
+- DatabaseConversationStore: the ConversationState model (fallback).
+"""
+import json
+import logging
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from apps.bot.models import ConversationState
+from apps.core.redis_clients import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+
+class BaseConversationStore:
+    """Interface for conversation state backends (async API)."""
+
+    async def aget_state(self, telegram_id: int) -> tuple[str, dict]:
+        """Get current state and data for user. ('', {}) if none."""
+        raise NotImplementedError
+
+    async def aset_state(self, telegram_id: int, state: str, data: dict = None) -> None:
+        """Set state and optionally replace data."""
+        raise NotImplementedError
+
+    async def aupdate_data(self, telegram_id: int, **kwargs) -> None:
+        """Merge fields into data."""
+        raise NotImplementedError
+
+    async def aclear(self, telegram_id: int) -> None:
+        """Clear state and data."""
+        raise NotImplementedError
+
+
+class DatabaseConversationStore(BaseConversationStore):
+    """Store backed by the ConversationState model."""
+
+    async def aget_state(self, telegram_id: int) -> tuple[str, dict]:
+        # Read-only lookup: no row is created for users without a conversation
+        row = await ConversationState.objects.filter(telegram_id=telegram_id).values_list('state', 'data').afirst()
+        if row is None:
+            return '', {}
+        return row[0], row[1]
+
+    async def aset_state(self, telegram_id: int, state: str, data: dict = None) -> None:
+        await ConversationState.aset_state(telegram_id, state, data)
+
+    async def aupdate_data(self, telegram_id: int, **kwargs) -> None:
+        await ConversationState.aupdate_data(telegram_id, **kwargs)
+
+    async def aclear(self, telegram_id: int) -> None:
+        await ConversationState.aclear(telegram_id)
+
+
+class RedisConversationStore(BaseConversationStore):
+    """
+    Store backed by a Redis hash per user.
+
+    Key layout: {prefix}{telegram_id} -> {'state': str, 'data': json}.
+    Every write refreshes the TTL, so abandoned conversations expire.
+    """
+
+    def __init__(self, url: str | None = None, ttl: int | None = None, prefix: str = 'bot:conv:'):
+        self.url = url or settings.REDIS_URL
+        self.ttl = ttl or settings.TELEGRAM_CONVERSATION_TTL
+        self.prefix = prefix
+
+    def _client(self):
+        return get_async_redis(self.url)
+
+    def _key(self, telegram_id: int) -> str:
+        return f'{self.prefix}{telegram_id}'
+
+    async def aget_state(self, telegram_id: int) -> tuple[str, dict]:
+        values = await self._client().hgetall(self._key(telegram_id))
+        if not values:
+            return '', {}
+        return values.get('state', ''), json.loads(values.get('data') or '{}')
+
+    async def aset_state(self, telegram_id: int, state: str, data: dict = None) -> None:
+        key = self._key(telegram_id)
+        mapping = {'state': state}
+        if data is not None:
+            mapping['data'] = json.dumps(data, ensure_ascii=False)
+
+        async with self._client().pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def aupdate_data(self, telegram_id: int, **kwargs) -> None:
+        key = self._key(telegram_id)
+        client = self._client()
+        current = json.loads(await client.hget(key, 'data') or '{}')
+        current.update(kwargs)
+
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, 'data', json.dumps(current, ensure_ascii=False))
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def aclear(self, telegram_id: int) -> None:
+        await self._client().delete(self._key(telegram_id))
+
+
+# Singleton instance for convenience
+_store: BaseConversationStore | None = None
+
+
+def get_conversation_store() -> BaseConversationStore:
+    """Get or create the configured conversation store singleton."""
+    global _store
+    if _store is None:
+        store_class = import_string(settings.TELEGRAM_CONVERSATION_STORE)
+        _store = store_class()
+        logger.debug(f"Using conversation store: {store_class.__name__}")
+    return _store
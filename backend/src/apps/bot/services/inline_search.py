@@ -0,0 +1,185 @@
+"""
+In-process product search index for bot inline mode.
+
+Inline queries arrive on every keystroke, so they are answered from an
+in-memory prefix index over active products instead of the database.
+The index is rebuilt lazily: catalog signals bump a version key in the
+two-tier 'hot' cache, and every process compares its copy against that
+version at most once per TELEGRAM_INLINE_INDEX_CHECK_INTERVAL seconds
+(usually from its local tier, without a Redis round trip).
+"""
+import logging
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.core.cache import hot_cache
+from apps.products.models import Product, ProductImage
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = 'bot:inline_index:version'
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, 'ё' folded to 'е'."""
+    return _TOKEN_RE.findall(text.lower().replace('ё', 'е'))
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedProduct:
+    """Product fields needed to render an inline result."""
+    id: int
+    title: str
+    slug: str
+    price: int  # копейки
+    old_price: int | None
+    category_title: str
+    image_url: str | None
+
+    @property
+    def price_display(self) -> str:
+        return f"{self.price // 100:,}".replace(',', ' ') + ' ₽'
+
+
+class ProductSearchIndex:
+    """
+    Immutable prefix index: sorted tokens with posting sets of product ids.
+
+    Every query token must prefix-match some title/category token (AND);
+    results keep catalog order (sort_order, newest first).
+    """
+
+    def __init__(self, products: Iterable[IndexedProduct], version: str | None = None):
+        self.version = version
+        self.products: list[IndexedProduct] = list(products)
+        self._rank = {product.id: rank for rank, product in enumerate(self.products)}
+
+        postings: dict[str, set[int]] = {}
+        for product in self.products:
+            for token in tokenize(f'{product.title} {product.category_title}'):
+                postings.setdefault(token, set()).add(product.id)
+
+        self._tokens = sorted(postings)
+        self._postings = [frozenset(postings[token]) for token in self._tokens]
+        self._by_id = {product.id: product for product in self.products}
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def _match_prefix(self, prefix: str) -> set[int]:
+        matched: set[int] = set()
+        position = bisect_left(self._tokens, prefix)
+        while position < len(self._tokens) and self._tokens[position].startswith(prefix):
+            matched |= self._postings[position]
+            position += 1
+        return matched
+
+    def search(self, query: str, limit: int = 50, offset: int = 0) -> list[IndexedProduct]:
+        """Find products whose words start with every word of the query."""
+        tokens = tokenize(query)
+        if not tokens:
+            return self.products[offset:offset + limit]
+
+        # Rarest token first keeps intersections small
+        matches = sorted((self._match_prefix(token) for token in set(tokens)), key=len)
+        ids = matches[0]
+        for other in matches[1:]:
+            if not ids:
+                break
+            ids = ids & other
+
+        ranked = sorted(ids, key=self._rank.__getitem__)
+        return [self._by_id[product_id] for product_id in ranked[offset:offset + limit]]
+
+
+def load_indexed_products() -> list[IndexedProduct]:
+    """Load active products with their main image URL (two queries)."""
+    rows = (
+        Product.objects
+        .filter(is_active=True)
+        .order_by('sort_order', '-created_at')
+        .values_list('id', 'title', 'slug', 'price', 'old_price', 'category__title')
+    )
+
+    images: dict[int, str] = {}
+    image_rows = (
+        ProductImage.objects
+        .filter(product__is_active=True)
+        .order_by('product_id', '-is_main', 'sort_order')
+        .values_list('product_id', 'image')
+    )
+    storage = ProductImage._meta.get_field('image').storage
+    for product_id, name in image_rows:
+        if product_id not in images and name:
+            images[product_id] = storage.url(name)
+
+    return [
+        IndexedProduct(
+            id=product_id,
+            title=title,
+            slug=slug,
+            price=price,
+            old_price=old_price,
+            category_title=category_title or '',
+            image_url=images.get(product_id),
+        )
+        for product_id, title, slug, price, old_price, category_title in rows
+    ]
+
+
+# Per-process tier: (index, last version check monotonic)
+_index: ProductSearchIndex | None = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def get_product_index() -> ProductSearchIndex:
+    """Get the process-wide index, rebuilding it if the catalog changed."""
+    global _index, _checked_at
+
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < settings.TELEGRAM_INLINE_INDEX_CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        version = hot_cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            # First process after a cache flush publishes a version
+            hot_cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = hot_cache.get(VERSION_CACHE_KEY)
+
+        if _index is None or _index.version != version:
+            started = time.perf_counter()
+            _index = ProductSearchIndex(load_indexed_products(), version=version)
+            logger.info(
+                f"Inline search index built: {len(_index)} products "
+                f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+
+        _checked_at = time.monotonic()
+        return _index
+
+
+async def aget_product_index() -> ProductSearchIndex:
+    """Async variant: no thread hop while the local copy is fresh."""
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < settings.TELEGRAM_INLINE_INDEX_CHECK_INTERVAL:
+        return index
+    return await sync_to_async(get_product_index)()
+
+
+def invalidate_product_index() -> None:
+    """Mark the index stale in every process (called from catalog signals)."""
+    global _index
+    _index = None
+    hot_cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
@@ -0,0 +1,161 @@
+"""
+Sending product photos through the Telegram file_id cache.
+
+The first send uploads the image bytes from storage; the file_id Telegram
+returns is stored in TelegramFileCache (read through the Django cache), and
+every later send of the same image version references it instead, with no
+upload at all.
+
+Usage:
+    from apps.bot.services.media import send_product_photo
+
+    response = send_product_photo(chat_id, product_image, caption='...')
+
+Outbox rows with method PRODUCT_PHOTO_METHOD (order confirmations with the
+photo of the first item) are delivered through send_outbox_photo().
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.bot.models import TelegramFileCache
+from apps.bot.services.telegram_api import TelegramClient, TelegramResponse, get_telegram_client
+from apps.products.models import ProductImage
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+# Outbox method of product photos; not a Bot API method, see send_outbox_photo()
+PRODUCT_PHOTO_METHOD = 'sendProductPhoto'
+# Bot API limit for photo captions
+CAPTION_MAX_LENGTH = 1024
+# Cached value for images that were never uploaded (avoids a DB hit per send)
+MISSING = ''
+
+
+def get_bot_id() -> int:
+    """Bot id is the numeric part of the token; file_ids are bound to it."""
+    token = settings.TELEGRAM_BOT_TOKEN or ''
+    bot_id, _, _ = token.partition(':')
+    return int(bot_id) if bot_id.isdigit() else 0
+
+
+def _cache_key(image_id: int, file_version: str, bot_id: int) -> str:
+    return f'bot:file_id:{bot_id}:{image_id}:{file_version}'
+
+
+def get_cached_file_id(image: ProductImage) -> str | None:
+    """Return the Telegram file_id for the current image file, if uploaded."""
+    bot_id = get_bot_id()
+    key = _cache_key(image.pk, image.image.name, bot_id)
+
+    file_id = cache.get(key)
+    if file_id is None:
+        file_id = (
+            TelegramFileCache.objects
+            .filter(image_id=image.pk, bot_id=bot_id, file_version=image.image.name)
+            .values_list('file_id', flat=True)
+            .first()
+        ) or MISSING
+        cache.set(key, file_id, CACHE_TIMEOUT)
+
+    return file_id or None
+
+
+def remember_file_id(image: ProductImage, file_id: str, file_unique_id: str = '') -> None:
+    """Store the file_id returned after uploading an image."""
+    bot_id = get_bot_id()
+    TelegramFileCache.objects.update_or_create(
+        image_id=image.pk,
+        bot_id=bot_id,
+        file_version=image.image.name,
+        defaults={'file_id': file_id, 'file_unique_id': file_unique_id},
+    )
+    cache.set(_cache_key(image.pk, image.image.name, bot_id), file_id, CACHE_TIMEOUT)
+
+
+def forget_file_id(image: ProductImage) -> None:
+    """Drop the file_id of the current image file (e.g. Telegram rejected it)."""
+    bot_id = get_bot_id()
+    TelegramFileCache.objects.filter(
+        image_id=image.pk,
+        bot_id=bot_id,
+        file_version=image.image.name,
+    ).delete()
+    cache.delete(_cache_key(image.pk, image.image.name, bot_id))
+
+
+def invalidate_image_files(image: ProductImage) -> int:
+    """Delete file_ids of previous versions after an image was replaced."""
+    deleted, _ = (
+        TelegramFileCache.objects
+        .filter(image_id=image.pk)
+        .exclude(file_version=image.image.name)
+        .delete()
+    )
+    return deleted
+
+
+def _largest_photo(response: TelegramResponse) -> dict | None:
+    photos = (response.result or {}).get('photo') or []
+    return photos[-1] if photos else None
+
+
+def send_product_photo(
+    chat_id: int,
+    image: ProductImage,
+    caption: str | None = None,
+    client: TelegramClient | None = None,
+    **extra,
+) -> TelegramResponse:
+    """
+    Send a product photo, uploading it only if Telegram doesn't have it yet.
+
+    Extra keyword arguments are passed to sendPhoto (parse_mode, reply_markup, ...).
+    """
+    client = client or get_telegram_client()
+    payload = {'chat_id': chat_id, **extra}
+    if caption:
+        payload['caption'] = caption
+
+    file_id = get_cached_file_id(image)
+    if file_id:
+        response = client.call('sendPhoto', {**payload, 'photo': file_id})
+        if response.ok or response.error_code != 400 or 'file' not in response.description.lower():
+            return response
+        # Telegram no longer knows this file_id: upload again
+        logger.warning(f"Cached file_id for image {image.pk} rejected: {response.description}")
+        forget_file_id(image)
+
+    with image.image.open('rb') as f:
+        content = f.read()
+
+    response = client.call(
+        'sendPhoto',
+        payload,
+        files={'photo': (image.image.name.rsplit('/', 1)[-1], content)},
+    )
+
+    photo = _largest_photo(response) if response.ok else None
+    if photo:
+        remember_file_id(image, photo['file_id'], photo.get('file_unique_id', ''))
+
+    return response
+
+
+def send_outbox_photo(chat_id: int, payload: dict, client: TelegramClient | None = None) -> TelegramResponse:
+    """
+    Deliver a PRODUCT_PHOTO_METHOD outbox payload: {'image_id', 'caption'}.
+
+    If the image was deleted meanwhile (or its file is gone from storage)
+    the caption is sent as a plain message instead.
+    """
+    client = client or get_telegram_client()
+    image = ProductImage.objects.filter(pk=payload['image_id']).first()
+    if image is not None:
+        try:
+            return send_product_photo(chat_id, image, caption=payload['caption'], client=client)
+        except OSError as e:
+            logger.warning(f"Image {image.pk} is unreadable, sending the caption only: {e}")
+    return client.call('sendMessage', {'chat_id': chat_id, 'text': payload['caption']})
@@ -2,9 +2,14 @@
 Telegram notification service for orders.
 """
 import logging
-import requests
+
 from django.conf import settings
 
+from apps.bot.models import NotificationKind, NotificationOutbox
+from apps.bot.services.media import CAPTION_MAX_LENGTH, PRODUCT_PHOTO_METHOD
+from apps.bot.services.outbox import enqueue_notification
+from apps.bot.services.telegram_api import get_telegram_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,8 +19,7 @@ def format_price(kopeks: int) -> str:
     return f"{rubles:,}".replace(",", " ") + " ₽"
 
 
-def send_order_notification(
-    telegram_id: int,
+def build_order_message(
     order_id: int,
     items: list[dict],
     total: int,
@@ -23,28 +27,8 @@ def send_order_notification(
     delivery_address: str,
     delivery_date: str | None = None,
     delivery_time: str | None = None,
-) -> bool:
-    """
-    Send order confirmation notification to user.
-
-    Args:
-        telegram_id: User's Telegram ID
-        order_id: Order number
-        items: List of dicts with 'title', 'qty', 'line_total'
-        total: Total amount in kopeks
-        delivery_fee: Delivery fee in kopeks
-        delivery_address: Delivery address
-        delivery_date: Optional delivery date string
-        delivery_time: Optional delivery time string
-
-    Returns:
-        True if sent successfully, False otherwise
-    """
-    bot_token = settings.TELEGRAM_BOT_TOKEN
-    if not bot_token:
-        logger.error("TELEGRAM_BOT_TOKEN not configured")
-        return False
-
+) -> str:
+    """Build the order confirmation text."""
     # Build items list
     items_text = "\n".join(
         f"• {item['title']} x{item['qty']} — {format_price(item['line_total'])}"
@@ -73,28 +57,109 @@ def send_order_notification(
             date_line += f", {delivery_time}"
         lines.append(date_line)
 
-    message = "\n".join(lines)
-
-    # Send via Telegram API
-    try:
-        response = requests.post(
-            f"https://api.telegram.org/bot{bot_token}/sendMessage",
-            json={
-                "chat_id": telegram_id,
-                "text": message,
-            },
-            timeout=30,
-        )
+    return "\n".join(lines)
+
+
+def enqueue_order_notification(
+    telegram_id: int,
+    order_id: int,
+    items: list[dict],
+    total: int,
+    delivery_fee: int,
+    delivery_address: str,
+    delivery_date: str | None = None,
+    delivery_time: str | None = None,
+    image_id: int | None = None,
+) -> NotificationOutbox:
+    """
+    Put order confirmation into the notification outbox.
 
-        if response.status_code == 200:
-            logger.info(f"Order notification sent for order #{order_id} to {telegram_id}")
-            return True
+    With image_id (a ProductImage of the order) the confirmation is sent
+    as that photo with the text as its caption, if the text fits one.
 
-        logger.error(
-            f"Failed to send order notification: {response.status_code} - {response.text}"
+    Must be called inside the transaction that creates the order:
+    the notification is delivered only if that transaction commits.
+    """
+    message = build_order_message(
+        order_id=order_id,
+        items=items,
+        total=total,
+        delivery_fee=delivery_fee,
+        delivery_address=delivery_address,
+        delivery_date=delivery_date,
+        delivery_time=delivery_time,
+    )
+    if image_id and len(message) <= CAPTION_MAX_LENGTH:
+        return enqueue_notification(
+            NotificationKind.ORDER_CREATED,
+            telegram_id,
+            {'image_id': image_id, 'caption': message},
+            method=PRODUCT_PHOTO_METHOD,
+            order_id=order_id,
         )
-        return False
+    return enqueue_notification(
+        NotificationKind.ORDER_CREATED,
+        telegram_id,
+        {'text': message},
+        order_id=order_id,
+    )
+
+
+def send_order_notification(
+    telegram_id: int,
+    order_id: int,
+    items: list[dict],
+    total: int,
+    delivery_fee: int,
+    delivery_address: str,
+    delivery_date: str | None = None,
+    delivery_time: str | None = None,
+) -> bool:
+    """
+    Send order confirmation notification to user.
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to send order notification: {e}")
+    Args:
+        telegram_id: User's Telegram ID
+        order_id: Order number
+        items: List of dicts with 'title', 'qty', 'line_total'
+        total: Total amount in kopeks
+        delivery_fee: Delivery fee in kopeks
+        delivery_address: Delivery address
+        delivery_date: Optional delivery date string
+        delivery_time: Optional delivery time string
+
+    Returns:
+        True if sent successfully, False otherwise
+    """
+    bot_token = settings.TELEGRAM_BOT_TOKEN
+    if not bot_token:
+        logger.error("TELEGRAM_BOT_TOKEN not configured")
         return False
+
+    message = build_order_message(
+        order_id=order_id,
+        items=items,
+        total=total,
+        delivery_fee=delivery_fee,
+        delivery_address=delivery_address,
+        delivery_date=delivery_date,
+        delivery_time=delivery_time,
+    )
+
+    # Send via shared Telegram API client (pooled connections)
+    response = get_telegram_client().call(
+        'sendMessage',
+        {
+            'chat_id': telegram_id,
+            'text': message,
+        },
+    )
+
+    if response.ok:
+        logger.info(f"Order notification sent for order #{order_id} to {telegram_id}")
+        return True
+
+    logger.error(
+        f"Failed to send order notification: {response.status_code} - {response.description}"
+    )
+    return False
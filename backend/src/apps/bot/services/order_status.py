@@ -0,0 +1,109 @@
+"""
+Order status change notifications with coalescing.
+
+Staff often move an order through several statuses in a row. Each change
+only updates the order's single pending ORDER_STATUS outbox row (new text,
+due time pushed back by ORDER_STATUS_NOTIFICATION_DELAY), so the customer
+gets one message with the latest status once the order has settled.
+Delivery goes through the rate-limited outbox dispatcher.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Subquery
+from django.utils import timezone
+
+from apps.bot.models import NotificationKind, NotificationOutbox, OutboxStatus
+from apps.bot.services.outbox import enqueue_notification, kick_dispatcher
+from apps.orders.models import OrderStatus
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+# Statuses customers hear about (NEW is covered by the order confirmation)
+STATUS_MESSAGES = {
+    OrderStatus.CONFIRMED: '✅ Заказ #{order_id} подтверждён',
+    OrderStatus.IN_PROGRESS: '💐 Заказ #{order_id} собираем',
+    OrderStatus.DELIVERING: '🚚 Заказ #{order_id} передан курьеру',
+    OrderStatus.DONE: '🌸 Заказ #{order_id} доставлен. Спасибо, что выбрали нас!',
+    OrderStatus.CANCELLED: '❌ Заказ #{order_id} отменён',
+}
+
+
+def build_status_message(order_id: int, status: str) -> str | None:
+    """Text for the status, or None if the status is not notified."""
+    template = STATUS_MESSAGES.get(status)
+    return template.format(order_id=order_id) if template else None
+
+
+def _recipient(order_id: int, user_id: int) -> tuple[int | None, str | None]:
+    """
+    The customer's telegram_id and the status text they got last (or are
+    getting right now: rows in flight have no sent_at yet), in one query.
+    """
+    last_text = (
+        NotificationOutbox.objects
+        .filter(
+            order_id=order_id,
+            kind=NotificationKind.ORDER_STATUS,
+            status__in=[OutboxStatus.SENT, OutboxStatus.SENDING],
+        )
+        .order_by(F('sent_at').desc(nulls_first=True), '-id')
+        .values('payload__text')[:1]
+    )
+    row = (
+        User.objects
+        .filter(pk=user_id)
+        .annotate(last_text=Subquery(last_text))
+        .values_list('telegram_id', 'last_text')
+        .first()
+    )
+    return row or (None, None)
+
+
+@transaction.atomic
+def enqueue_status_notification(order_id: int, user_id: int, status: str) -> NotificationOutbox | None:
+    """
+    Schedule (or reschedule) the status notification for an order.
+
+    Returns the pending outbox row, or None if nothing will be sent.
+    """
+    telegram_id, last_text = _recipient(order_id, user_id)
+    if not telegram_id:
+        return None
+
+    delay = settings.ORDER_STATUS_NOTIFICATION_DELAY
+    text = build_status_message(order_id, status)
+
+    # A row a dispatcher has claimed is SENDING and no longer matches,
+    # so a change made while it is in flight gets a new row
+    pending = (
+        NotificationOutbox.objects
+        .select_for_update()
+        .filter(order_id=order_id, kind=NotificationKind.ORDER_STATUS, status=OutboxStatus.PENDING)
+        .first()
+    )
+
+    # Back to a silent status, or to the one the customer already knows
+    if text is None or text == last_text:
+        if pending:
+            pending.delete()
+        return None
+
+    if pending is None:
+        return enqueue_notification(
+            NotificationKind.ORDER_STATUS,
+            telegram_id,
+            {'text': text},
+            order_id=order_id,
+            delay=delay,
+        )
+
+    pending.payload = {'text': text}
+    pending.available_at = timezone.now() + timedelta(seconds=delay)
+    pending.save(update_fields=['payload', 'available_at'])
+    transaction.on_commit(lambda: kick_dispatcher(countdown=delay))
+    logger.debug(f"Order #{order_id} status notification coalesced: {status}")
+    return pending
@@ -0,0 +1,209 @@
+"""
+Notification outbox: enqueue inside a transaction, deliver after commit.
+
+enqueue_notification() only inserts a row, so it rolls back together with
+the caller's transaction. After commit a dispatcher run is requested from
+Celery in the background (a broker outage never slows down or fails the
+request), and the periodic sweep picks up anything the kick missed.
+
+dispatch_outbox() leases due rows in a short transaction (SELECT ... FOR
+UPDATE SKIP LOCKED, then status SENDING until the lease expires), so
+concurrent dispatchers never send the same row twice, sends them with no
+transaction or lock held, and saves each row's outcome on its own.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.bot.models import NotificationOutbox, OutboxStatus
+from apps.bot.services.media import PRODUCT_PHOTO_METHOD, send_outbox_photo
+from apps.bot.services.telegram_api import TelegramClient, TelegramResponse, get_telegram_client
+
+logger = logging.getLogger(__name__)
+
+# Retry delay after a failed attempt: RETRY_BASE_DELAY * 2^(attempts - 1), capped
+RETRY_BASE_DELAY = 30  # seconds
+RETRY_MAX_DELAY = 60 * 60
+
+
+def enqueue_notification(
+    kind: str,
+    telegram_id: int,
+    payload: dict,
+    method: str = 'sendMessage',
+    order_id: int | None = None,
+    delay: int = 0,
+) -> NotificationOutbox:
+    """
+    Add a notification to the outbox, due after delay seconds.
+
+    Call inside the transaction that makes the change being notified.
+    """
+    row = NotificationOutbox.objects.create(
+        kind=kind,
+        telegram_id=telegram_id,
+        order_id=order_id,
+        method=method,
+        payload=payload,
+        available_at=timezone.now() + timedelta(seconds=delay),
+    )
+    transaction.on_commit(lambda: kick_dispatcher(countdown=delay))
+    return row
+
+
+# Set while a kick is being published, so a slow broker doesn't pile up threads
+_kick_in_flight = threading.Event()
+
+
+def _publish_kick(countdown: int) -> None:
+    from apps.bot.tasks.outbox import dispatch_notification_outbox_task
+
+    try:
+        dispatch_notification_outbox_task.apply_async(countdown=countdown or None, retry=False)
+    except Exception as e:
+        logger.warning(f"Outbox dispatcher kick failed, leaving it to the sweep: {e}")
+    finally:
+        _kick_in_flight.clear()
+
+
+def kick_dispatcher(countdown: int = 0) -> None:
+    """
+    Ask a worker to drain the outbox (after countdown seconds).
+
+    The periodic sweep is the fallback. Publishing happens in a background
+    thread: even a hanging broker adds nothing to the request that
+    enqueued the notification.
+    """
+    if _kick_in_flight.is_set():
+        return
+    _kick_in_flight.set()
+    threading.Thread(target=_publish_kick, args=(countdown,), name='outbox-kick', daemon=True).start()
+
+
+def _retry_delay(attempts: int, response: TelegramResponse) -> timedelta:
+    if response.retry_after:
+        return timedelta(seconds=response.retry_after)
+    seconds = RETRY_BASE_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, RETRY_MAX_DELAY))
+
+
+def _outcome(row: NotificationOutbox, response: TelegramResponse) -> dict:
+    """Fields to store on a claimed row after a delivery attempt."""
+    now = timezone.now()
+    attempts = row.attempts + 1
+
+    if response.ok:
+        return {'status': OutboxStatus.SENT, 'attempts': attempts, 'sent_at': now, 'last_error': ''}
+
+    error = response.description or f'HTTP {response.status_code}'
+    if response.is_blocked or attempts >= settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS:
+        logger.warning(f"Outbox notification {row.pk} failed permanently: {error}")
+        return {'status': OutboxStatus.FAILED, 'attempts': attempts, 'last_error': error}
+    return {
+        'status': OutboxStatus.PENDING,
+        'attempts': attempts,
+        'last_error': error,
+        'available_at': now + _retry_delay(attempts, response),
+    }
+
+
+def _deliver(client: TelegramClient, row: NotificationOutbox) -> str:
+    """Send one claimed row and save its outcome right away. Returns the new status."""
+    try:
+        if row.method == PRODUCT_PHOTO_METHOD:
+            response = send_outbox_photo(row.telegram_id, row.payload, client)
+        else:
+            response = client.call(row.method, {**row.payload, 'chat_id': row.telegram_id})
+    except Exception as e:
+        logger.exception(f"Outbox notification {row.pk} raised")
+        response = TelegramResponse.from_exception(e)
+
+    fields = _outcome(row, response)
+    NotificationOutbox.objects.filter(pk=row.pk, status=OutboxStatus.SENDING).update(**fields)
+    return fields['status']
+
+
+def _claim(batch_size: int) -> tuple[list[NotificationOutbox], float]:
+    """
+    Lease a batch of due rows: mark them SENDING until the lease expires.
+
+    The row locks are held only for this short transaction; sending
+    happens after commit. Rows of a dispatcher that died mid-batch are
+    claimed again once their lease runs out. Returns the rows and the
+    monotonic time their lease ends.
+    """
+    lease = settings.NOTIFICATION_OUTBOX_LEASE
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            NotificationOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=[OutboxStatus.PENDING, OutboxStatus.SENDING], available_at__lte=now)
+            .order_by('available_at', 'id')[:batch_size]
+        )
+        if rows:
+            NotificationOutbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                status=OutboxStatus.SENDING,
+                available_at=now + timedelta(seconds=lease),
+            )
+    return rows, time.monotonic() + lease
+
+
+def _release(rows: list[NotificationOutbox]) -> None:
+    """Give claimed but unsent rows back to the queue."""
+    NotificationOutbox.objects.filter(
+        pk__in=[row.pk for row in rows],
+        status=OutboxStatus.SENDING,
+    ).update(status=OutboxStatus.PENDING, available_at=timezone.now())
+
+
+def dispatch_outbox(batch_size: int | None = None, client: TelegramClient | None = None) -> dict:
+    """
+    Deliver due notifications, a leased batch at a time.
+
+    Each row's outcome is saved as soon as it is sent, so an error (or a
+    killed worker) never causes a resend of rows already delivered.
+
+    Returns stats: {'sent': int, 'failed': int, 'retrying': int}.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    client = client or get_telegram_client()
+    stats = {'sent': 0, 'failed': 0, 'retrying': 0}
+    # Stay under the Bot API global limit (~30 messages per second)
+    min_interval = 1.0 / settings.NOTIFICATION_OUTBOX_RATE_LIMIT
+    # Stop sending a batch well before its lease ends
+    margin = settings.NOTIFICATION_OUTBOX_LEASE / 10
+    last_sent = 0.0
+
+    while True:
+        rows, lease_ends = _claim(batch_size)
+
+        for i, row in enumerate(rows):
+            if time.monotonic() > lease_ends - margin:
+                _release(rows[i:])
+                break
+
+            wait = min_interval - (time.monotonic() - last_sent)
+            if wait > 0:
+                time.sleep(wait)
+            last_sent = time.monotonic()
+
+            status = _deliver(client, row)
+            if status == OutboxStatus.SENT:
+                stats['sent'] += 1
+            elif status == OutboxStatus.FAILED:
+                stats['failed'] += 1
+            else:
+                stats['retrying'] += 1
+
+        if len(rows) < batch_size:
+            break
+
+    if any(stats.values()):
+        logger.info(f"Outbox dispatched: {stats}")
+    return stats
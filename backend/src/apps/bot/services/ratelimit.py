@@ -0,0 +1,124 @@
+"""
+Per-user rate limiting for webhook updates.
+
+Every update is matched to a rule (see TELEGRAM_RATE_LIMITS) and takes a
+token from the sender's bucket for that rule. Buckets live in Redis and
+are checked and updated by one Lua script (apps.core.services.token_bucket),
+so all workers share them and a check costs a single round trip. An
+update that finds its bucket empty is dropped before it is parsed or
+reaches a handler (no user lookup, no conversation state read).
+
+Rule lookup, most specific first:
+    command:<name>  (e.g. command:start)
+    command         (any other /command)
+    <update type>   (message, inline_query, callback_query, ...)
+    default
+
+Drops are counted per rule in process memory and in the shared
+bot:ratelimit:drops hash (see drop_counts / adrop_counts).
+"""
+import logging
+import threading
+
+from django.conf import settings
+
+from apps.core.services.token_bucket import Bucket, TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def classify_update(data: dict) -> tuple[int | None, list[str]]:
+    """
+    Get the sender id and the candidate rule names for a raw update.
+
+    Works on the webhook JSON, so dropped updates are never deserialized.
+    """
+    update_type = next((key for key in data if key != 'update_id'), None)
+    body = data.get(update_type) if update_type else None
+    if not isinstance(body, dict):
+        return None, ['default']
+
+    sender = body.get('from') or {}
+    candidates = []
+
+    text = body.get('text') or ''
+    if update_type == 'message' and text.startswith('/'):
+        # '/start@FlowerBot payload' -> 'start'
+        parts = text[1:].split(maxsplit=1)
+        command = parts[0].split('@', 1)[0].lower() if parts else ''
+        if command:
+            candidates.append(f'command:{command}')
+        candidates.append('command')
+
+    candidates.extend([update_type, 'default'])
+    return sender.get('id'), candidates
+
+
+class UpdateRateLimiter:
+    """Token-bucket limiter for webhook updates, keyed by rule and user."""
+
+    def __init__(
+        self,
+        url: str | None = None,
+        rules: dict | None = None,
+        prefix: str = 'bot:ratelimit:',
+    ):
+        rules = settings.TELEGRAM_RATE_LIMITS if rules is None else rules
+        # A rule set to None disables limiting for that rule
+        self.rules = {
+            name: Bucket(**rule) if rule is not None else None
+            for name, rule in rules.items()
+        }
+        self.limiter = TokenBucketLimiter(url=url, prefix=prefix)
+        self._drops: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def match(self, candidates: list[str]) -> tuple[str, Bucket | None]:
+        """First configured rule among the candidates."""
+        for name in candidates:
+            if name in self.rules:
+                return name, self.rules[name]
+        return 'default', None
+
+    async def aallow(self, data: dict) -> bool:
+        """
+        Take a token for the update's sender.
+
+        Returns False if the update should be dropped. Updates without a
+        sender or a rule always pass, and so does everything while Redis
+        is unavailable.
+        """
+        user_id, candidates = classify_update(data)
+        rule_name, rule = self.match(candidates)
+        if user_id is None or rule is None:
+            return True
+
+        allowed, _ = await self.limiter.atake(rule_name, [(f'{rule_name}:{user_id}', rule)])
+        if allowed:
+            return True
+
+        with self._lock:
+            self._drops[rule_name] = self._drops.get(rule_name, 0) + 1
+        logger.info(f"Rate limited update from {user_id} ({rule_name})")
+        return False
+
+    def drop_counts(self) -> dict[str, int]:
+        """Updates dropped by this process, per rule."""
+        with self._lock:
+            return dict(self._drops)
+
+    async def adrop_counts(self) -> dict[str, int]:
+        """Updates dropped by all workers, per rule (since the hash was reset)."""
+        return await self.limiter.adrop_counts()
+
+
+# Singleton instance for convenience
+_limiter: UpdateRateLimiter | None = None
+
+
+def get_update_rate_limiter() -> UpdateRateLimiter:
+    """Get or create the update rate limiter singleton."""
+    global _limiter
+    if _limiter is None:
+        _limiter = UpdateRateLimiter()
+    return _limiter
@@ -0,0 +1,103 @@
+"""
+Broadcast recipient resolution.
+"""
+from django.db.models.functions import Lower
+
+from apps.users.models import User
+
+
+def normalize_username(username: str) -> str:
+    """Strip leading @ and lowercase a Telegram username."""
+    return username.strip().lstrip('@').lower()
+
+
+def _wanted_usernames(usernames: list[str]) -> list[str]:
+    return list(dict.fromkeys(
+        normalized for normalized in (normalize_username(u) for u in usernames) if normalized
+    ))
+
+
+_FIELDS = ('id', 'telegram_id', 'telegram_username', 'username')
+
+
+def _by_telegram_username(wanted: list[str]):
+    return User.objects.filter(
+        telegram_username__in=wanted,
+        telegram_id__isnull=False,
+    ).values(*_FIELDS)
+
+
+def _by_username(remaining: list[str]):
+    return (
+        User.objects
+        .alias(username_lower=Lower('username'))
+        .filter(username_lower__in=remaining, telegram_id__isnull=False)
+        .values(*_FIELDS)
+    )
+
+
+def _split_found(wanted: list[str], matched: dict[str, dict]) -> tuple[list[dict], list[str]]:
+    found = []
+    not_found = []
+    seen_ids = set()
+
+    for username in wanted:
+        row = matched.get(username)
+        if row is None:
+            not_found.append(username)
+            continue
+        if row['id'] in seen_ids:
+            continue
+        seen_ids.add(row['id'])
+        found.append({
+            'id': row['id'],
+            'telegram_id': row['telegram_id'],
+            'username': row['telegram_username'] or row['username'],
+        })
+
+    return found, not_found
+
+
+def find_users_by_usernames(usernames: list[str]) -> tuple[list[dict], list[str]]:
+    """
+    Resolve Telegram usernames to users.
+
+    Looks up `telegram_username` first (stored lowercased), then falls back
+    to `username` for handles that are still unresolved. Each lookup is a
+    single IN (...) query backed by an index, regardless of list size.
+
+    Returns (found_users, not_found_usernames), both in input order.
+    Found users are dicts with 'id', 'telegram_id' and 'username'.
+    """
+    wanted = _wanted_usernames(usernames)
+    if not wanted:
+        return [], []
+
+    matched: dict[str, dict] = {}
+    for row in _by_telegram_username(wanted):
+        matched.setdefault(row['telegram_username'], row)
+
+    remaining = [u for u in wanted if u not in matched]
+    if remaining:
+        for row in _by_username(remaining):
+            matched.setdefault(row['username'].lower(), row)
+
+    return _split_found(wanted, matched)
+
+
+async def afind_users_by_usernames(usernames: list[str]) -> tuple[list[dict], list[str]]:
+    """Async version of find_users_by_usernames (async queryset iteration)."""
+    wanted = _wanted_usernames(usernames)
+    if not wanted:
+        return [], []
+
+    matched: dict[str, dict] = {}
+    async for row in _by_telegram_username(wanted):
+        matched.setdefault(row['telegram_username'], row)
+
+    remaining = [u for u in wanted if u not in matched]
+    if remaining:
+        async for row in _by_username(remaining):
+            matched.setdefault(row['username'].lower(), row)
+
+    return _split_found(wanted, matched)
@@ -0,0 +1,161 @@
+"""
+Audience segment resolution.
+
+Segments are compiled into a single User queryset with EXISTS subqueries
+and materialized into BroadcastLog with INSERT ... SELECT, so the audience
+never travels through Python memory.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Exists, Max, OuterRef, QuerySet
+from django.utils import timezone
+
+from apps.analytics.models import AnalyticsEvent
+from apps.bot.models import Broadcast, BroadcastLog, BroadcastLogStatus, BroadcastSegment
+from apps.orders.models import Order
+from apps.products.models import FavoriteAction, FavoriteActionType
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+# Rows inserted per INSERT ... SELECT statement
+MATERIALIZE_BATCH_SIZE = 5000
+
+DEFAULT_EVENT_WITHIN_DAYS = 30
+
+
+def build_segment_queryset(segment: BroadcastSegment) -> QuerySet:
+    """Build a User queryset matching the segment filters."""
+    now = timezone.now()
+    users = User.objects.filter(telegram_id__isnull=False, is_active=True)
+
+    if segment.joined_within_days:
+        users = users.filter(date_joined__gte=now - timedelta(days=segment.joined_within_days))
+
+    if segment.ordered_within_days:
+        users = users.filter(Exists(
+            Order.objects.filter(
+                user=OuterRef('pk'),
+                created_at__gte=now - timedelta(days=segment.ordered_within_days),
+            )
+        ))
+
+    if segment.favorite_category_id:
+        users = users.filter(Exists(
+            FavoriteAction.objects.filter(
+                user=OuterRef('pk'),
+                action=FavoriteActionType.ADDED,
+                product__category_id=segment.favorite_category_id,
+            )
+        ))
+
+    if segment.event_type:
+        days = segment.event_within_days or DEFAULT_EVENT_WITHIN_DAYS
+        users = users.filter(Exists(
+            AnalyticsEvent.objects.filter(
+                user=OuterRef('pk'),
+                event_type=segment.event_type,
+                event_date__gte=(now - timedelta(days=days)).date(),
+            )
+        ))
+
+    return users
+
+
+def count_segment(segment: BroadcastSegment) -> int:
+    """Count users in the segment (single COUNT query)."""
+    return build_segment_queryset(segment).count()
+
+
+async def acount_segment(segment: BroadcastSegment) -> int:
+    """Count users in the segment (async)."""
+    return await build_segment_queryset(segment).acount()
+
+
+def materialize_segment(
+    broadcast: Broadcast,
+    segment: BroadcastSegment,
+    batch_size: int = MATERIALIZE_BATCH_SIZE,
+) -> int:
+    """
+    Insert a pending BroadcastLog row for every user in the segment.
+
+    Walks the audience by primary key in batches; each batch is one
+    INSERT ... SELECT round trip that returns only (count, last id).
+
+    Each batch commits together with the broadcast's total_recipients, and
+    the last one sets recipients_materialized, so a call after a killed run
+    resumes from the last inserted user. Batches lock the broadcast row,
+    which keeps concurrent calls from inserting the same users.
+
+    Returns the number of rows inserted by this call.
+    """
+    audience_sql, audience_params = (
+        build_segment_queryset(segment)
+        .order_by()
+        .values('id', 'telegram_id')
+        .query
+        .sql_with_params()
+    )
+
+    log_table = connection.ops.quote_name(BroadcastLog._meta.db_table)
+    sql = f"""
+        WITH batch AS (
+            SELECT audience.id, audience.telegram_id
+            FROM ({audience_sql}) AS audience
+            WHERE audience.id > %s
+            ORDER BY audience.id
+            LIMIT %s
+        ), inserted AS (
+            INSERT INTO {log_table}
+                (broadcast_id, user_id, telegram_id, status, error_message, created_at)
+            SELECT %s, batch.id, batch.telegram_id, %s, '', %s
+            FROM batch
+            RETURNING user_id
+        )
+        SELECT COUNT(*), MAX(user_id) FROM inserted
+    """
+
+    total = 0
+    last_id = None
+    # total_recipients as this call left it; differs if another run inserted meanwhile
+    expected = None
+    while True:
+        with transaction.atomic():
+            progress = (
+                Broadcast.objects
+                .select_for_update()
+                .values('total_recipients', 'recipients_materialized')
+                .get(pk=broadcast.pk)
+            )
+            if progress['recipients_materialized']:
+                break
+            if progress['total_recipients'] != expected:
+                last_id = BroadcastLog.objects.filter(broadcast=broadcast).aggregate(last=Max('user_id'))['last'] or 0
+
+            params = (
+                *audience_params,
+                last_id,
+                batch_size,
+                broadcast.pk,
+                BroadcastLogStatus.PENDING,
+                timezone.now(),
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                inserted, max_id = cursor.fetchone()
+
+            expected = progress['total_recipients'] + inserted
+            done = inserted < batch_size
+            Broadcast.objects.filter(pk=broadcast.pk).update(total_recipients=expected, recipients_materialized=done)
+
+        total += inserted
+        if done:
+            break
+        last_id = max_id
+
+    broadcast.refresh_from_db(fields=['total_recipients', 'recipients_materialized'])
+    logger.info(f"Segment {segment.slug} materialized {total} recipients for broadcast {broadcast.pk}")
+    return total
@@ -0,0 +1,339 @@
+"""
+Shared Telegram Bot API HTTP client.
+
+One client per process keeps connections to the Bot API alive, so
+notifications and broadcasts don't pay for a TCP/TLS handshake per message.
+
+Usage:
+    from apps.bot.services.telegram_api import get_telegram_client
+
+    response = get_telegram_client().call('sendMessage', {'chat_id': 1, 'text': 'Hi'})
+    if response.ok:
+        ...
+"""
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying (besides connection errors)
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def is_connect_error(exc: Exception) -> bool:
+    """
+    The request never reached Telegram, so sending it again can't duplicate it.
+
+    Read timeouts and dropped connections are not retried: Telegram may
+    already have delivered the message.
+    """
+    connect_errors = requests.exceptions.ConnectTimeout | httpx.ConnectError | httpx.ConnectTimeout | httpx.PoolTimeout
+    if isinstance(exc, connect_errors):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        # requests wraps urllib3's MaxRetryError, whose reason tells the phase
+        return isinstance(getattr(exc.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+@dataclass(frozen=True)
+class TelegramResponse:
+    """Result of a Bot API call."""
+    ok: bool
+    status_code: int
+    result: Any = None
+    error_code: int | None = None
+    description: str = ''
+    retry_after: int | None = None
+
+    @classmethod
+    def from_http(cls, status_code: int, payload: Any) -> 'TelegramResponse':
+        """Build response from HTTP status and decoded JSON body."""
+        if not isinstance(payload, dict):
+            payload = {}
+        parameters = payload.get('parameters') or {}
+        return cls(
+            ok=status_code == 200 and bool(payload.get('ok', True)),
+            status_code=status_code,
+            result=payload.get('result'),
+            error_code=payload.get('error_code', None if status_code == 200 else status_code),
+            description=payload.get('description', ''),
+            retry_after=parameters.get('retry_after'),
+        )
+
+    @classmethod
+    def from_exception(cls, exc: Exception) -> 'TelegramResponse':
+        """Build response for a request that never got an HTTP answer."""
+        if isinstance(exc, requests.exceptions.Timeout | httpx.TimeoutException):
+            description = 'Request timeout'
+        else:
+            description = str(exc)
+        return cls(ok=False, status_code=0, description=description)
+
+    @property
+    def is_blocked(self) -> bool:
+        """User blocked the bot or the chat no longer exists."""
+        if self.error_code not in (400, 403):
+            return False
+        description = self.description.lower()
+        return 'blocked' in description or 'chat not found' in description
+
+
+@dataclass
+class MethodStats:
+    """Latency stats for one API method."""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ClientMetrics:
+    """Per-method call counters and latency, kept in process memory."""
+    methods: dict[str, MethodStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, method: str, elapsed_ms: float, ok: bool, retries: int) -> None:
+        with self._lock:
+            stats = self.methods.setdefault(method, MethodStats())
+            stats.calls += 1
+            stats.retries += retries
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if not ok:
+                stats.errors += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """Plain-dict copy of the counters (for logs, health checks, benchmarks)."""
+        with self._lock:
+            return {
+                method: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    'retries': stats.retries,
+                    'avg_ms': round(stats.avg_ms, 2),
+                    'max_ms': round(stats.max_ms, 2),
+                }
+                for method, stats in self.methods.items()
+            }
+
+
+class _BaseTelegramClient:
+    """Settings and retry policy shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        token: str | None = None,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        connect_timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff: float | None = None,
+        pool_size: int | None = None,
+    ):
+        token = token or settings.TELEGRAM_BOT_TOKEN
+        base_url = (base_url or settings.TELEGRAM_API_BASE_URL).rstrip('/')
+        # Token is bound once, method URLs are plain concatenation
+        self.api_url = f'{base_url}/bot{token}'
+        self.token_configured = bool(token)
+        self.timeout = timeout or settings.TELEGRAM_API_TIMEOUT
+        self.connect_timeout = connect_timeout or settings.TELEGRAM_API_CONNECT_TIMEOUT
+        self.max_retries = settings.TELEGRAM_API_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.TELEGRAM_API_RETRY_BACKOFF if backoff is None else backoff
+        self.pool_size = pool_size or settings.TELEGRAM_API_POOL_SIZE
+        self.max_retry_after = settings.TELEGRAM_API_MAX_RETRY_AFTER
+        self.metrics = ClientMetrics()
+
+    def _retry_delay(self, attempt: int, response: TelegramResponse | None) -> float | None:
+        """
+        Seconds to wait before the next attempt, or None to stop.
+
+        response is None for a connection error (only called for those).
+        """
+        if attempt >= self.max_retries:
+            return None
+        if response is not None:
+            if response.status_code not in RETRY_STATUS_CODES:
+                return None
+            if response.retry_after:
+                # Don't hold a worker for a long flood wait: the caller gets
+                # the 429 with retry_after and reschedules
+                if response.retry_after > self.max_retry_after:
+                    return None
+                return float(response.retry_after)
+        # Exponential backoff with jitter
+        return self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+
+    @staticmethod
+    def _form_fields(payload: dict) -> dict:
+        """Multipart requests carry parameters as form fields, non-strings JSON-encoded."""
+        return {
+            key: value if isinstance(value, str) else json.dumps(value)
+            for key, value in payload.items()
+            if value is not None
+        }
+
+    def _finish(self, method: str, started: float, response: TelegramResponse, attempts: int) -> TelegramResponse:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.metrics.record(method, elapsed_ms, response.ok, attempts - 1)
+        logger.debug(
+            f"Telegram {method}: status={response.status_code} "
+            f"attempts={attempts} {elapsed_ms:.1f}ms"
+        )
+        return response
+
+
+class TelegramClient(_BaseTelegramClient):
+    """Synchronous Bot API client over a pooled requests.Session."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def call(self, method: str, payload: dict | None = None, files: dict | None = None) -> TelegramResponse:
+        """
+        Call a Bot API method with retries on 429/5xx and connection errors.
+
+        files maps a parameter name to (filename, bytes) and switches the
+        request to multipart/form-data.
+        """
+        started = time.perf_counter()
+        attempt = 0
+        if files:
+            request_kwargs = {'data': self._form_fields(payload or {}), 'files': files}
+        else:
+            request_kwargs = {'json': payload or {}}
+
+        while True:
+            try:
+                http_response = self.session.post(
+                    f'{self.api_url}/{method}',
+                    timeout=(self.connect_timeout, self.timeout),
+                    **request_kwargs,
+                )
+                try:
+                    body = http_response.json()
+                except ValueError:
+                    body = {'description': http_response.text}
+                response = TelegramResponse.from_http(http_response.status_code, body)
+                delay = None if response.ok else self._retry_delay(attempt, response)
+            except requests.exceptions.RequestException as e:
+                response = TelegramResponse.from_exception(e)
+                delay = self._retry_delay(attempt, None) if is_connect_error(e) else None
+
+            attempt += 1
+            if delay is None:
+                return self._finish(method, started, response, attempt)
+
+            logger.warning(f"Telegram {method} failed ({response.status_code}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncTelegramClient(_BaseTelegramClient):
+    """Asynchronous Bot API client over a pooled httpx.AsyncClient."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+        )
+
+    async def call(self, method: str, payload: dict | None = None, files: dict | None = None) -> TelegramResponse:
+        """Call a Bot API method with retries on 429/5xx and connection errors."""
+        started = time.perf_counter()
+        attempt = 0
+        if files:
+            request_kwargs = {'data': self._form_fields(payload or {}), 'files': files}
+        else:
+            request_kwargs = {'json': payload or {}}
+
+        while True:
+            try:
+                http_response = await self.client.post(f'{self.api_url}/{method}', **request_kwargs)
+                try:
+                    body = http_response.json()
+                except ValueError:
+                    body = {'description': http_response.text}
+                response = TelegramResponse.from_http(http_response.status_code, body)
+                delay = None if response.ok else self._retry_delay(attempt, response)
+            except httpx.HTTPError as e:
+                response = TelegramResponse.from_exception(e)
+                delay = self._retry_delay(attempt, None) if is_connect_error(e) else None
+
+            attempt += 1
+            if delay is None:
+                return self._finish(method, started, response, attempt)
+
+            logger.warning(f"Telegram {method} failed ({response.status_code}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def get_bot_base_url() -> str:
+    """Base URL for python-telegram-bot (token is appended by the library)."""
+    return f"{settings.TELEGRAM_API_BASE_URL.rstrip('/')}/bot"
+
+
+# Singleton instances for convenience
+_client: TelegramClient | None = None
+_client_lock = threading.Lock()
+# httpx.AsyncClient is bound to the event loop it was first used in
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_telegram_client() -> TelegramClient:
+    """Get or create the process-wide sync client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TelegramClient()
+    return _client
+
+
+def get_async_telegram_client() -> AsyncTelegramClient:
+    """Get or create the async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncTelegramClient()
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_telegram_client() -> None:
+    """Close the running event loop's async client (ASGI shutdown hook)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,84 @@
+"""
+Webhook update deduplication.
+
+Telegram redelivers an update when the webhook answers slowly or with an
+error. Each update_id is claimed atomically in Redis (SET NX) before any
+handler runs, so a redelivery of an update that is being processed or was
+already processed is dropped with one round trip.
+
+Key states:
+    bot:update:{update_id} = 'processing'  (short TTL, freed on failure)
+    bot:update:{update_id} = 'done'        (kept for the redelivery window)
+"""
+import logging
+
+from django.conf import settings
+
+from apps.core.redis_clients import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+PROCESSING = 'processing'
+DONE = 'done'
+
+
+class UpdateDeduplicator:
+    """Claims update_ids so every Telegram update is processed once."""
+
+    def __init__(
+        self,
+        url: str | None = None,
+        ttl: int | None = None,
+        claim_ttl: int | None = None,
+        prefix: str = 'bot:update:',
+    ):
+        self.url = url or settings.REDIS_URL
+        self.ttl = ttl or settings.TELEGRAM_UPDATE_DEDUP_TTL
+        self.claim_ttl = claim_ttl or settings.TELEGRAM_UPDATE_CLAIM_TTL
+        self.prefix = prefix
+
+    def _client(self):
+        return get_async_redis(self.url)
+
+    def _key(self, update_id: int) -> str:
+        return f'{self.prefix}{update_id}'
+
+    async def aclaim(self, update_id: int) -> bool:
+        """
+        Claim an update for processing.
+
+        Returns False for a duplicate. If Redis is unavailable the update
+        is processed anyway: losing a message is worse than a rare double.
+        """
+        try:
+            claimed = await self._client().set(self._key(update_id), PROCESSING, nx=True, ex=self.claim_ttl)
+        except Exception as e:
+            logger.warning(f"Update dedup unavailable, processing {update_id}: {e}")
+            return True
+        return bool(claimed)
+
+    async def acomplete(self, update_id: int) -> None:
+        """Mark an update as processed for the whole redelivery window."""
+        try:
+            await self._client().set(self._key(update_id), DONE, ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to mark update {update_id} as done: {e}")
+
+    async def arelease(self, update_id: int) -> None:
+        """Free a claim after a failure so Telegram's retry is processed."""
+        try:
+            await self._client().delete(self._key(update_id))
+        except Exception as e:
+            logger.warning(f"Failed to release update {update_id}: {e}")
+
+
+# Singleton instance for convenience
+_deduplicator: UpdateDeduplicator | None = None
+
+
+def get_update_deduplicator() -> UpdateDeduplicator:
+    """Get or create the update deduplicator singleton."""
+    global _deduplicator
+    if _deduplicator is None:
+        _deduplicator = UpdateDeduplicator()
+    return _deduplicator
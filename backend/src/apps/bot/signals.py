@@ -0,0 +1,52 @@
+"""
+Bot signals.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.bot.models import BotAdmin
+from apps.bot.services.admins import invalidate_admin_cache
+from apps.bot.services.inline_search import invalidate_product_index
+from apps.bot.services.media import invalidate_image_files
+from apps.bot.services.order_status import enqueue_status_notification
+from apps.orders.models import Order
+from apps.products.models import Category, Product, ProductImage
+
+
+@receiver(post_save, sender=BotAdmin)
+@receiver(post_delete, sender=BotAdmin)
+def invalidate_bot_admins(sender, **kwargs):
+    """Drop cached admin sets when an admin is added, changed or removed."""
+    invalidate_admin_cache()
+    # Again after commit: a concurrent reader may have cached the old set meanwhile
+    transaction.on_commit(invalidate_admin_cache)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_inline_search_index(sender, **kwargs):
+    """Rebuild the inline search index after a catalog change is committed."""
+    transaction.on_commit(invalidate_product_index)
+
+
+@receiver(post_save, sender=ProductImage)
+def invalidate_replaced_image_files(sender, instance, created, **kwargs):
+    """Forget Telegram file_ids of a replaced image file."""
+    if not created:
+        invalidate_image_files(instance)
+
+
+@receiver(post_save, sender=Order)
+def notify_order_status_change(sender, instance, created, **kwargs):
+    """Schedule a (coalesced) customer notification when staff change the status."""
+    previous = getattr(instance, '_loaded_status', None)
+    if created or previous is None or previous == instance.status:
+        return
+
+    instance._loaded_status = instance.status
+    enqueue_status_notification(instance.pk, instance.user_id, instance.status)
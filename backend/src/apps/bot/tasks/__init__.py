@@ -1,5 +1,11 @@
 """Bot Celery tasks."""
-from apps.bot.tasks.broadcast import send_broadcast_task
+from apps.bot.tasks.broadcast import run_scheduled_broadcasts_task, send_broadcast_task
 from apps.bot.tasks.notifications import send_order_notification_task
+from apps.bot.tasks.outbox import dispatch_notification_outbox_task
 
-__all__ = ['send_broadcast_task', 'send_order_notification_task']
+__all__ = [
+    'run_scheduled_broadcasts_task',
+    'send_broadcast_task',
+    'send_order_notification_task',
+    'dispatch_notification_outbox_task',
+]
@@ -1,29 +1,52 @@
 """
 Celery tasks for broadcast sending.
+
+Broadcasts without a window or a rate cap are sent in one run of
+send_broadcast_task; a retried or redelivered run resumes the pending
+logs of a broadcast that is already sending. Paced ones (see
+apps.bot.services.broadcast_schedule) are sent by
+run_scheduled_broadcasts_task a quota per beat tick, which also starts
+broadcasts whose scheduled time has come.
+
+Logs are claimed a batch at a time in a short transaction (status
+SENDING), sent with no lock held, and each result is saved right after
+its send, so a failing or killed run never resends a delivered log.
+Recipient logs are created in committed batches too; a run that finds
+them incomplete (recipients_materialized unset) finishes them first.
 """
 import logging
 import time
+from datetime import timedelta
 
-import requests
 from celery import shared_task
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from apps.bot.models import (
     Broadcast,
+    BroadcastContentType,
     BroadcastLog,
     BroadcastLogStatus,
     BroadcastStatus,
-    BroadcastContentType,
 )
-from apps.users.models import User
-
+from apps.bot.services.broadcast_schedule import in_window, is_due, is_paced, tick_quota
+from apps.bot.services.recipients import find_users_by_usernames
+from apps.bot.services.segments import materialize_segment
+from apps.bot.services.telegram_api import TelegramClient, TelegramResponse, get_telegram_client
 
 logger = logging.getLogger(__name__)
 
 # Telegram rate limit: ~30 messages per second
 BATCH_SIZE = 25
 BATCH_DELAY = 1.0  # seconds
+# Logs left SENDING longer than this (their run died) are claimed again
+CLAIM_TIMEOUT = 5 * 60  # seconds
+
+# Held while a scheduler tick runs, so ticks never overlap
+SCHEDULER_LOCK_KEY = 'bot:broadcasts:scheduler'
 
 
 @shared_task(
@@ -34,9 +57,10 @@ BATCH_DELAY = 1.0  # seconds
 )
 def send_broadcast_task(self, broadcast_id: int) -> dict:
     """
-    Send broadcast to users by their usernames.
+    Send broadcast to a segment or to users by their usernames.
 
-    Uses synchronous requests to Telegram API.
+    Uses the shared pooled Telegram API client. Scheduled and paced
+    broadcasts are left to run_scheduled_broadcasts_task.
     """
     try:
         broadcast = Broadcast.objects.get(id=broadcast_id)
@@ -44,63 +68,21 @@ def send_broadcast_task(self, broadcast_id: int) -> dict:
         logger.error(f"Broadcast {broadcast_id} not found")
         return {'error': 'Broadcast not found'}
 
-    # Update status to sending
-    broadcast.status = BroadcastStatus.SENDING
-    broadcast.started_at = timezone.now()
-    broadcast.save(update_fields=['status', 'started_at'])
-
-    # Get users by usernames (search in both telegram_username and username fields)
-    from django.db.models import Q
-
-    usernames = broadcast.recipients_usernames or []
-    # Build OR query for each username
-    if usernames:
-        q = Q()
-        for uname in usernames:
-            q |= Q(telegram_username__iexact=uname) | Q(username__iexact=uname)
-        users = list(
-            User.objects.filter(q, telegram_id__isnull=False)
-            .values_list('id', 'telegram_id', 'username')
-        )
-    else:
-        users = []
-
-    total_recipients = len(users)
-    broadcast.total_recipients = total_recipients
-    broadcast.save(update_fields=['total_recipients'])
-
-    if total_recipients == 0:
-        broadcast.status = BroadcastStatus.COMPLETED
-        broadcast.completed_at = timezone.now()
-        broadcast.save(update_fields=['status', 'completed_at'])
-        return {'total': 0, 'sent': 0, 'failed': 0, 'blocked': 0}
-
-    # Create log entries for all recipients
-    logs_to_create = [
-        BroadcastLog(
-            broadcast=broadcast,
-            user_id=user_id,
-            telegram_id=telegram_id,
-            status=BroadcastLogStatus.PENDING,
-        )
-        for user_id, telegram_id, _ in users
-    ]
-    BroadcastLog.objects.bulk_create(logs_to_create, batch_size=1000)
-
-    # Send messages
-    stats = _send_broadcast_sync(broadcast)
-
-    # Update broadcast statistics
-    broadcast.sent_count = stats['sent']
-    broadcast.failed_count = stats['failed'] + stats['blocked']
-    broadcast.status = BroadcastStatus.COMPLETED
-    broadcast.completed_at = timezone.now()
-    broadcast.save(update_fields=[
-        'sent_count',
-        'failed_count',
-        'status',
-        'completed_at',
-    ])
+    if is_paced(broadcast) or not is_due(broadcast):
+        logger.info(f"Broadcast {broadcast_id} is scheduled, leaving it to the scheduler")
+        return {'scheduled': True}
+
+    if broadcast.status != BroadcastStatus.SENDING and not _start_broadcast(broadcast):
+        return {'error': 'Broadcast already started'}
+    # No-op unless the run that started it died while creating the logs
+    _create_recipient_logs(broadcast)
+
+    stats = _send_pending(broadcast, get_telegram_client())
+    _update_counts(broadcast)
+
+    if stats['retry_after']:
+        # Flood wait: the rest stays pending, the retry resumes it
+        raise self.retry(countdown=stats['retry_after'])
 
     logger.info(
         f"Broadcast {broadcast_id} completed: "
@@ -110,120 +92,309 @@ def send_broadcast_task(self, broadcast_id: int) -> dict:
     return stats
 
 
-def _send_broadcast_sync(broadcast: Broadcast) -> dict:
-    """Send broadcast messages synchronously."""
-    bot_token = settings.TELEGRAM_BOT_TOKEN
-    base_url = f"https://api.telegram.org/bot{bot_token}"
+@shared_task(
+    name='bot.run_scheduled_broadcasts',
+    ignore_result=True,
+)
+def run_scheduled_broadcasts_task() -> None:
+    """
+    Start due scheduled broadcasts and send one tick of paced ones.
 
-    stats = {'sent': 0, 'failed': 0, 'blocked': 0}
+    Runs every BROADCAST_SCHEDULER_TICK seconds from beat. A tick stops
+    sending before the next one is due; paced broadcasts share it in
+    start order.
+    """
+    tick = settings.BROADCAST_SCHEDULER_TICK
+    if not cache.add(SCHEDULER_LOCK_KEY, 1, timeout=tick * 2):
+        logger.info("Previous broadcast scheduler tick still running")
+        return
 
-    # Get pending logs
-    logs = BroadcastLog.objects.filter(
-        broadcast=broadcast,
-        status=BroadcastLogStatus.PENDING,
+    try:
+        _run_scheduler_tick(tick)
+    finally:
+        cache.delete(SCHEDULER_LOCK_KEY)
+
+
+def _run_scheduler_tick(tick: int) -> None:
+    now = timezone.now()
+    deadline = time.monotonic() + tick * 0.8
+    client = None
+
+    broadcasts = (
+        Broadcast.objects
+        .filter(
+            # Every sending broadcast, to resume one whose run gave up
+            Q(status=BroadcastStatus.SENDING)
+            | (
+                Q(status=BroadcastStatus.PENDING)
+                & (
+                    Q(scheduled_at__isnull=False)
+                    | Q(window_start__isnull=False, window_end__isnull=False)
+                    | Q(max_per_minute__isnull=False)
+                )
+            )
+        )
+        .filter(Q(scheduled_at__isnull=True) | Q(scheduled_at__lte=now))
+        .order_by('scheduled_at', 'id')
     )
 
-    count = 0
-    for log in logs.iterator():
-        result = _send_message(base_url, log.telegram_id, broadcast)
-
-        if result == 'success':
-            log.status = BroadcastLogStatus.SENT
-            log.sent_at = timezone.now()
-            stats['sent'] += 1
-        elif result == 'blocked':
-            log.status = BroadcastLogStatus.BLOCKED
-            log.error_message = 'User blocked the bot'
-            stats['blocked'] += 1
-        else:
-            log.status = BroadcastLogStatus.FAILED
-            log.error_message = result
-            stats['failed'] += 1
-
-        log.save(update_fields=['status', 'error_message', 'sent_at'])
-
-        count += 1
-        # Rate limiting
-        if count % BATCH_SIZE == 0:
-            time.sleep(BATCH_DELAY)
+    for broadcast in broadcasts:
+        if not is_paced(broadcast):
+            # Not paced: send everything in one run
+            if broadcast.status == BroadcastStatus.PENDING or _is_stalled(broadcast):
+                send_broadcast_task.delay(broadcast.id)
+            continue
 
-    return stats
+        if not in_window(broadcast, now) or time.monotonic() >= deadline:
+            continue
 
+        if broadcast.status == BroadcastStatus.PENDING and not _start_broadcast(broadcast):
+            continue
+        _create_recipient_logs(broadcast)
 
-def _send_message(base_url: str, chat_id: int, broadcast: Broadcast) -> str:
+        pending = (
+            BroadcastLog.objects
+            .filter(broadcast=broadcast, status__in=[BroadcastLogStatus.PENDING, BroadcastLogStatus.SENDING])
+            .count()
+        )
+        if pending:
+            client = client or get_telegram_client()
+            stats = _send_pending(
+                broadcast,
+                client,
+                limit=tick_quota(broadcast, pending, tick, now),
+                deadline=deadline,
+            )
+            logger.info(f"Broadcast {broadcast.id} tick: {stats}")
+        _update_counts(broadcast)
+
+
+def _start_broadcast(broadcast: Broadcast) -> bool:
     """
-    Send a single message to Telegram.
+    Move the broadcast to SENDING; the caller then creates its recipient logs.
 
-    Returns 'success', 'blocked', or error message.
+    Returns False if another run has already started it.
     """
-    content_type = broadcast.content_type
-    text = broadcast.text or None
-    file_id = broadcast.file_id or None
+    now = timezone.now()
+    claimed = (
+        Broadcast.objects
+        .filter(pk=broadcast.pk, status__in=[BroadcastStatus.DRAFT, BroadcastStatus.PENDING])
+        .update(status=BroadcastStatus.SENDING, started_at=now)
+    )
+    if not claimed:
+        logger.warning(f"Broadcast {broadcast.pk} already started")
+        return False
 
-    try:
-        if content_type == BroadcastContentType.TEXT:
-            response = requests.post(
-                f"{base_url}/sendMessage",
-                json={'chat_id': chat_id, 'text': text},
-                timeout=30,
-            )
+    broadcast.status = BroadcastStatus.SENDING
+    broadcast.started_at = now
+    return True
 
-        elif content_type == BroadcastContentType.PHOTO:
-            data = {'chat_id': chat_id, 'photo': file_id}
-            if text:
-                data['caption'] = text
-            response = requests.post(
-                f"{base_url}/sendPhoto",
-                json=data,
-                timeout=30,
-            )
 
-        elif content_type == BroadcastContentType.VIDEO:
-            data = {'chat_id': chat_id, 'video': file_id}
-            if text:
-                data['caption'] = text
-            response = requests.post(
-                f"{base_url}/sendVideo",
-                json=data,
-                timeout=30,
-            )
+def _is_stalled(broadcast: Broadcast) -> bool:
+    """
+    Work is left but no run has created or claimed a log for CLAIM_TIMEOUT.
 
-        elif content_type == BroadcastContentType.DOCUMENT:
-            data = {'chat_id': chat_id, 'document': file_id}
-            if text:
-                data['caption'] = text
-            response = requests.post(
-                f"{base_url}/sendDocument",
-                json=data,
-                timeout=30,
-            )
+    Work left is recipient logs still to create or to send. A broadcast
+    started less than CLAIM_TIMEOUT ago never counts: its first run may
+    still be queued.
+    """
+    recent = timezone.now() - timedelta(seconds=CLAIM_TIMEOUT)
+    if broadcast.started_at is None or broadcast.started_at >= recent:
+        return False
+
+    logs = BroadcastLog.objects.filter(broadcast=broadcast)
+    if logs.filter(Q(created_at__gte=recent) | Q(claimed_at__gte=recent)).exists():
+        return False
+    if not broadcast.recipients_materialized:
+        return True
+    return logs.filter(status__in=[BroadcastLogStatus.PENDING, BroadcastLogStatus.SENDING]).exists()
+
+
+def _update_counts(broadcast: Broadcast) -> None:
+    """Refresh statistics from the logs; complete the broadcast when none are pending."""
+    counts = dict(
+        BroadcastLog.objects
+        .filter(broadcast=broadcast)
+        .order_by()
+        .values_list('status')
+        .annotate(count=Count('id'))
+    )
+    broadcast.sent_count = counts.get(BroadcastLogStatus.SENT, 0)
+    broadcast.failed_count = counts.get(BroadcastLogStatus.FAILED, 0) + counts.get(BroadcastLogStatus.BLOCKED, 0)
+    broadcast.save(update_fields=['sent_count', 'failed_count'])
+
+    if not counts.get(BroadcastLogStatus.PENDING) and not counts.get(BroadcastLogStatus.SENDING):
+        # Conditional, so a broadcast cancelled meanwhile stays cancelled,
+        # and one with recipients still to create isn't completed
+        Broadcast.objects.filter(
+            pk=broadcast.pk,
+            status=BroadcastStatus.SENDING,
+            recipients_materialized=True,
+        ).update(
+            status=BroadcastStatus.COMPLETED,
+            completed_at=timezone.now(),
+        )
 
-        elif content_type == BroadcastContentType.VOICE:
-            response = requests.post(
-                f"{base_url}/sendVoice",
-                json={'chat_id': chat_id, 'voice': file_id},
-                timeout=30,
+
+def _create_recipient_logs(broadcast: Broadcast) -> None:
+    """
+    Create pending log entries for all recipients, unless already done.
+
+    Segments are materialized inside the database (INSERT ... SELECT) in
+    batches, resuming after an interrupted run; explicit username lists
+    are resolved with indexed IN (...) queries and saved in one
+    transaction. Sets total_recipients and recipients_materialized.
+    """
+    if broadcast.recipients_materialized:
+        return
+
+    if broadcast.segment_id:
+        materialize_segment(broadcast, broadcast.segment)
+        return
+
+    users, _ = find_users_by_usernames(broadcast.recipients_usernames or [])
+    with transaction.atomic():
+        # Locked, so a concurrent run can't create the logs twice
+        broadcasts = Broadcast.objects.select_for_update().filter(pk=broadcast.pk, recipients_materialized=False)
+        if broadcasts.exists():
+            BroadcastLog.objects.bulk_create(
+                [
+                    BroadcastLog(
+                        broadcast=broadcast,
+                        user_id=user['id'],
+                        telegram_id=user['telegram_id'],
+                        status=BroadcastLogStatus.PENDING,
+                    )
+                    for user in users
+                ],
+                batch_size=1000,
             )
+            broadcasts.update(total_recipients=len(users), recipients_materialized=True)
+    broadcast.refresh_from_db(fields=['total_recipients', 'recipients_materialized'])
+
+
+def _claim_logs(broadcast: Broadcast, batch_size: int) -> list[BroadcastLog]:
+    """Mark a batch of pending logs (or ones stuck in a dead run) as SENDING."""
+    now = timezone.now()
+    with transaction.atomic():
+        logs = list(
+            BroadcastLog.objects
+            .select_for_update(skip_locked=True)
+            .filter(broadcast=broadcast)
+            .filter(
+                Q(status=BroadcastLogStatus.PENDING)
+                | Q(status=BroadcastLogStatus.SENDING, claimed_at__lt=now - timedelta(seconds=CLAIM_TIMEOUT))
+            )
+            .only('id', 'telegram_id')
+            .order_by('id')[:batch_size]
+        )
+        if logs:
+            BroadcastLog.objects.filter(pk__in=[log.pk for log in logs]).update(
+                status=BroadcastLogStatus.SENDING,
+                claimed_at=now,
+            )
+    return logs
+
 
-        else:
-            return f"Unknown content type: {content_type}"
+def _save_result(log: BroadcastLog, **fields) -> None:
+    BroadcastLog.objects.filter(pk=log.pk, status=BroadcastLogStatus.SENDING).update(**fields)
 
-        # Check response
-        if response.status_code == 200:
-            return 'success'
 
-        result = response.json()
-        error_code = result.get('error_code')
-        description = result.get('description', 'Unknown error')
+def _release_logs(logs: list[BroadcastLog]) -> None:
+    """Return claimed but unsent logs to PENDING (claimed_at stays, see _is_stalled)."""
+    BroadcastLog.objects.filter(
+        pk__in=[log.pk for log in logs],
+        status=BroadcastLogStatus.SENDING,
+    ).update(status=BroadcastLogStatus.PENDING)
+
+
+def _send_pending(
+    broadcast: Broadcast,
+    client: TelegramClient,
+    limit: int | None = None,
+    deadline: float | None = None,
+) -> dict:
+    """
+    Send pending logs, at most limit of them and until deadline (monotonic).
+
+    Stops early on a flood wait Telegram asks to wait out longer than the
+    client does; stats['retry_after'] then holds the seconds to wait.
+    """
+    stats = {'sent': 0, 'failed': 0, 'blocked': 0, 'retry_after': 0}
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        # Cancelled from the admin in the meantime
+        if Broadcast.objects.filter(pk=broadcast.pk, status=BroadcastStatus.CANCELLED).exists():
+            break
+
+        batch_size = BATCH_SIZE if remaining is None else min(BATCH_SIZE, remaining)
+        logs = _claim_logs(broadcast, batch_size)
+
+        for i, log in enumerate(logs):
+            try:
+                response = _send(client, log.telegram_id, broadcast)
+            except Exception:
+                _release_logs(logs[i:])
+                raise
+
+            if response.ok:
+                _save_result(log, status=BroadcastLogStatus.SENT, sent_at=timezone.now())
+                stats['sent'] += 1
+            elif response.is_blocked:
+                _save_result(log, status=BroadcastLogStatus.BLOCKED, error_message='User blocked the bot')
+                stats['blocked'] += 1
+            elif response.retry_after:
+                _release_logs(logs[i:])
+                stats['retry_after'] = response.retry_after
+                return stats
+            else:
+                _save_result(
+                    log,
+                    status=BroadcastLogStatus.FAILED,
+                    error_message=response.description or 'Unknown error',
+                )
+                stats['failed'] += 1
+
+        if remaining is not None:
+            remaining -= len(logs)
+        if len(logs) < batch_size or remaining == 0:
+            break
+        # Rate limiting
+        time.sleep(BATCH_DELAY)
+
+    return stats
+
+
+def _send(client: TelegramClient, chat_id: int, broadcast: Broadcast) -> TelegramResponse:
+    """Send the broadcast content to one chat."""
+    content_type = broadcast.content_type
+    text = broadcast.text or None
+    file_id = broadcast.file_id or None
+
+    if content_type == BroadcastContentType.TEXT:
+        method, data = 'sendMessage', {'chat_id': chat_id, 'text': text}
+
+    elif content_type == BroadcastContentType.PHOTO:
+        method, data = 'sendPhoto', {'chat_id': chat_id, 'photo': file_id}
+
+    elif content_type == BroadcastContentType.VIDEO:
+        method, data = 'sendVideo', {'chat_id': chat_id, 'video': file_id}
+
+    elif content_type == BroadcastContentType.DOCUMENT:
+        method, data = 'sendDocument', {'chat_id': chat_id, 'document': file_id}
+
+    elif content_type == BroadcastContentType.VOICE:
+        method, data = 'sendVoice', {'chat_id': chat_id, 'voice': file_id}
+
+    else:
+        return TelegramResponse(ok=False, status_code=0, description=f"Unknown content type: {content_type}")
 
-        # User blocked the bot or chat not found
-        if error_code in (403, 400):
-            if 'blocked' in description.lower() or 'chat not found' in description.lower():
-                return 'blocked'
+    if text and content_type not in (BroadcastContentType.TEXT, BroadcastContentType.VOICE):
+        data['caption'] = text
 
-        return description
+    # Retries on 429/5xx are handled by the client
+    return client.call(method, data)
 
-    except requests.exceptions.Timeout:
-        return 'Request timeout'
-    except requests.exceptions.RequestException as e:
-        return str(e)
@@ -0,0 +1,19 @@
+"""
+Celery tasks for the notification outbox.
+"""
+from celery import shared_task
+
+from apps.bot.services.outbox import dispatch_outbox
+
+
+@shared_task(
+    name='bot.dispatch_notification_outbox',
+    ignore_result=True,
+)
+def dispatch_notification_outbox_task() -> dict:
+    """
+    Deliver pending outbox notifications.
+
+    Triggered after each enqueue commit and periodically by beat.
+    """
+    return dispatch_outbox()
@@ -0,0 +1,46 @@
+"""Bot test fixtures: the fake Bot API served over HTTP."""
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from apps.bot.fake_api import FakeBotAPI, FakeBotAPIConfig
+from apps.bot.services.telegram_api import TelegramClient
+
+
+@pytest.fixture(scope='session')
+def fake_bot_api_server():
+    """FakeBotAPI on a free local port for the whole session; yields (app, base url)."""
+    app = FakeBotAPI()
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    server = uvicorn.Server(uvicorn.Config(app, lifespan='off', log_level='warning'))
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    yield app, f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def fake_bot_api(fake_bot_api_server) -> FakeBotAPI:
+    """The fake server with default behaviour and zeroed counters; tweak .config in the test."""
+    app, _ = fake_bot_api_server
+    app.config = FakeBotAPIConfig()
+    app.reset()
+    return app
+
+
+@pytest.fixture
+def telegram_client(fake_bot_api_server):
+    """Client of the fake server; no retries, so 429s and errors reach the caller."""
+    _, base_url = fake_bot_api_server
+    client = TelegramClient(token='0:test', base_url=base_url, max_retries=0)
+    yield client
+    client.close()
@@ -0,0 +1,66 @@
+"""Tests for parsing broadcast schedules entered in the bot."""
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from apps.bot.services.broadcast_schedule import BroadcastSchedule, parse_schedule
+
+MSK = ZoneInfo('Europe/Moscow')
+NOW = datetime(2025, 6, 10, 12, 0, tzinfo=MSK)
+
+
+def parse(text: str) -> BroadcastSchedule | None:
+    return parse_schedule(text, now=NOW)
+
+
+def test_full_schedule():
+    schedule = parse('25.12 09:00 10:00-20:00 300/мин')
+    assert schedule == BroadcastSchedule(
+        scheduled_at=datetime(2025, 12, 25, 9, 0, tzinfo=MSK),
+        window_start=time(10, 0),
+        window_end=time(20, 0),
+        max_per_minute=300,
+    )
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('25.12 09:00', BroadcastSchedule(scheduled_at=datetime(2025, 12, 25, 9, 0, tzinfo=MSK))),
+    ('10:00-20:00', BroadcastSchedule(window_start=time(10, 0), window_end=time(20, 0))),
+    ('22:00 – 08:00', BroadcastSchedule(window_start=time(22, 0), window_end=time(8, 0))),
+    ('120 / мин', BroadcastSchedule(max_per_minute=120)),
+    ('300/МИН, 10:00-20:00', BroadcastSchedule(window_start=time(10, 0), window_end=time(20, 0), max_per_minute=300)),
+])
+def test_single_parts(text, expected):
+    assert parse(text) == expected
+
+
+def test_window_before_start_time():
+    schedule = parse('10:00-20:00 25.12 09:00')
+    assert schedule.scheduled_at == datetime(2025, 12, 25, 9, 0, tzinfo=MSK)
+    assert (schedule.window_start, schedule.window_end) == (time(10, 0), time(20, 0))
+
+
+def test_date_without_year_is_the_next_one():
+    assert parse('01.03 10:00').scheduled_at == datetime(2026, 3, 1, 10, 0, tzinfo=MSK)
+
+
+def test_date_with_year():
+    assert parse('01.03.2027 10:00').scheduled_at == datetime(2027, 3, 1, 10, 0, tzinfo=MSK)
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'завтра',
+    # A date without a start time must not be dropped silently
+    '25.12 10:00-20:00',
+    '25.12',
+    '25.12 09:00 10:00-20:00 300/мин срочно',
+    '10:00',
+    '31.02 10:00',
+    '25.12 25:00',
+    '10:00-10:00',
+    '0/мин',
+])
+def test_rejects_invalid_input(text):
+    assert parse(text) is None
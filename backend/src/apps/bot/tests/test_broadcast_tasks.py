@@ -0,0 +1,190 @@
+"""Tests for the broadcast sending tasks."""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from apps.bot.models import Broadcast, BroadcastLog, BroadcastLogStatus, BroadcastSegment, BroadcastStatus
+from apps.bot.services.segments import materialize_segment
+from apps.bot.tasks.broadcast import (
+    CLAIM_TIMEOUT,
+    _create_recipient_logs,
+    _is_stalled,
+    _send_pending,
+    _update_counts,
+)
+from apps.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def users():
+    return [
+        User.objects.create(username=f'user{telegram_id}', telegram_id=telegram_id)
+        for telegram_id in (101, 102, 103)
+    ]
+
+
+def make_broadcast(users, started_ago: int, materialized: bool = True, **log_fields) -> Broadcast:
+    started_at = timezone.now() - timedelta(seconds=started_ago)
+    broadcast = Broadcast.objects.create(
+        text='Привет',
+        status=BroadcastStatus.SENDING,
+        started_at=started_at,
+        total_recipients=len(users),
+        recipients_materialized=materialized,
+    )
+    BroadcastLog.objects.bulk_create(
+        BroadcastLog(broadcast=broadcast, user=user, telegram_id=user.telegram_id, **log_fields)
+        for user in users
+    )
+    # Logs are created when the broadcast starts
+    BroadcastLog.objects.filter(broadcast=broadcast).update(created_at=started_at)
+    return broadcast
+
+
+def test_just_started_broadcast_is_not_stalled(users):
+    # Logs are not claimed yet: the first run is still in the queue
+    broadcast = make_broadcast(users, started_ago=10)
+    assert not _is_stalled(broadcast)
+
+
+def test_broadcast_without_claims_is_stalled(users):
+    broadcast = make_broadcast(users, started_ago=CLAIM_TIMEOUT + 60)
+    assert _is_stalled(broadcast)
+
+
+def test_recently_claimed_broadcast_is_not_stalled(users):
+    broadcast = make_broadcast(
+        users,
+        started_ago=CLAIM_TIMEOUT + 60,
+        status=BroadcastLogStatus.SENDING,
+        claimed_at=timezone.now() - timedelta(seconds=5),
+    )
+    assert not _is_stalled(broadcast)
+
+
+def test_run_died_mid_batch_is_stalled(users):
+    broadcast = make_broadcast(
+        users,
+        started_ago=CLAIM_TIMEOUT * 3,
+        status=BroadcastLogStatus.SENDING,
+        claimed_at=timezone.now() - timedelta(seconds=CLAIM_TIMEOUT * 2),
+    )
+    assert _is_stalled(broadcast)
+
+
+def test_sent_broadcast_is_not_stalled(users):
+    broadcast = make_broadcast(users, started_ago=CLAIM_TIMEOUT * 3, status=BroadcastLogStatus.SENT)
+    assert not _is_stalled(broadcast)
+
+
+def test_unfinished_materialization_is_stalled(users):
+    broadcast = make_broadcast(
+        users[:1],
+        started_ago=CLAIM_TIMEOUT + 60,
+        materialized=False,
+        status=BroadcastLogStatus.SENT,
+    )
+    assert _is_stalled(broadcast)
+
+
+def test_materialization_in_progress_is_not_stalled(users):
+    broadcast = make_broadcast(users[:1], started_ago=CLAIM_TIMEOUT + 60, materialized=False)
+    BroadcastLog.objects.create(broadcast=broadcast, user=users[1], telegram_id=users[1].telegram_id)
+    assert not _is_stalled(broadcast)
+
+
+def test_unmaterialized_broadcast_is_not_completed(users):
+    broadcast = make_broadcast(users[:1], started_ago=60, materialized=False, status=BroadcastLogStatus.SENT)
+    _update_counts(broadcast)
+    broadcast.refresh_from_db()
+    assert broadcast.status == BroadcastStatus.SENDING
+    assert broadcast.sent_count == 1
+
+
+def test_username_recipients_are_created_once(users):
+    broadcast = Broadcast.objects.create(
+        text='Привет',
+        status=BroadcastStatus.SENDING,
+        recipients_usernames=[user.username for user in users],
+    )
+    _create_recipient_logs(broadcast)
+    _create_recipient_logs(Broadcast.objects.get(pk=broadcast.pk))
+
+    assert (broadcast.total_recipients, broadcast.recipients_materialized) == (3, True)
+    assert BroadcastLog.objects.filter(broadcast=broadcast).count() == 3
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='INSERT ... SELECT with RETURNING in a CTE')
+def test_materialize_segment_resumes_after_killed_run(users):
+    segment = BroadcastSegment.objects.create(name='Все', slug='all')
+    broadcast = make_broadcast(users[:1], started_ago=CLAIM_TIMEOUT + 60, materialized=False)
+
+    assert materialize_segment(broadcast, segment, batch_size=1) == 2
+    assert (broadcast.total_recipients, broadcast.recipients_materialized) == (3, True)
+    assert sorted(BroadcastLog.objects.filter(broadcast=broadcast).values_list('user_id', flat=True)) == sorted(
+        user.pk for user in users
+    )
+    # A finished audience is left alone
+    assert materialize_segment(broadcast, segment) == 0
+
+
+def log_statuses(broadcast: Broadcast) -> dict[int, str]:
+    return dict(BroadcastLog.objects.filter(broadcast=broadcast).values_list('telegram_id', 'status'))
+
+
+def test_send_pending_delivers_and_marks_blocked(users, fake_bot_api, telegram_client):
+    fake_bot_api.config.blocked_chat_ids = {102}
+    broadcast = make_broadcast(users, started_ago=10)
+
+    stats = _send_pending(broadcast, telegram_client)
+
+    assert stats == {'sent': 2, 'failed': 0, 'blocked': 1, 'retry_after': 0}
+    assert log_statuses(broadcast) == {
+        101: BroadcastLogStatus.SENT,
+        102: BroadcastLogStatus.BLOCKED,
+        103: BroadcastLogStatus.SENT,
+    }
+    assert fake_bot_api.delivered == 2
+
+
+def test_send_pending_stops_on_flood_wait(users, fake_bot_api, telegram_client):
+    fake_bot_api.config.flood_rate = 1.0
+    fake_bot_api.config.retry_after = 30
+    broadcast = make_broadcast(users, started_ago=10)
+
+    stats = _send_pending(broadcast, telegram_client)
+
+    # Stopped at the first 429, the whole batch went back to PENDING
+    assert stats == {'sent': 0, 'failed': 0, 'blocked': 0, 'retry_after': 30}
+    assert fake_bot_api.calls['sendMessage'] == 1
+    assert set(log_statuses(broadcast).values()) == {BroadcastLogStatus.PENDING}
+
+    fake_bot_api.config.flood_rate = 0.0
+    assert _send_pending(broadcast, telegram_client)['sent'] == 3
+
+
+def test_send_pending_skips_logs_claimed_by_a_live_run(users, fake_bot_api, telegram_client):
+    broadcast = make_broadcast(users, started_ago=CLAIM_TIMEOUT * 3)
+    now = timezone.now()
+    BroadcastLog.objects.filter(broadcast=broadcast, telegram_id=101).update(
+        status=BroadcastLogStatus.SENDING,
+        claimed_at=now - timedelta(seconds=5),
+    )
+    # Claimed by a run that died
+    BroadcastLog.objects.filter(broadcast=broadcast, telegram_id=102).update(
+        status=BroadcastLogStatus.SENDING,
+        claimed_at=now - timedelta(seconds=CLAIM_TIMEOUT * 2),
+    )
+
+    stats = _send_pending(broadcast, telegram_client)
+
+    assert stats['sent'] == 2
+    assert log_statuses(broadcast) == {
+        101: BroadcastLogStatus.SENDING,
+        102: BroadcastLogStatus.SENT,
+        103: BroadcastLogStatus.SENT,
+    }
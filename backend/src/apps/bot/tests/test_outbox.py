@@ -0,0 +1,115 @@
+"""Tests for the notification outbox dispatcher."""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.bot.models import NotificationKind, NotificationOutbox, OutboxStatus
+from apps.bot.services.outbox import RETRY_BASE_DELAY, _claim, dispatch_outbox
+from apps.bot.services.telegram_api import TelegramClient
+
+pytestmark = pytest.mark.django_db
+
+
+def make_row(telegram_id: int, **fields) -> NotificationOutbox:
+    return NotificationOutbox.objects.create(
+        kind=NotificationKind.ORDER_STATUS,
+        telegram_id=telegram_id,
+        payload={'text': 'Заказ передан в доставку'},
+        **fields,
+    )
+
+
+def test_dispatch_delivers_due_rows(fake_bot_api, telegram_client):
+    rows = [make_row(101), make_row(102)]
+    later = make_row(103, available_at=timezone.now() + timedelta(minutes=5))
+
+    assert dispatch_outbox(client=telegram_client) == {'sent': 2, 'failed': 0, 'retrying': 0}
+
+    for row in rows:
+        row.refresh_from_db()
+        assert (row.status, row.attempts) == (OutboxStatus.SENT, 1)
+        assert row.sent_at is not None
+    later.refresh_from_db()
+    assert later.status == OutboxStatus.PENDING
+    assert fake_bot_api.delivered == 2
+
+
+def test_blocked_user_fails_permanently(fake_bot_api, telegram_client):
+    fake_bot_api.config.blocked_chat_ids = {101}
+    row = make_row(101)
+
+    assert dispatch_outbox(client=telegram_client) == {'sent': 0, 'failed': 1, 'retrying': 0}
+
+    row.refresh_from_db()
+    assert row.status == OutboxStatus.FAILED
+    assert 'blocked' in row.last_error
+
+
+def test_flood_wait_is_retried_after_retry_after(fake_bot_api, telegram_client):
+    fake_bot_api.config.flood_rate = 1.0
+    fake_bot_api.config.retry_after = 90
+    row = make_row(101)
+
+    started = timezone.now()
+    assert dispatch_outbox(client=telegram_client) == {'sent': 0, 'failed': 0, 'retrying': 1}
+
+    row.refresh_from_db()
+    assert (row.status, row.attempts) == (OutboxStatus.PENDING, 1)
+    assert started + timedelta(seconds=90) <= row.available_at <= timezone.now() + timedelta(seconds=90)
+
+
+def test_leased_row_is_not_claimed_again():
+    row = make_row(101)
+
+    rows, _ = _claim(batch_size=10)
+    assert [claimed.pk for claimed in rows] == [row.pk]
+    # A second dispatcher finds nothing while the lease lasts
+    assert _claim(batch_size=10)[0] == []
+    row.refresh_from_db()
+    assert row.status == OutboxStatus.SENDING
+    assert row.available_at > timezone.now()
+
+
+def test_leased_row_is_not_sent_by_another_dispatcher(fake_bot_api, telegram_client):
+    make_row(101)
+    _claim(batch_size=10)
+
+    assert dispatch_outbox(client=telegram_client) == {'sent': 0, 'failed': 0, 'retrying': 0}
+    assert fake_bot_api.calls['sendMessage'] == 0
+
+
+def test_expired_lease_is_claimed_again(fake_bot_api, telegram_client):
+    # Leased by a dispatcher that died mid-batch
+    row = make_row(101, status=OutboxStatus.SENDING, available_at=timezone.now() - timedelta(seconds=1))
+
+    assert dispatch_outbox(client=telegram_client)['sent'] == 1
+    row.refresh_from_db()
+    assert row.status == OutboxStatus.SENT
+
+
+def test_failed_send_is_retried_with_backoff():
+    row = make_row(101)
+    # Nothing listens there: the request fails before reaching Telegram
+    client = TelegramClient(token='0:test', base_url='http://127.0.0.1:1', max_retries=0)
+
+    started = timezone.now()
+    assert dispatch_outbox(client=client) == {'sent': 0, 'failed': 0, 'retrying': 1}
+
+    row.refresh_from_db()
+    assert (row.status, row.attempts) == (OutboxStatus.PENDING, 1)
+    assert row.last_error
+    delay = timedelta(seconds=RETRY_BASE_DELAY)
+    assert started + delay <= row.available_at <= timezone.now() + delay
+
+
+def test_rows_left_when_the_lease_runs_out_are_released(settings, fake_bot_api, telegram_client):
+    settings.NOTIFICATION_OUTBOX_LEASE = 0
+    rows = [make_row(101), make_row(102)]
+
+    assert dispatch_outbox(client=telegram_client) == {'sent': 0, 'failed': 0, 'retrying': 0}
+
+    assert fake_bot_api.calls['sendMessage'] == 0
+    for row in rows:
+        row.refresh_from_db()
+        assert (row.status, row.attempts) == (OutboxStatus.PENDING, 0)
@@ -1,20 +1,29 @@
 """
 Telegram bot webhook views.
 """
+import asyncio
 import json
 import logging
+import weakref
+from contextlib import asynccontextmanager
 
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
 from telegram import Update, Bot
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.ext import Application, CommandHandler, InlineQueryHandler, MessageHandler, filters
 
 from apps.bot.handlers.start import start_command
 from apps.bot.handlers.broadcast import handle_broadcast_command, handle_message
+from apps.bot.handlers.inline import handle_inline_query
+from apps.bot.services.ratelimit import get_update_rate_limiter
+from apps.bot.services.telegram_api import close_async_telegram_client, get_bot_base_url
+from apps.bot.services.updates import get_update_deduplicator
+from apps.core.redis_clients import close_async_redis
 
 
 logger = logging.getLogger(__name__)
@@ -29,6 +38,7 @@ def build_application() -> Application:
     application = (
         Application.builder()
         .token(token)
+        .base_url(get_bot_base_url())
         .updater(None)
         .build()
     )
@@ -36,6 +46,7 @@ def build_application() -> Application:
     # Add handlers
     application.add_handler(CommandHandler('start', start_command))
     application.add_handler(CommandHandler('broadcast', handle_broadcast_command))
+    application.add_handler(InlineQueryHandler(handle_inline_query))
     # Message handler for conversation flow (must be last)
     application.add_handler(MessageHandler(
         filters.TEXT | filters.PHOTO | filters.VIDEO | filters.Document.ALL | filters.VOICE,
@@ -45,35 +56,123 @@ def build_application() -> Application:
     return application
 
 
+# Initialized applications, one per event loop (see get_application)
+_applications: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+async def get_application() -> Application:
+    """
+    Get the initialized application for the running event loop.
+
+    Under ASGI a worker has a single long-lived loop, so handlers are
+    registered and the bot is initialized (getMe) once, not per update.
+    """
+    loop = asyncio.get_running_loop()
+    application = _applications.get(loop)
+    if application is None:
+        application = build_application()
+        await application.initialize()
+        _applications[loop] = application
+    return application
+
+
+async def warm_application() -> None:
+    """
+    ASGI startup hook: initialize the application for this worker's loop.
+
+    Moves getMe off the first webhook request. A failure is only logged,
+    the first update retries it.
+    """
+    if not settings.TELEGRAM_BOT_TOKEN:
+        return
+    try:
+        await get_application()
+    except Exception as e:
+        logger.warning(f"Failed to initialize bot application on startup: {e}")
+
+
+async def shutdown_application() -> None:
+    """ASGI shutdown hook: close the loop's application and its HTTP connections."""
+    application = _applications.pop(asyncio.get_running_loop(), None)
+    if application is not None:
+        await application.shutdown()
+
+
+@asynccontextmanager
+async def request_loop(request: HttpRequest):
+    """
+    Close the per-loop clients a request opened, unless it runs under ASGI.
+
+    WSGI (runserver included) runs every async view in a fresh event loop
+    that ends with the request, so the application, Redis and Bot API
+    clients cached for it are shut down here instead of being left to the
+    garbage collector with their connections open.
+    """
+    try:
+        yield
+    finally:
+        if not isinstance(request, ASGIRequest):
+            await shutdown_application()
+            await close_async_redis()
+            await close_async_telegram_client()
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class WebhookView(View):
     """Handle Telegram webhook updates."""
 
     async def post(self, request: HttpRequest) -> HttpResponse:
         """Process incoming webhook update."""
+        async with request_loop(request):
+            return await self._process(request)
+
+    async def _process(self, request: HttpRequest) -> HttpResponse:
         try:
             data = json.loads(request.body)
-            logger.debug(f"Received update: {data}")
-
-            application = build_application()
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in webhook request")
+            return HttpResponse('invalid json', status=400)
 
-            async with application:
-                update = Update.de_json(data, application.bot)
-                await application.process_update(update)
+        logger.debug(f"Received update: {data}")
 
+        # Drop redeliveries before any handler runs
+        deduplicator = get_update_deduplicator()
+        update_id = data.get('update_id') if isinstance(data, dict) else None
+        if update_id is not None and not await deduplicator.aclaim(update_id):
+            logger.info(f"Duplicate update {update_id} skipped")
             return HttpResponse('ok')
 
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON in webhook request")
-            return HttpResponse('invalid json', status=400)
+        # Flood protection: answer 200 so Telegram doesn't redeliver the dropped update
+        if settings.TELEGRAM_RATE_LIMIT_ENABLED and isinstance(data, dict):
+            if not await get_update_rate_limiter().aallow(data):
+                if update_id is not None:
+                    await deduplicator.acomplete(update_id)
+                return HttpResponse('ok')
+
+        try:
+            application = await get_application()
+            await application.process_update(Update.de_json(data, application.bot))
 
         except Exception as e:
             logger.exception(f"Error processing webhook: {e}")
+            if update_id is not None:
+                # Let Telegram's retry be processed
+                await deduplicator.arelease(update_id)
             return HttpResponse('error', status=500)
 
+        if update_id is not None:
+            await deduplicator.acomplete(update_id)
+
+        return HttpResponse('ok')
+
     async def get(self, request: HttpRequest) -> JsonResponse:
         """Health check endpoint."""
-        return JsonResponse({'status': 'ok', 'webhook': 'active'})
+        async with request_loop(request):
+            return JsonResponse({
+                'status': 'ok',
+                'webhook': 'active',
+                'rate_limited': await get_update_rate_limiter().adrop_counts(),
+            })
 
 
 async def set_webhook(webhook_url: str) -> bool:
@@ -82,13 +181,13 @@ async def set_webhook(webhook_url: str) -> bool:
     if not token:
         raise ValueError("TELEGRAM_BOT_TOKEN not configured")
 
-    bot = Bot(token=token)
+    bot = Bot(token=token, base_url=get_bot_base_url())
 
     async with bot:
         await bot.delete_webhook(drop_pending_updates=True)
         result = await bot.set_webhook(
             url=webhook_url,
-            allowed_updates=['message', 'callback_query'],
+            allowed_updates=['message', 'callback_query', 'inline_query'],
         )
 
         if result:
@@ -105,7 +204,7 @@ async def delete_webhook() -> bool:
     if not token:
         raise ValueError("TELEGRAM_BOT_TOKEN not configured")
 
-    bot = Bot(token=token)
+    bot = Bot(token=token, base_url=get_bot_base_url())
 
     async with bot:
         result = await bot.delete_webhook(drop_pending_updates=True)
@@ -119,7 +218,7 @@ async def get_webhook_info() -> dict:
     if not token:
         raise ValueError("TELEGRAM_BOT_TOKEN not configured")
 
-    bot = Bot(token=token)
+    bot = Bot(token=token, base_url=get_bot_base_url())
 
     async with bot:
         info = await bot.get_webhook_info()
@@ -0,0 +1,124 @@
+"""
+Async Django REST Framework views.
+
+DRF dispatches synchronously, so under ASGI every APIView is run in a
+worker thread and holds it for the whole request. These bases dispatch on
+the event loop instead: authentication, permission and throttle checks
+(sync code that may hit the database or Redis) run in one sync_to_async
+call, then the async handler awaits the async ORM. Parsing, exceptions,
+rendering and OpenAPI generation are plain DRF.
+
+Handlers must not touch the ORM synchronously: load everything the
+serializer reads with select_related / prefetch_related.
+
+Usage:
+    class PageView(AsyncAPIView):
+        async def get(self, request, slug): ...
+
+    class ProductViewSet(AsyncReadOnlyModelViewSet):
+        queryset / get_queryset, serializer_class, filters as usual
+"""
+import asyncio
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from rest_framework import mixins, views, viewsets
+from rest_framework.response import Response
+
+
+class AsyncDispatchMixin:
+    """APIView.dispatch for async handlers."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            # OPTIONS and 405 stay sync DRF handlers
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncDispatchMixin, views.APIView):
+    """APIView with async get/post/... handlers."""
+
+
+class AsyncGenericViewSet(AsyncDispatchMixin, viewsets.GenericViewSet):
+    """GenericViewSet with async actions and async object/page loading."""
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        # ViewSetMixin builds a plain function view; mark it so Django awaits it
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
+
+    async def aget_object(self):
+        """Async version of get_object()."""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError) as e:
+            raise Http404 from e
+
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        """
+        Async version of paginate_queryset().
+
+        DRF paginators are sync; the COUNT and the page query (with its
+        prefetches) run together in one thread hop.
+        """
+        if self.paginator is None:
+            return None
+        return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+
+
+class AsyncListModelMixin(mixins.ListModelMixin):
+    """List a queryset with the async ORM."""
+
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+
+class AsyncRetrieveModelMixin(mixins.RetrieveModelMixin):
+    """Retrieve an instance with the async ORM."""
+
+    async def retrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+class AsyncReadOnlyModelViewSet(AsyncRetrieveModelMixin, AsyncListModelMixin, AsyncGenericViewSet):
+    """Async ReadOnlyModelViewSet: list and retrieve."""
@@ -2,7 +2,7 @@
 Telegram WebApp authentication for Django REST Framework.
 
 Provides two authentication methods:
-1. JWT Authentication (primary) - via JWTAuthentication from simplejwt
+1. JWT Authentication (primary) - via CachedJWTAuthentication (simplejwt, cached user lookup)
 2. Direct initData Authentication (fallback) - via TelegramAuthentication
 
 Usage in headers:
@@ -13,10 +13,18 @@ import logging
 from typing import Optional, Tuple
 
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
 from rest_framework import authentication, exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 
 from apps.users.services import (
     TelegramAuthError,
+    get_cached_user,
+    get_init_data_cache,
     validate_init_data,
 )
 
@@ -24,6 +32,42 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt authentication with the user loaded through the user cache.
+
+    Same checks as JWTAuthentication.get_user (active user, revoked
+    token), but a repeat request skips the user SELECT. The revoke check
+    compares against the cached password hash, which User save signals
+    drop together with the rest of the cached user.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = get_cached_user(user_id)
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+class CachedJWTAuthenticationScheme(SimpleJWTScheme):
+    """OpenAPI security scheme (jwtAuth) for CachedJWTAuthentication."""
+    target_class = 'apps.core.authentication.CachedJWTAuthentication'
+
+
 class TelegramAuthentication(authentication.BaseAuthentication):
     """
     Telegram WebApp initData authentication.
@@ -55,6 +99,21 @@ class TelegramAuthentication(authentication.BaseAuthentication):
         if not init_data:
             return None
 
+        # Same initData as an earlier request of this session
+        init_data_cache = get_init_data_cache()
+        cached = init_data_cache.get(init_data)
+        if cached is not None:
+            try:
+                user = get_cached_user(cached.user_id)
+            except User.DoesNotExist:
+                init_data_cache.delete(init_data)
+            else:
+                return (user, {
+                    'telegram_user': cached.telegram_user,
+                    'auth_date': cached.auth_date,
+                    'auth_method': 'telegram_init_data',
+                })
+
         # Validate initData
         try:
             validated = validate_init_data(init_data)
@@ -79,6 +138,8 @@ class TelegramAuthentication(authentication.BaseAuthentication):
         if created:
             logger.info(f"New user created via Telegram header auth: {validated.user.id}")
 
+        init_data_cache.set(init_data, validated, user.pk)
+
         # Return user and auth info
         return (user, {
             'telegram_user': validated.user,
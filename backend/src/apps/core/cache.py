@@ -0,0 +1,325 @@
+"""
+Two-tier cache backend: in-process LRU in front of Redis.
+
+For small, very hot values (category lists, page contents, catalog
+versions) a Redis round trip costs more than the value is worth. Reads
+are served from a bounded per-process LRU and fall back to Redis; every
+write, delete or incr is published on a Redis pub/sub channel, and a
+listener thread in each process (API workers, Celery workers, beat)
+evicts the key from its LRU.
+
+The LRU holds the serialized bytes, so every hit returns a fresh object.
+Local entries live at most LOCAL_TIMEOUT seconds, which bounds staleness
+if an invalidation is ever missed (the LRU is also cleared on every
+resubscribe). A Redis value that expires sooner may be served locally
+until then; writes, including a successful add(), evict it everywhere.
+Until the listener is subscribed, reads go straight to Redis.
+
+Configuration (settings.CACHES):
+    'hot': {
+        'BACKEND': 'apps.core.cache.TwoTierRedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'hot',
+        'OPTIONS': {'LOCAL_MAX_ENTRIES': 1000, 'LOCAL_TIMEOUT': 60},
+    }
+
+Hit counters per tier are summed across processes in Redis
+(python manage.py cachestats).
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.cache import ConnectionProxy, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.redis import RedisCache
+
+from apps.core.services.lru import LocalLRU
+
+logger = logging.getLogger(__name__)
+
+# Message that evicts everything (clear())
+CLEAR_ALL = '*'
+# Seconds between flushes of the hit counters to Redis
+STATS_FLUSH_INTERVAL = 10
+
+STAT_FIELDS = ('local_hits', 'local_misses', 'redis_hits', 'redis_misses', 'invalidations')
+
+
+class LocalTier:
+    """
+    Process-wide LRU of one cache, kept coherent over pub/sub.
+
+    Django creates a cache backend instance per thread, so the LRU, the
+    listener thread and the counters live here, shared by all of them.
+    """
+
+    def __init__(self, channel: str, maxsize: int, timeout: float):
+        self.channel = channel
+        self.stats_key = f'{channel}:stats'
+        self.timeout = timeout
+        self.lru = LocalLRU(maxsize)
+        # Message prefix that lets the listener skip our own invalidations
+        self.sender = f'{os.getpid()}:{id(self)}'
+        self.subscribed = False
+        # Bumped by every invalidation: a fill that raced with one is not stored
+        self.generation = 0
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(STAT_FIELDS, 0)
+
+    def ensure_listener(self, client_factory) -> None:
+        """Start the listener in this process (again after a fork)."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Whatever the parent process cached is not kept coherent here
+            self.lru.clear()
+            self.subscribed = False
+            self.sender = f'{pid}:{id(self)}'
+            self._counts = dict.fromkeys(STAT_FIELDS, 0)
+            self._pid = pid
+            threading.Thread(
+                target=self._listen, args=(client_factory, pid), name=f'cache-invalidation:{self.channel}', daemon=True,
+            ).start()
+
+    def _listen(self, client_factory, pid: int) -> None:
+        next_flush = time.monotonic() + STATS_FLUSH_INTERVAL
+        while self._pid == pid:
+            pubsub = None
+            try:
+                client = client_factory()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Invalidations may have been missed while not subscribed
+                self.lru.clear()
+                self.generation += 1
+                self.subscribed = True
+
+                while self._pid == pid:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._on_message(message['data'])
+                    if time.monotonic() >= next_flush:
+                        self.flush_stats(client)
+                        next_flush = time.monotonic() + STATS_FLUSH_INTERVAL
+            except Exception as e:
+                self.subscribed = False
+                self.lru.clear()
+                logger.warning(f"Cache invalidation listener for {self.channel} failed, retrying: {e}")
+                time.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _on_message(self, data) -> None:
+        if isinstance(data, bytes):
+            data = data.decode()
+        sender, _, keys = data.partition('\n')
+        if sender == self.sender:
+            return
+        self.generation += 1
+        if keys == CLEAR_ALL:
+            self.lru.clear()
+            return
+        for key in keys.split('\n'):
+            self.lru.pop(key)
+
+    def publish(self, client, keys: list[str]) -> None:
+        """Evict locally and tell the other processes."""
+        self.generation += 1
+        if keys == [CLEAR_ALL]:
+            self.lru.clear()
+        else:
+            for key in keys:
+                self.lru.pop(key)
+        self.count('invalidations')
+        client.publish(self.channel, '\n'.join([self.sender, *keys]))
+
+    def get(self, key: str) -> bytes | None:
+        if not self.subscribed:
+            return None
+        raw = self.lru.get(key)
+        self.count('local_hits' if raw is not None else 'local_misses')
+        return raw
+
+    def fill(self, key: str, raw: bytes, generation: int) -> None:
+        if self.subscribed and generation == self.generation:
+            self.lru.set(key, raw, time.time() + self.timeout)
+
+    def count(self, field: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += n
+
+    def flush_stats(self, client) -> None:
+        """Add this process's counters to the shared hash."""
+        with self._lock:
+            counts, self._counts = self._counts, dict.fromkeys(STAT_FIELDS, 0)
+        counts = {field: n for field, n in counts.items() if n}
+        if not counts:
+            return
+        try:
+            with client.pipeline(transaction=False) as pipe:
+                for field, n in counts.items():
+                    pipe.hincrby(self.stats_key, field, n)
+                pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to flush cache stats for {self.channel}: {e}")
+
+
+# LocalTier per channel, shared by the per-thread backend instances
+_tiers: dict[str, LocalTier] = {}
+_tiers_lock = threading.Lock()
+
+
+def _get_tier(channel: str, maxsize: int, timeout: float) -> LocalTier:
+    with _tiers_lock:
+        tier = _tiers.get(channel)
+        if tier is None:
+            tier = _tiers[channel] = LocalTier(channel, maxsize, timeout)
+        return tier
+
+
+class TwoTierRedisCache(RedisCache):
+    """RedisCache with a per-process LRU tier and pub/sub invalidation."""
+
+    def __init__(self, server, params):
+        options = dict(params.get('OPTIONS', {}))
+        maxsize = int(options.pop('LOCAL_MAX_ENTRIES', 1000))
+        timeout = float(options.pop('LOCAL_TIMEOUT', 60))
+        channel = options.pop('CHANNEL', None)
+        super().__init__(server, {**params, 'OPTIONS': options})
+        self._tier = _get_tier(channel or f'cache:invalidate:{self.key_prefix or "default"}', maxsize, timeout)
+
+    def _client(self, write: bool = False):
+        return self._cache.get_client(write=write)
+
+    @property
+    def tier(self) -> LocalTier:
+        self._tier.ensure_listener(lambda: self._client(write=True))
+        return self._tier
+
+    def _loads(self, raw: bytes) -> Any:
+        return self._cache._serializer.loads(raw)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        tier = self.tier
+
+        raw = tier.get(key)
+        if raw is not None:
+            return self._loads(raw)
+        return self._get_remote(key, default)
+
+    def _get_remote(self, key: str, default=None):
+        tier = self.tier
+        generation = tier.generation
+        raw = self._client().get(key)
+        if raw is None:
+            tier.count('redis_misses')
+            return default
+        tier.count('redis_hits')
+        tier.fill(key, raw, generation)
+        return self._loads(raw)
+
+    async def aget(self, key, default=None, version=None):
+        # A local hit needs no I/O: only go to a thread for Redis
+        key = self.make_and_validate_key(key, version=version)
+        raw = self.tier.get(key)
+        if raw is not None:
+            return self._loads(raw)
+        return await sync_to_async(self._get_remote)(key, default)
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        tier = self.tier
+        result = {}
+        missing = []
+        for made_key, key in key_map.items():
+            raw = tier.get(made_key)
+            if raw is not None:
+                result[key] = self._loads(raw)
+            else:
+                missing.append(made_key)
+
+        if missing:
+            generation = tier.generation
+            for made_key, raw in zip(missing, self._client().mget(missing), strict=True):
+                if raw is None:
+                    tier.count('redis_misses')
+                    continue
+                tier.count('redis_hits')
+                tier.fill(made_key, raw, generation)
+                result[key_map[made_key]] = self._loads(raw)
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, value, timeout=timeout, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version)])
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = super().set_many(data, timeout=timeout, version=version)
+        if data:
+            self._invalidate([self.make_and_validate_key(key, version=version) for key in data])
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # The key may have expired in Redis while other processes still hold
+        # it locally (also covers get_or_set(), which adds through here)
+        added = super().add(key, value, timeout=timeout, version=version)
+        if added:
+            self._invalidate([self.make_and_validate_key(key, version=version)])
+        return added
+
+    def delete(self, key, version=None):
+        deleted = super().delete(key, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version)])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        super().delete_many(keys, version=version)
+        if keys:
+            self._invalidate([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def incr(self, key, delta=1, version=None):
+        value = super().incr(key, delta=delta, version=version)
+        self._invalidate([self.make_and_validate_key(key, version=version)])
+        return value
+
+    def clear(self):
+        cleared = super().clear()
+        self._invalidate([CLEAR_ALL])
+        return cleared
+
+    # touch() doesn't change the value.
+
+    def _invalidate(self, keys: list[str]) -> None:
+        try:
+            self.tier.publish(self._client(write=True), keys)
+        except Exception as e:
+            # Redis write succeeded; other processes catch up within LOCAL_TIMEOUT
+            logger.warning(f"Failed to publish cache invalidation: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Counters of all processes (this one's are flushed first)."""
+        client = self._client(write=True)
+        self._tier.flush_stats(client)
+        counts = client.hgetall(self._tier.stats_key)
+        return {field: int(counts.get(field.encode(), 0)) for field in STAT_FIELDS}
+
+    def reset_stats(self) -> None:
+        self._client(write=True).delete(self._tier.stats_key)
+
+
+# Like django.core.cache.cache, for the two-tier 'hot' alias
+hot_cache = ConnectionProxy(caches, 'hot')
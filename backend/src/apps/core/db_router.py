@@ -0,0 +1,119 @@
+"""
+Primary/replica database routing.
+
+Reads of the models listed in settings.DATABASE_REPLICA_READS (catalog,
+analytics) go to the 'replica' alias when one is configured. Everything
+else, and every write, goes to 'default'.
+
+Read-your-writes: once anything is written, the rest of the request (or
+Celery task) reads from the primary, so a view never reads a replica that
+hasn't replayed its own write yet. Reads inside an atomic block on the
+primary stay there as well.
+
+ReplicaPinningMiddleware scopes the pinning to one request; Celery tasks
+are unpinned in task_prerun (apps.core.signals).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = 'replica'
+
+# Set by the first write, reads then stay on the primary
+_pinned: ContextVar[bool] = ContextVar('db_pinned_to_primary', default=False)
+
+
+def pin_to_primary() -> None:
+    """Read from the primary for the rest of the request or task."""
+    _pinned.set(True)
+
+
+def unpin() -> None:
+    """Allow replica reads again (start of a new unit of work)."""
+    _pinned.set(False)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, e.g. to refill a cache right after a write."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Routes configured reads to the replica, with read-your-writes pinning."""
+
+    def __init__(self):
+        labels = [label.lower() for label in settings.DATABASE_REPLICA_READS]
+        self.models = {label for label in labels if '.' in label}
+        self.apps = {label for label in labels if '.' not in label}
+
+    def _reads_from_replica(self, model) -> bool:
+        return model._meta.label_lower in self.models or model._meta.app_label in self.apps
+
+    def db_for_read(self, model, **hints):
+        if REPLICA_DB_ALIAS not in settings.DATABASES or not self._reads_from_replica(model):
+            return None
+        if _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Related objects come from where the instance was loaded
+            return None
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, never migrated directly
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """Starts every request unpinned and drops its pin afterwards."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _pinned.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = _pinned.set(False)
+        try:
+            return await self.get_response(request)
+        finally:
+            _pinned.reset(token)
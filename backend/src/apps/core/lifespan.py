@@ -0,0 +1,51 @@
+"""
+ASGI lifespan support.
+
+Django's ASGIHandler only serves HTTP and rejects 'lifespan' scopes, so
+uvicorn has nowhere to run per-worker setup and teardown. LifespanMiddleware
+answers the lifespan protocol and runs async hooks on the worker's event
+loop: startup hooks before the first request, shutdown hooks after the last
+one (graceful stop or a --limit-max-requests restart).
+"""
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[], Awaitable[None]]
+
+
+class LifespanMiddleware:
+    """Wraps an ASGI application and handles lifespan events."""
+
+    def __init__(self, app, on_startup: Iterable[Hook] = (), on_shutdown: Iterable[Hook] = ()):
+        self.app = app
+        self.on_startup = list(on_startup)
+        self.on_shutdown = list(on_shutdown)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'lifespan':
+            return await self.app(scope, receive, send)
+
+        while True:
+            message = await receive()
+
+            if message['type'] == 'lifespan.startup':
+                try:
+                    for hook in self.on_startup:
+                        await hook()
+                except Exception as e:
+                    logger.exception("ASGI startup hook failed")
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+
+            elif message['type'] == 'lifespan.shutdown':
+                # Run every hook even if one fails, resources are independent
+                for hook in self.on_shutdown:
+                    try:
+                        await hook()
+                    except Exception:
+                        logger.exception(f"ASGI shutdown hook {hook.__qualname__} failed")
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
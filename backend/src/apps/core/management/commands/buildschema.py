@@ -0,0 +1,33 @@
+"""
+Django management command to precompute the OpenAPI schema.
+
+Run at build time (see Dockerfile); PrecomputedSchemaView then serves the
+files instead of introspecting every view on each request:
+
+    python manage.py buildschema
+    python manage.py buildschema --output-dir /tmp/schema
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from apps.core.services.schema import write_schema
+
+
+class Command(BaseCommand):
+    """Generate the OpenAPI schema into versioned YAML and JSON files."""
+
+    help = 'Generate the OpenAPI schema into OPENAPI_SCHEMA_DIR (served by /api/schema/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', type=Path, help='Directory (default: settings.OPENAPI_SCHEMA_DIR)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        paths = write_schema(options['output_dir'])
+        elapsed = time.perf_counter() - started
+
+        for path in paths:
+            self.stdout.write(f'{path} ({path.stat().st_size / 1024:.0f} KiB)')
+        self.stdout.write(self.style.SUCCESS(f'Schema generated in {elapsed:.1f}s'))
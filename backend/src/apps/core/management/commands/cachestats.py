@@ -0,0 +1,65 @@
+"""
+Django management command to show cache hit rates.
+
+Per-tier hit rates of the two-tier cache and per-name counters of the
+cached computations (apps.core.services.computation), all processes:
+
+    python manage.py cachestats
+    python manage.py cachestats --reset
+"""
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+from apps.core.cache import TwoTierRedisCache
+from apps.core.services.computation import get_computations
+
+
+def _rate(hits: int, misses: int) -> str:
+    total = hits + misses
+    return f'{hits / total:.1%} ({hits}/{total})' if total else '-'
+
+
+class Command(BaseCommand):
+    """Print two-tier cache and cached computation stats, summed over all processes."""
+
+    help = 'Show (and optionally reset) cache hit rates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alias', default='hot', help='Two-tier cache alias (default: hot)')
+        parser.add_argument('--reset', action='store_true', help='Reset counters after printing')
+
+    def handle(self, *args, **options):
+        backend = caches[options['alias']]
+        if isinstance(backend, TwoTierRedisCache):
+            stats = backend.stats()
+            # Every lookup ends as a local hit, a Redis hit or a Redis miss
+            self.stdout.write(f"Cache '{options['alias']}':")
+            self.stdout.write(f"  local: {_rate(stats['local_hits'], stats['local_misses'])}")
+            self.stdout.write(f"  redis: {_rate(stats['redis_hits'], stats['redis_misses'])}")
+            self.stdout.write(
+                f"  overall: {_rate(stats['local_hits'] + stats['redis_hits'], stats['redis_misses'])}"
+            )
+            self.stdout.write(f"  invalidations published: {stats['invalidations']}")
+            if options['reset']:
+                backend.reset_stats()
+        else:
+            self.stdout.write(f"Cache '{options['alias']}' is not a TwoTierRedisCache, skipped")
+
+        # Computations register on import (app signals, admin, services)
+        computations = get_computations()
+        if not computations:
+            return
+        self.stdout.write(
+            f"\n{'computation':<28} {'served':>8} {'stale':>7} {'early':>7} {'waits':>7} "
+            f"{'misses':>7} {'errors':>7} {'avg ms':>8}"
+        )
+        for name, computation in sorted(computations.items()):
+            stats = computation.stats()
+            served = stats['hits'] + stats['stale'] + stats['early'] + stats['waits'] + stats['misses']
+            avg = f"{stats['compute_ms'] / stats['recomputes']:.1f}" if stats['recomputes'] else '-'
+            self.stdout.write(
+                f"{name:<28} {served:>8} {stats['stale']:>7} {stats['early']:>7} {stats['waits']:>7} "
+                f"{stats['misses']:>7} {stats['errors']:>7} {avg:>8}"
+            )
+            if options['reset']:
+                computation.reset_stats()
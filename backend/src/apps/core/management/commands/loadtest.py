@@ -0,0 +1,239 @@
+"""
+Django management command to load-test the API over HTTP.
+
+Concurrent clients request the hot endpoints (catalog, product, categories,
+analytics ingest, and page content when authenticated) and the command
+reports requests/sec, p50/p99 latency and the server's resident memory
+summed over all its worker processes.
+
+Compare sync WSGI and ASGI at about the same memory (the command starts
+each server on a free port, with throttling off, and stops it afterwards):
+
+    python manage.py loadtest --serve wsgi:4 --serve asgi:2 -c 64 -d 30
+
+Or load an already running server:
+
+    python manage.py loadtest --url http://localhost:8000 --server-pid <pid>
+"""
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.core.models import PageContent
+from apps.products.models import Product
+from apps.users.models import User
+
+
+def _server_command(kind: str, workers: int, port: int) -> list[str]:
+    if kind == 'wsgi':
+        return [
+            sys.executable, '-m', 'gunicorn', 'wsgi:application',
+            '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning',
+        ]
+    return [
+        sys.executable, '-m', 'uvicorn', 'asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+        '--lifespan', 'on', '--no-access-log', '--log-level', 'warning',
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _tree_rss(pid: int) -> int:
+    """Resident memory of a process and all its descendants, in bytes (Linux)."""
+    children: dict[int, list[int]] = {}
+    for stat in Path('/proc').glob('[0-9]*/stat'):
+        try:
+            # 'pid (comm) state ppid ...', comm may contain spaces
+            fields = stat.read_text().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, []))
+        try:
+            status = Path(f'/proc/{current}/status').read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith('VmRSS:'):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+class Command(BaseCommand):
+    """Measure throughput, tail latency and memory of the API under concurrent load."""
+
+    help = 'Load-test the hot API endpoints (optionally starting WSGI/ASGI servers to compare)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server')
+        parser.add_argument('--server-pid', type=int, help='PID of the running server (for memory)')
+        parser.add_argument(
+            '--serve', action='append', default=[], metavar='KIND:WORKERS',
+            help='Start a server and test it: wsgi:N (gunicorn sync) or asgi:N (uvicorn); repeatable',
+        )
+        parser.add_argument('-c', '--concurrency', type=int, default=64, help='Concurrent clients')
+        parser.add_argument('-d', '--duration', type=float, default=20, help='Measured seconds')
+        parser.add_argument('--warmup', type=float, default=3, help='Unmeasured seconds before')
+        parser.add_argument('--user-id', type=int, help='Authenticate as this user (adds page content)')
+
+    def handle(self, *args, **options):
+        if bool(options['url']) == bool(options['serve']):
+            raise CommandError('Pass either --url or --serve')
+        # httpx logs every request at INFO
+        logging.getLogger('httpx').setLevel(logging.WARNING)
+
+        requests = self._request_mix(options['user_id'])
+        results = []
+
+        if options['url']:
+            results.append(('server', self._run(options['url'], options['server_pid'], requests, options)))
+
+        for spec in options['serve']:
+            kind, _, workers = spec.partition(':')
+            if kind not in ('wsgi', 'asgi') or not workers.isdigit():
+                raise CommandError(f'Invalid --serve {spec!r}, expected wsgi:N or asgi:N')
+            port = _free_port()
+            process = self._start(kind, int(workers), port)
+            try:
+                results.append((spec, self._run(f'http://127.0.0.1:{port}', process.pid, requests, options)))
+            finally:
+                process.terminate()
+                try:
+                    process.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+        self.stdout.write(
+            f"\n{'server':<10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'RSS MiB':>8}"
+        )
+        for name, result in results:
+            rss = f"{result['rss'] / 2**20:.0f}" if result['rss'] else '-'
+            self.stdout.write(
+                f"{name:<10} {result['rps']:>9.1f} {result['p50']:>8.1f} {result['p99']:>8.1f} "
+                f"{result['errors']:>7} {rss:>8}"
+            )
+
+    def _request_mix(self, user_id: int | None) -> dict:
+        """Requests cycled by every client, and the auth header."""
+        requests = [
+            ('GET', '/api/v1/products/', None),
+            ('GET', '/api/v1/products/categories/', None),
+        ]
+        slug = Product.objects.filter(is_active=True).values_list('slug', flat=True).first()
+        if slug:
+            requests.append(('GET', f'/api/v1/products/{slug}/', None))
+        product_id = Product.objects.filter(is_active=True).values_list('id', flat=True).first()
+        requests.append((
+            'POST', '/api/v1/analytics/track/',
+            {'event_type': 'product_view', 'product_id': product_id, 'session_id': 'loadtest'},
+        ))
+
+        headers = {}
+        if user_id is not None:
+            user = User.objects.filter(pk=user_id).first()
+            if user is None:
+                raise CommandError(f'User {user_id} not found')
+            headers['Authorization'] = f'Bearer {RefreshToken.for_user(user).access_token}'
+            page = PageContent.objects.filter(is_active=True).values_list('slug', flat=True).first()
+            if page:
+                requests.append(('GET', f'/api/v1/pages/{page}/', None))
+
+        return {'requests': requests, 'headers': headers}
+
+    def _start(self, kind: str, workers: int, port: int) -> subprocess.Popen:
+        env = {
+            **os.environ,
+            # Measure serving, not the 429 path
+            'THROTTLE_ENABLED': 'False',
+            # Without the pool: persistent connections are per thread, ASGI uses a new one per request
+            **({'DB_CONN_MAX_AGE': '0'} if kind == 'asgi' else {}),
+        }
+        process = subprocess.Popen(_server_command(kind, workers, port), cwd=settings.BASE_DIR, env=env)
+
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'{kind} server exited with code {process.returncode}')
+            try:
+                httpx.get(f'http://127.0.0.1:{port}/api/v1/products/categories/', timeout=5)
+                return process
+            except httpx.HTTPError:
+                time.sleep(0.5)
+
+        process.kill()
+        raise CommandError(f'{kind} server did not start in 60s')
+
+    def _run(self, base_url: str, server_pid: int | None, mix: dict, options: dict) -> dict:
+        self.stdout.write(f"Loading {base_url} with {options['concurrency']} clients...")
+        return asyncio.run(self._load(base_url, server_pid, mix, options))
+
+    async def _load(self, base_url: str, server_pid: int | None, mix: dict, options: dict) -> dict:
+        latencies: list[float] = []
+        errors = 0
+        rss_samples: list[int] = []
+        started = time.monotonic()
+        measure_from = started + options['warmup']
+        stop_at = measure_from + options['duration']
+
+        limits = httpx.Limits(max_connections=options['concurrency'], max_keepalive_connections=options['concurrency'])
+        async with httpx.AsyncClient(base_url=base_url, headers=mix['headers'], limits=limits, timeout=30) as client:
+
+            async def worker(offset: int):
+                nonlocal errors
+                requests = itertools.islice(itertools.cycle(mix['requests']), offset, None)
+                for method, path, body in requests:
+                    now = time.monotonic()
+                    if now >= stop_at:
+                        return
+                    try:
+                        response = await client.request(method, path, json=body)
+                        failed = response.status_code >= 400
+                    except httpx.HTTPError:
+                        failed = True
+                    if now >= measure_from:
+                        latencies.append((time.monotonic() - now) * 1000)
+                        errors += failed
+
+            async def sample_memory():
+                while time.monotonic() < stop_at:
+                    if time.monotonic() >= measure_from:
+                        rss_samples.append(await asyncio.to_thread(_tree_rss, server_pid))
+                    await asyncio.sleep(0.5)
+
+            tasks = [worker(n) for n in range(options['concurrency'])]
+            if server_pid and Path('/proc').exists():
+                tasks.append(sample_memory())
+            await asyncio.gather(*tasks)
+
+        if not latencies:
+            raise CommandError('No requests completed')
+        latencies.sort()
+        return {
+            'rps': len(latencies) / options['duration'],
+            'p50': statistics.median(latencies),
+            'p99': latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+            'errors': errors,
+            'rss': max(rss_samples, default=0),
+        }
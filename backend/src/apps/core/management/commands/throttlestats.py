@@ -0,0 +1,31 @@
+"""
+Django management command to show API throttling counters.
+
+    python manage.py throttlestats           # rejected requests per scope
+    python manage.py throttlestats --reset
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.services.token_bucket import get_token_bucket_limiter
+
+
+class Command(BaseCommand):
+    """Print requests rejected by TokenBucketThrottle, per throttle_scope."""
+
+    help = 'Show (and optionally reset) API throttling counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset counters after printing')
+
+    def handle(self, *args, **options):
+        limiter = get_token_bucket_limiter()
+        counts = limiter.drop_counts()
+
+        if not counts:
+            self.stdout.write('No throttled requests')
+        for scope, count in sorted(counts.items()):
+            self.stdout.write(f'{scope}: {count}')
+
+        if options['reset']:
+            limiter.reset_drop_counts()
+            self.stdout.write(self.style.SUCCESS('Counters reset'))
@@ -0,0 +1,52 @@
+"""
+Shared Redis clients for code that talks to Redis directly (outside the
+Django cache): webhook dedup, conversation state, token buckets, the
+last_login buffer.
+
+redis.asyncio clients are bound to the event loop they were created in,
+and the webhook may run each request in its own loop, so async clients are
+kept per loop; close_async_redis() closes them when the loop is done. Sync
+clients are thread-safe and shared by the whole process.
+"""
+import asyncio
+import threading
+import weakref
+
+from django.conf import settings
+
+# url -> client
+_clients: dict = {}
+# loop -> {url -> client}
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def get_redis(url: str | None = None):
+    """Process-wide sync client (decode_responses=True), REDIS_URL by default."""
+    url = url or settings.REDIS_URL
+    client = _clients.get(url)
+    if client is None:
+        import redis
+
+        with _lock:
+            client = _clients.setdefault(url, redis.Redis.from_url(url, decode_responses=True))
+    return client
+
+
+def get_async_redis(url: str | None = None):
+    """Async client of the running event loop (decode_responses=True), REDIS_URL by default."""
+    import redis.asyncio as aioredis
+
+    url = url or settings.REDIS_URL
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(url)
+    if client is None:
+        client = clients[url] = aioredis.from_url(url, decode_responses=True)
+    return client
+
+
+async def close_async_redis() -> None:
+    """Close the running event loop's async clients (its connections go with them)."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
@@ -0,0 +1,319 @@
+"""
+Stampede-safe caching of expensive computations.
+
+When a popular cached value expires, every worker that misses it would
+recompute it at once (dogpile). A CachedComputation prevents that:
+
+- single flight: only the worker holding a short Redis lock (cache.add on
+  the default cache) recomputes a key; on a cold miss the others poll for
+  its result instead of running the same query;
+- stale-while-revalidate: after `ttl` the entry is kept for `stale_ttl`
+  more seconds, and while one worker recomputes the rest serve the stale
+  value (also when the recompute fails);
+- probabilistic early expiration (XFetch): shortly before expiry a request
+  may volunteer to recompute, with a probability that grows as expiry
+  approaches and with how long the computation takes (`beta` scales it),
+  so popular keys are usually refreshed before anyone sees them stale.
+
+Entries are stored as (value, expires_at, compute seconds) under
+'computation:<name>:<generation>:<key>'. invalidate(key) drops one key,
+invalidate_all() bumps the generation of the name.
+
+Counters per name (hits, early refreshes, stale serves, misses, lock
+waits, recomputes, errors, compute time) are kept per process, added to
+the default cache every STATS_FLUSH_INTERVAL seconds and shown by
+`python manage.py cachestats`.
+
+Usage:
+    @cached_computation('categories', ttl=60, cache_alias='hot')
+    def category_list() -> list[dict]: ...
+
+    category_list()               # sync
+    await category_list.acall()   # async, the computation runs in a thread
+    category_list.invalidate()
+
+    products = CachedComputation('catalog', ttl=60)
+    products.get_or_compute(key, lambda: expensive(key))
+"""
+import asyncio
+import functools
+import logging
+import math
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache, caches
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'computation'
+# Seconds between flushes of the per-process counters
+STATS_FLUSH_INTERVAL = 10
+# Seconds between checks for a result computed by another worker
+POLL_INTERVAL = 0.05
+
+STAT_FIELDS = ('hits', 'early', 'stale', 'misses', 'waits', 'recomputes', 'errors', 'compute_ms')
+
+# name -> CachedComputation, for the stats command
+_registry: dict[str, 'CachedComputation'] = {}
+
+
+class CachedComputation:
+    """A named family of cached values with single-flight recomputation."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        *,
+        stale_ttl: float | None = None,
+        beta: float = 1.0,
+        lock_timeout: float = 30,
+        cache_alias: str = 'default',
+    ):
+        if name in _registry:
+            raise ValueError(f"Cached computation {name!r} is already defined")
+        self.name = name
+        self.ttl = ttl
+        # By default a value may be served stale for as long as it was fresh
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.beta = beta
+        # Also the longest a cold miss waits for another worker's result
+        self.lock_timeout = lock_timeout
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(STAT_FIELDS, 0)
+        self._flushed_at = time.monotonic()
+        _registry[name] = self
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    # Keys
+
+    @property
+    def _generation_key(self) -> str:
+        return f'{KEY_PREFIX}:{self.name}:generation'
+
+    def _entry_key(self, key: str, generation: int | None) -> str:
+        return f'{KEY_PREFIX}:{self.name}:{generation or 0}:{key}'
+
+    def _lock_key(self, entry_key: str) -> str:
+        return f'{entry_key}:lock'
+
+    # Decisions shared by the sync and async paths
+
+    def _is_fresh(self, entry: tuple) -> bool:
+        """Fresh and not volunteering for an early recompute."""
+        _, expires_at, delta = entry
+        now = time.time()
+        if now >= expires_at:
+            return False
+        if self.beta <= 0:
+            return True
+        # XFetch: -log(u) is exponential, so early recomputes get likelier near expiry
+        return now - delta * self.beta * math.log(1.0 - random.random()) < expires_at
+
+    def _entry(self, value: Any, delta: float) -> tuple:
+        return value, time.time() + self.ttl, delta
+
+    def _served(self, entry: tuple) -> Any:
+        self.count('stale' if time.time() >= entry[1] else 'hits')
+        return entry[0]
+
+    # Sync API
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Cached value for the key, computing it (once across workers) if needed."""
+        entry_key = self._entry_key(key, self.cache.get(self._generation_key))
+        entry = self.cache.get(entry_key)
+        if entry is not None and self._is_fresh(entry):
+            return self._served(entry)
+
+        lock_key = self._lock_key(entry_key)
+        if cache.add(lock_key, 1, timeout=self.lock_timeout):
+            if entry is not None:
+                self.count('stale' if time.time() >= entry[1] else 'early')
+            else:
+                self.count('misses')
+            try:
+                return self._recompute(entry_key, compute, entry)
+            finally:
+                cache.delete(lock_key)
+
+        if entry is not None:
+            # Someone else is recomputing
+            return self._served(entry)
+
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = self.cache.get(entry_key)
+            if entry is not None:
+                self.count('waits')
+                return entry[0]
+
+        # The lock holder is stuck or died: compute without it
+        self.count('misses')
+        return self._recompute(entry_key, compute, None)
+
+    def _recompute(self, entry_key: str, compute: Callable[[], Any], stale: tuple | None) -> Any:
+        started = time.perf_counter()
+        try:
+            value = compute()
+        except Exception:
+            if stale is None:
+                raise
+            self.count('errors')
+            logger.exception(f"Recomputing {self.name} failed, serving the stale value")
+            return stale[0]
+        delta = time.perf_counter() - started
+        self._store(entry_key, value, delta)
+        self.count('recomputes')
+        self.count('compute_ms', round(delta * 1000))
+        return value
+
+    def _store(self, entry_key: str, value: Any, delta: float) -> None:
+        try:
+            self.cache.set(entry_key, self._entry(value, delta), timeout=self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"Failed to cache {self.name}: {e}")
+
+    def invalidate(self, key: str) -> None:
+        """Drop one cached value."""
+        self.cache.delete(self._entry_key(key, self.cache.get(self._generation_key)))
+
+    def invalidate_all(self) -> None:
+        """Drop every cached value of this computation (they expire on their own)."""
+        if not self.cache.add(self._generation_key, 1, timeout=None):
+            self.cache.incr(self._generation_key)
+
+    # Async API
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Async version of get_or_compute().
+
+        compute is sync (usually ORM code) and runs in a worker thread;
+        waiting for another worker's result doesn't block a thread.
+        """
+        entry_key = self._entry_key(key, await self.cache.aget(self._generation_key))
+        entry = await self.cache.aget(entry_key)
+        if entry is not None and self._is_fresh(entry):
+            return self._served(entry)
+
+        lock_key = self._lock_key(entry_key)
+        if await cache.aadd(lock_key, 1, timeout=self.lock_timeout):
+            if entry is not None:
+                self.count('stale' if time.time() >= entry[1] else 'early')
+            else:
+                self.count('misses')
+            try:
+                return await sync_to_async(self._recompute)(entry_key, compute, entry)
+            finally:
+                await cache.adelete(lock_key)
+
+        if entry is not None:
+            return self._served(entry)
+
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            entry = await self.cache.aget(entry_key)
+            if entry is not None:
+                self.count('waits')
+                return entry[0]
+
+        self.count('misses')
+        return await sync_to_async(self._recompute)(entry_key, compute, None)
+
+    # Metrics
+
+    def count(self, field: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[field] += n
+            if time.monotonic() - self._flushed_at < STATS_FLUSH_INTERVAL:
+                return
+            counts, self._counts = self._counts, dict.fromkeys(STAT_FIELDS, 0)
+            self._flushed_at = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush(counts)
+        else:
+            # Don't block the event loop on the cache
+            loop.run_in_executor(None, self._flush, counts)
+
+    def _stats_key(self, field: str) -> str:
+        return f'{KEY_PREFIX}:{self.name}:stats:{field}'
+
+    def _flush(self, counts: dict[str, int]) -> None:
+        try:
+            for field, n in counts.items():
+                if not n:
+                    continue
+                if not cache.add(self._stats_key(field), n, timeout=None):
+                    cache.incr(self._stats_key(field), n)
+        except Exception as e:
+            logger.warning(f"Failed to flush stats of {self.name}: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Counters of all processes (this one's are flushed first)."""
+        with self._lock:
+            counts, self._counts = self._counts, dict.fromkeys(STAT_FIELDS, 0)
+            self._flushed_at = time.monotonic()
+        self._flush(counts)
+        stored = cache.get_many([self._stats_key(field) for field in STAT_FIELDS])
+        return {field: int(stored.get(self._stats_key(field), 0)) for field in STAT_FIELDS}
+
+    def reset_stats(self) -> None:
+        cache.delete_many([self._stats_key(field) for field in STAT_FIELDS])
+
+
+def cached_computation(
+    name: str,
+    ttl: float,
+    *,
+    key: Callable[..., str] | None = None,
+    **options,
+):
+    """
+    Decorator caching a function's result through a CachedComputation.
+
+    key builds the cache key from the call's arguments; by default the
+    arguments are joined with ':'. The wrapper gets acall() (async),
+    invalidate(*args) and invalidate_all(), and the computation itself as
+    .computation.
+    """
+    def decorator(func):
+        computation = CachedComputation(name, ttl, **options)
+
+        def make_key(*args, **kwargs) -> str:
+            if key is not None:
+                return key(*args, **kwargs)
+            return ':'.join([*map(str, args), *(f'{k}={v}' for k, v in sorted(kwargs.items()))])
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return computation.get_or_compute(make_key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        async def acall(*args, **kwargs):
+            return await computation.aget_or_compute(make_key(*args, **kwargs), lambda: func(*args, **kwargs))
+
+        wrapper.acall = acall
+        wrapper.invalidate = lambda *args, **kwargs: computation.invalidate(make_key(*args, **kwargs))
+        wrapper.invalidate_all = computation.invalidate_all
+        wrapper.computation = computation
+        return wrapper
+
+    return decorator
+
+
+def get_computations() -> dict[str, CachedComputation]:
+    """Computations defined so far, by name."""
+    return dict(_registry)
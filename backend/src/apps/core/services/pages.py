@@ -0,0 +1,102 @@
+"""
+Pre-rendered static pages (About, Delivery, Contacts).
+
+Pages change rarely and are requested on every open of those screens, so
+their JSON is rendered once and kept in the 'hot' cache without expiry,
+together with an ETag and Last-Modified. Requests are served from the
+per-process tier (no SQL, usually no Redis either).
+
+PageContent save/delete signals re-render every page after commit, and
+the hot cache evicts the old copies in all processes. ASGI workers warm
+the cache on startup; a cache flush is refilled lazily from the database.
+"""
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.cache import hot_cache
+from apps.core.models import PageContent
+from apps.core.serializers import PageContentSerializer
+
+logger = logging.getLogger(__name__)
+
+# Bump when the rendered representation changes
+CACHE_KEY = 'pages:v1:{slug}'
+# Stored for slugs without an active page, so a 404 costs no query either
+NOT_FOUND = 'not-found'
+
+SLUGS = PageContent.PageSlug.values
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """Response body of a page with its validators."""
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def render_page(page: PageContent) -> RenderedPage:
+    body = JSONRenderer().render(PageContentSerializer(page).data)
+    return RenderedPage(
+        body=body,
+        etag=f'"{hashlib.sha1(body).hexdigest()}"',
+        last_modified=page.updated_at,
+    )
+
+
+def _load_pages() -> dict[str, object]:
+    """Cache entries of all slugs, from the database."""
+    pages = {page.slug: page for page in PageContent.objects.filter(is_active=True)}
+    return {
+        CACHE_KEY.format(slug=slug): render_page(pages[slug]) if slug in pages else NOT_FOUND
+        for slug in SLUGS
+    }
+
+
+def _fill(entries: dict[str, object]) -> None:
+    # add(): never overwrite a newer render stored by refresh_pages()
+    for key, entry in entries.items():
+        hot_cache.add(key, entry, None)
+
+
+def get_page(slug: str) -> RenderedPage | None:
+    """Rendered active page, or None."""
+    if slug not in SLUGS:
+        return None
+    key = CACHE_KEY.format(slug=slug)
+    entry = hot_cache.get(key)
+    if entry is None:
+        entries = _load_pages()
+        _fill(entries)
+        entry = entries[key]
+    return entry if entry != NOT_FOUND else None
+
+
+async def aget_page(slug: str) -> RenderedPage | None:
+    """Async get_page(): no thread hop on a local hit."""
+    if slug not in SLUGS:
+        return None
+    entry = await hot_cache.aget(CACHE_KEY.format(slug=slug))
+    if entry is None:
+        return await sync_to_async(get_page)(slug)
+    return entry if entry != NOT_FOUND else None
+
+
+def refresh_pages() -> None:
+    """Re-render all pages (a save may change a slug or deactivate a page)."""
+    hot_cache.set_many(_load_pages(), None)
+
+
+async def warm_pages() -> None:
+    """ASGI startup hook: make sure every page is rendered before the first request."""
+    try:
+        cached = await sync_to_async(hot_cache.get_many)([CACHE_KEY.format(slug=slug) for slug in SLUGS])
+        if len(cached) < len(SLUGS):
+            await sync_to_async(lambda: _fill(_load_pages()))()
+    except Exception as e:
+        logger.warning(f"Failed to warm page contents: {e}")
@@ -0,0 +1,73 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, which takes
+seconds of CPU. `python manage.py buildschema` (run when the image is
+built) renders it once per format into OPENAPI_SCHEMA_DIR, named after
+the API version; PrecomputedSchemaView serves those bytes.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+
+# Renderer format (also the file suffix) -> renderer class
+SCHEMA_FORMATS = {
+    'yaml': OpenApiYamlRenderer,
+    'json': OpenApiJsonRenderer,
+}
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    """Rendered schema with its ETag."""
+    body: bytes
+    etag: str
+
+
+def schema_path(fmt: str, directory: Path | None = None) -> Path:
+    version = spectacular_settings.VERSION or 'unversioned'
+    return Path(directory or settings.OPENAPI_SCHEMA_DIR) / f'openapi-{version}.{fmt}'
+
+
+def generate_schema() -> dict:
+    """The public schema, as SpectacularAPIView would generate it."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_schema(directory: Path | None = None) -> list[Path]:
+    """Generate the schema and write it in every format, returns the paths."""
+    schema = generate_schema()
+    paths = []
+    for fmt, renderer_class in SCHEMA_FORMATS.items():
+        path = schema_path(fmt, directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(renderer_class().render(schema, renderer_context={}))
+        paths.append(path)
+    return paths
+
+
+# Loaded artifacts per format; files only change with a new deploy
+_artifacts: dict[str, SchemaArtifact | None] = {}
+_lock = threading.Lock()
+
+
+def load_schema(fmt: str) -> SchemaArtifact | None:
+    """The precomputed schema in a format, or None if it wasn't built."""
+    if fmt not in SCHEMA_FORMATS:
+        return None
+    if fmt not in _artifacts:
+        with _lock:
+            if fmt not in _artifacts:
+                try:
+                    body = schema_path(fmt).read_bytes()
+                except FileNotFoundError:
+                    _artifacts[fmt] = None
+                else:
+                    _artifacts[fmt] = SchemaArtifact(body=body, etag=f'"{hashlib.sha1(body).hexdigest()}"')
+    return _artifacts[fmt]
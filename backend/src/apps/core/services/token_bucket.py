@@ -0,0 +1,157 @@
+"""
+Redis token buckets.
+
+A request takes one token from each of its buckets (e.g. per client and
+per IP). One Lua script refills, checks and takes them atomically using
+the Redis server clock, so workers share buckets without races and a
+check costs a single round trip. A request is allowed only if every
+bucket has a token; otherwise nothing is taken and the drop is counted
+per name in a Redis hash.
+"""
+import logging
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from apps.core.redis_clients import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1..n] bucket hashes, KEYS[n+1] drop counters hash
+# ARGV[1] counter field, then capacity and refill rate (tokens/s) per bucket
+# Returns {allowed (1/0), milliseconds until a token is available}
+TOKEN_BUCKET_SCRIPT = """
+local n = #KEYS - 1
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local levels = {}
+local wait = 0
+for i = 1, n do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local level = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if level == nil then
+        level = capacity
+        ts = now
+    end
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    if level < 1 then
+        wait = math.max(wait, (1 - level) / rate)
+    end
+    levels[i] = level
+end
+
+local allowed = 0
+if wait == 0 then
+    allowed = 1
+else
+    redis.call('HINCRBY', KEYS[n + 1], ARGV[1], 1)
+end
+
+for i = 1, n do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    redis.call('HSET', KEYS[i], 'tokens', levels[i] - allowed, 'ts', now)
+    redis.call('EXPIRE', KEYS[i], math.ceil(capacity / rate) + 1)
+end
+
+return {allowed, math.ceil(wait * 1000)}
+"""
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """Burst of capacity requests, refilled at per_minute (> 0)."""
+    capacity: int
+    per_minute: float
+
+    @property
+    def rate(self) -> float:
+        """Refill rate in tokens per second."""
+        return self.per_minute / 60
+
+
+class TokenBucketLimiter:
+    """Takes tokens from Redis buckets (sync and async clients)."""
+
+    def __init__(self, url: str | None = None, prefix: str = 'throttle:'):
+        self.url = url or settings.REDIS_URL
+        self.prefix = prefix
+        self.drops_key = f'{prefix}drops'
+        self._script = None
+
+    def _sync_script(self):
+        if self._script is None:
+            self._script = get_redis(self.url).register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def _async_script(self):
+        # Bound to the running loop's client; registering only hashes the script
+        return get_async_redis(self.url).register_script(TOKEN_BUCKET_SCRIPT)
+
+    def _call_args(self, name: str, buckets: list[tuple[str, Bucket]]) -> dict:
+        keys = [f'{self.prefix}{key}' for key, _ in buckets] + [self.drops_key]
+        args = [name]
+        for _, bucket in buckets:
+            args += [bucket.capacity, bucket.rate]
+        return {'keys': keys, 'args': args}
+
+    def take(self, name: str, buckets: list[tuple[str, Bucket]]) -> tuple[bool, float]:
+        """
+        Take a token from every bucket.
+
+        Returns (allowed, seconds to wait). Allows everything while Redis
+        is unavailable.
+        """
+        try:
+            allowed, wait_ms = self._sync_script()(**self._call_args(name, buckets))
+        except Exception as e:
+            logger.warning(f"Token bucket unavailable, allowing {name}: {e}")
+            return True, 0.0
+        return bool(allowed), wait_ms / 1000
+
+    async def atake(self, name: str, buckets: list[tuple[str, Bucket]]) -> tuple[bool, float]:
+        """Async version of take()."""
+        try:
+            allowed, wait_ms = await self._async_script()(**self._call_args(name, buckets))
+        except Exception as e:
+            logger.warning(f"Token bucket unavailable, allowing {name}: {e}")
+            return True, 0.0
+        return bool(allowed), wait_ms / 1000
+
+    def drop_counts(self) -> dict[str, int]:
+        """Requests rejected so far, per name (all workers)."""
+        try:
+            counts = get_redis(self.url).hgetall(self.drops_key)
+        except Exception as e:
+            logger.warning(f"Failed to read token bucket drop counts: {e}")
+            return {}
+        return {name: int(count) for name, count in counts.items()}
+
+    def reset_drop_counts(self) -> None:
+        """Start counting drops from zero."""
+        get_redis(self.url).delete(self.drops_key)
+
+    async def adrop_counts(self) -> dict[str, int]:
+        """Async version of drop_counts()."""
+        try:
+            counts = await self._async_script().registered_client.hgetall(self.drops_key)
+        except Exception as e:
+            logger.warning(f"Failed to read token bucket drop counts: {e}")
+            return {}
+        return {name: int(count) for name, count in counts.items()}
+
+
+# Singleton instance for convenience
+_limiter: TokenBucketLimiter | None = None
+
+
+def get_token_bucket_limiter() -> TokenBucketLimiter:
+    """Get or create the API throttling limiter singleton."""
+    global _limiter
+    if _limiter is None:
+        _limiter = TokenBucketLimiter()
+    return _limiter
@@ -0,0 +1,24 @@
+"""
+Core signals.
+"""
+from celery.signals import task_prerun
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.db_router import unpin
+from apps.core.models import PageContent
+from apps.core.services.pages import refresh_pages
+
+
+@task_prerun.connect
+def unpin_database(**kwargs):
+    """Each task starts reading from the replica again (see db_router)."""
+    unpin()
+
+
+@receiver(post_save, sender=PageContent)
+@receiver(post_delete, sender=PageContent)
+def refresh_rendered_pages(sender, **kwargs):
+    """Re-render cached pages after a page change is committed."""
+    transaction.on_commit(refresh_pages)
@@ -1,23 +1,41 @@
 """Core views."""
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
-from apps.core.models import PageContent
-from apps.core.serializers import PageContentSerializer
+from apps.core.async_views import AsyncAPIView
+from apps.core.services.pages import aget_page
+from apps.core.views.schema import PrecomputedSchemaView
 
+__all__ = [
+    'PageContentView',
+    'PrecomputedSchemaView',
+]
 
-class PageContentView(APIView):
+
+class PageContentView(AsyncAPIView):
     """Получение контента страницы по slug."""
 
-    def get(self, request, slug: str):
-        try:
-            page = PageContent.objects.get(slug=slug, is_active=True)
-        except PageContent.DoesNotExist:
+    async def get(self, request, slug: str):
+        # Готовый JSON из кэша (apps.core.services.pages), без запросов к БД
+        page = await aget_page(slug)
+        if page is None:
             return Response(
                 {'detail': 'Страница не найдена'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = PageContentSerializer(page)
-        return Response(serializer.data)
+        response = HttpResponse(page.body, content_type='application/json')
+        response.headers['ETag'] = page.etag
+        response.headers['Last-Modified'] = http_date(page.last_modified.timestamp())
+        # Контент доступен только авторизованным: в общих кэшах не храним
+        patch_cache_control(response, private=True, no_cache=True)
+        # 304 Not Modified по If-None-Match / If-Modified-Since
+        return get_conditional_response(
+            request,
+            etag=page.etag,
+            last_modified=int(page.last_modified.timestamp()),
+            response=response,
+        )
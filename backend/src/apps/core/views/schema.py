@@ -0,0 +1,45 @@
+"""OpenAPI schema view."""
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+from apps.core.services.schema import load_schema
+
+logger = logging.getLogger(__name__)
+
+# Клиенты перепроверяют схему по ETag не чаще раза в 5 минут
+CACHE_MAX_AGE = 300
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """
+    OpenAPI-схема, сгенерированная при сборке (manage.py buildschema).
+
+    В DEBUG, при параметрах lang/version или без собранного файла схема
+    генерируется на лету, как в SpectacularAPIView.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if settings.DEBUG or request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        artifact = load_schema(renderer.format)
+        if artifact is None:
+            logger.warning("Precomputed OpenAPI schema not found, generating it (run manage.py buildschema)")
+            return super().get(request, *args, **kwargs)
+
+        # Тот же Content-Type, что у Response с этим рендерером
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = HttpResponse(artifact.body, content_type=content_type)
+        response.headers['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        response.headers['ETag'] = artifact.etag
+        patch_cache_control(response, public=True, max_age=CACHE_MAX_AGE)
+        return get_conditional_response(request, etag=artifact.etag, response=response)
@@ -1,5 +1,6 @@
 """Orders admin with Unfold."""
 from django.contrib import admin
+from django.db import transaction
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin, TabularInline
 from unfold.contrib.filters.admin import RangeDateFilter, DropdownFilter
@@ -93,6 +94,7 @@ class OrderAdmin(ModelAdmin):
     ordering = ['-created_at']
     list_per_page = 25
     date_hierarchy = 'created_at'
+    actions = ['mark_confirmed', 'mark_in_progress', 'mark_delivering', 'mark_done']
 
     fieldsets = (
         ('Статус заказа', {
@@ -127,6 +129,37 @@ class OrderAdmin(ModelAdmin):
         }),
     )
 
+    def _set_status(self, request, queryset, status):
+        """
+        Массовая смена статуса.
+
+        Сохраняем заказы по одному, чтобы сработали сигналы: клиенту уйдёт
+        одно уведомление с итоговым статусом (см. apps.bot.services.order_status).
+        """
+        changed = 0
+        with transaction.atomic():
+            for order in queryset.exclude(status=status).select_related('user'):
+                order.status = status
+                order.save(update_fields=['status', 'updated_at'])
+                changed += 1
+        self.message_user(request, f'Статус «{status.label}» установлен для {changed} заказов')
+
+    @admin.action(description='Статус: подтверждён')
+    def mark_confirmed(self, request, queryset):
+        self._set_status(request, queryset, OrderStatus.CONFIRMED)
+
+    @admin.action(description='Статус: готовится')
+    def mark_in_progress(self, request, queryset):
+        self._set_status(request, queryset, OrderStatus.IN_PROGRESS)
+
+    @admin.action(description='Статус: доставляется')
+    def mark_delivering(self, request, queryset):
+        self._set_status(request, queryset, OrderStatus.DELIVERING)
+
+    @admin.action(description='Статус: выполнен')
+    def mark_done(self, request, queryset):
+        self._set_status(request, queryset, OrderStatus.DONE)
+
     @display(description='№')
     def show_id(self, obj):
         return format_html(
@@ -114,6 +114,13 @@ class Order(TimeStampedModel):
     def __str__(self):
         return f"Заказ #{self.pk} - {self.customer_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Статус на момент загрузки: по нему сигналы замечают смену статуса
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     @property
     def total_display(self) -> str:
         """Итого для отображения."""
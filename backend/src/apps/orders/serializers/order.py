@@ -1,4 +1,5 @@
 """Order serializers."""
+from django.db import transaction
 from rest_framework import serializers
 
 from apps.orders.models import Order, OrderItem, OrderStatus, PaymentMethod
@@ -151,8 +152,9 @@ class OrderCreateSerializer(serializers.Serializer):
         
         return items
 
+    @transaction.atomic
     def create(self, validated_data):
-        """Создаём заказ с позициями."""
+        """Создаём заказ с позициями (одной транзакцией вместе с уведомлением)."""
         user = self.context['request'].user
         items_data = validated_data.pop('items')
 
@@ -165,6 +167,8 @@ class OrderCreateSerializer(serializers.Serializer):
 
         # Создаём позиции со snapshot
         order_items = []
+        # Фото первой позиции уходит в Telegram вместе с подтверждением
+        photo = None
         for item_data in items_data:
             product = products[item_data['product_id']]
             main_image = product.images.filter(is_main=True).first() or product.images.first()
@@ -179,6 +183,7 @@ class OrderCreateSerializer(serializers.Serializer):
                 image_url=main_image.image.url if main_image else '',
             )
             order_items.append(order_item)
+            photo = photo or main_image
 
             # Уменьшаем остаток
             if not product.is_unlimited:
@@ -189,17 +194,17 @@ class OrderCreateSerializer(serializers.Serializer):
         order.calculate_totals()
         order.save()
 
-        # Отправляем уведомление в Telegram
-        self._send_order_notification(user, order, order_items)
+        # Уведомление в Telegram уйдёт через outbox после коммита
+        self._send_order_notification(user, order, order_items, photo)
 
         return order
 
-    def _send_order_notification(self, user, order, order_items):
-        """Отправить уведомление о заказе в Telegram."""
+    def _send_order_notification(self, user, order, order_items, photo=None):
+        """Поставить уведомление о заказе в Telegram в outbox."""
         if not user.telegram_id:
             return
 
-        from apps.bot.tasks import send_order_notification_task
+        from apps.bot.services.notifications import enqueue_order_notification
 
         # Формируем данные о позициях
         items = [
@@ -223,8 +228,8 @@ class OrderCreateSerializer(serializers.Serializer):
         elif order.delivery_time_from:
             delivery_time = f"с {order.delivery_time_from.strftime('%H:%M')}"
 
-        # Запускаем задачу
-        send_order_notification_task.delay(
+        # Пишем в outbox в той же транзакции, что и заказ
+        enqueue_order_notification(
             telegram_id=user.telegram_id,
             order_id=order.id,
             items=items,
@@ -233,4 +238,5 @@ class OrderCreateSerializer(serializers.Serializer):
             delivery_address=order.delivery_address,
             delivery_date=delivery_date,
             delivery_time=delivery_time,
+            image_id=photo.pk if photo else None,
         )
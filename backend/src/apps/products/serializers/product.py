@@ -56,11 +56,14 @@ class ProductListSerializer(serializers.ModelSerializer):
         return obj.old_price is not None and obj.old_price > obj.price
 
     def get_main_image(self, obj) -> str | None:
-        main = obj.images.filter(is_main=True).first()
+        # Фото берём из prefetch_related (без запроса на каждый товар,
+        # иначе async-представления упадут на sync ORM)
+        images = list(obj.images.all())
+        main = next((image for image in images if image.is_main), None)
         if main and main.image:
             return main.image.url
-        # Fallback на первое фото
-        first = obj.images.first()
+        # Fallback на первое фото (сортировка модели: главное первым)
+        first = images[0] if images else None
         if first and first.image:
             return first.image.url
         return None
@@ -0,0 +1,16 @@
+"""Products services."""
+from apps.products.services.catalog import (
+    catalog_page_key,
+    catalog_pages,
+    categories_with_counts,
+    category_list,
+    invalidate_catalog,
+)
+
+__all__ = [
+    'catalog_page_key',
+    'catalog_pages',
+    'categories_with_counts',
+    'category_list',
+    'invalidate_catalog',
+]
@@ -0,0 +1,68 @@
+"""
+Cached catalog reads.
+
+The category list (with product counts) and product list pages are the
+most requested API responses and change only when staff edit the
+catalog. They are kept in the 'hot' cache as serialized data, recomputed
+by one worker at a time (apps.core.services.computation) and dropped by
+catalog save/delete signals; CATALOG_CACHE_TTL bounds staleness for
+anything the signals miss. Recomputes read from the primary: the signals
+fire right after commit, when a replica may not have the change yet.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Count
+
+from apps.core.db_router import primary_reads
+from apps.core.services.computation import CachedComputation, cached_computation
+from apps.products.models import Category
+from apps.products.serializers import CategorySerializer
+
+# Product list responses, keyed by host and normalized list parameters
+catalog_pages = CachedComputation(
+    'catalog:products',
+    ttl=settings.CATALOG_CACHE_TTL,
+    stale_ttl=settings.CATALOG_CACHE_STALE_TTL,
+    cache_alias='hot',
+)
+
+
+def catalog_page_key(host: str, params: dict) -> str:
+    """Cache key of a product list response (pagination links contain the host)."""
+    canonical = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    return hashlib.sha1(f'{host}?{canonical}'.encode()).hexdigest()
+
+
+def categories_with_counts() -> models.QuerySet:
+    """Active categories annotated with their active products count."""
+    return (
+        Category.objects
+        .filter(is_active=True)
+        .annotate(
+            products_count=Count(
+                'products',
+                filter=models.Q(products__is_active=True)
+            )
+        )
+        .order_by('sort_order', 'title')
+    )
+
+
+@cached_computation(
+    'catalog:categories',
+    ttl=settings.CATALOG_CACHE_TTL,
+    stale_ttl=settings.CATALOG_CACHE_STALE_TTL,
+    cache_alias='hot',
+)
+def category_list() -> list[dict]:
+    """Serialized active categories with product counts."""
+    with primary_reads():
+        return list(CategorySerializer(categories_with_counts(), many=True).data)
+
+
+def invalidate_catalog() -> None:
+    """Drop cached category lists and product pages (catalog signals)."""
+    category_list.invalidate()
+    catalog_pages.invalidate_all()
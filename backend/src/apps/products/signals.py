@@ -0,0 +1,20 @@
+"""
+Products signals.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.products.models import Category, Product, ProductImage
+from apps.products.services.catalog import invalidate_catalog
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_cached_catalog(sender, **kwargs):
+    """Drop cached category lists and product pages after a catalog change is committed."""
+    transaction.on_commit(invalidate_catalog)
@@ -1,14 +1,13 @@
 """Category views."""
-from django.db import models
-from django.db.models import Count
-from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
-from apps.products.models import Category
+from apps.core.async_views import AsyncReadOnlyModelViewSet
 from apps.products.serializers import CategorySerializer
+from apps.products.services import categories_with_counts, category_list
 
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(AsyncReadOnlyModelViewSet):
     """
     Категории товаров.
     
@@ -21,14 +20,8 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     pagination_class = None  # Категорий мало, пагинация не нужна
 
     def get_queryset(self):
-        return (
-            Category.objects
-            .filter(is_active=True)
-            .annotate(
-                products_count=Count(
-                    'products',
-                    filter=models.Q(products__is_active=True)
-                )
-            )
-            .order_by('sort_order', 'title')
-        )
+        return categories_with_counts()
+
+    async def list(self, request, *args, **kwargs):
+        # Список с подсчётом товаров берём из кэша (см. apps.products.services.catalog)
+        return Response(await category_list.acall())
@@ -2,11 +2,18 @@
 from django.db import models
 from django.db.models import Prefetch
 from django_filters import rest_framework as filters
-from rest_framework import viewsets
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
+from apps.core.async_views import AsyncReadOnlyModelViewSet
+from apps.core.db_router import primary_reads
 from apps.products.models import Product, ProductImage
 from apps.products.serializers import ProductDetailSerializer, ProductListSerializer
+from apps.products.services import catalog_page_key, catalog_pages
+
+# Параметры списка, ответы на которые кэшируются
+CACHED_LIST_PARAMS = {'category', 'min_price', 'max_price', 'in_stock', 'ordering', 'page'}
 
 
 class ProductFilter(filters.FilterSet):
@@ -28,7 +35,7 @@ class ProductFilter(filters.FilterSet):
         return queryset
 
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductViewSet(AsyncReadOnlyModelViewSet):
     """
     Товары.
 
@@ -59,3 +66,41 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         if self.action == 'retrieve':
             return ProductDetailSerializer
         return ProductListSerializer
+
+    async def list(self, request, *args, **kwargs):
+        key = self._list_cache_key(request)
+        if key is None:
+            return await super().list(request, *args, **kwargs)
+        return Response(await catalog_pages.aget_or_compute(key, self._list_data))
+
+    def _list_cache_key(self, request):
+        """
+        Ключ кэша страницы каталога: нормализованные фильтры, сортировка и номер страницы.
+
+        None — ответ не кэшируется. Поиск почти не повторяется, а посторонние
+        или невалидные параметры плодили бы ключи, вытесняющие страницы
+        каталога (и попадали бы в закэшированные ссылки пагинации).
+        """
+        params = request.query_params
+        page = params.get('page', '1')
+        if not set(params) <= CACHED_LIST_PARAMS or not page.isdigit():
+            return None
+        filterset = self.filterset_class(params, queryset=Product.objects.none(), request=request)
+        if not filterset.is_valid():
+            return None
+
+        normalized = {name: value for name, value in filterset.form.cleaned_data.items() if value not in (None, '')}
+        normalized['ordering'] = ','.join(OrderingFilter().get_ordering(request, Product.objects.none(), self))
+        normalized['page'] = int(page)
+        return catalog_page_key(request.get_host(), normalized)
+
+    def _list_data(self):
+        """Данные ответа списка (sync: фильтры, пагинация и сериализация)."""
+        # Сразу после правки каталога реплика может ещё не догнать primary
+        with primary_reads():
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data).data
+            return self.get_serializer(queryset, many=True).data
@@ -0,0 +1,133 @@
+"""
+Django management command to benchmark Mini App login under a burst.
+
+Simulates many users opening the Mini App at once (e.g. right after a
+broadcast): every open validates initData, resolves the user and issues
+JWT tokens, like TelegramAuthView. Users are created before the burst,
+so it measures returning users.
+
+    python manage.py benchlogin --users 500 --opens 5000 -c 32
+    python manage.py benchlogin --users 500 --opens 5000 -c 32 --baseline
+"""
+import hashlib
+import hmac
+import json
+import queue
+import random
+import statistics
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.models import User
+from apps.users.services import TelegramUser, record_login, sync_telegram_user, validate_init_data
+
+
+def _sign_init_data(telegram_user: dict) -> str:
+    """initData as Telegram would send it, signed with the configured bot token."""
+    data = {
+        'auth_date': str(int(time.time())),
+        'query_id': f'bench{telegram_user["id"]}',
+        'user': json.dumps(telegram_user, separators=(',', ':')),
+    }
+    secret_key = hmac.new(b'WebAppData', settings.TELEGRAM_BOT_TOKEN.encode(), hashlib.sha256).digest()
+    data_check_string = '\n'.join(f'{key}={value}' for key, value in sorted(data.items()))
+    data['hash'] = hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(data)
+
+
+def _baseline_sync(telegram_user: TelegramUser) -> tuple[User, bool]:
+    """Previous behaviour: update_or_create on every launch."""
+    return User.objects.update_or_create(
+        telegram_id=telegram_user.id,
+        defaults={
+            'first_name': telegram_user.first_name,
+            'last_name': telegram_user.last_name,
+            'username': telegram_user.username or f'tg_{telegram_user.id}',
+        },
+    )
+
+
+class Command(BaseCommand):
+    """Measure login throughput and latency for a burst of concurrent app opens."""
+
+    help = 'Benchmark Telegram Mini App login under concurrent app opens'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Distinct users')
+        parser.add_argument('--opens', type=int, default=2000, help='Total app opens')
+        parser.add_argument('-c', '--concurrency', type=int, default=32, help='Concurrent logins')
+        parser.add_argument('--changed', type=float, default=0.0, help='Share of opens with a changed profile')
+        parser.add_argument('--baseline', action='store_true', help='Use update_or_create like before')
+        parser.add_argument('--first-id', type=int, default=8_000_000_000, help='First synthetic telegram_id')
+        parser.add_argument('--keep-users', action='store_true', help='Do not delete created users')
+
+    def handle(self, *args, **options):
+        if not settings.TELEGRAM_BOT_TOKEN:
+            raise CommandError('TELEGRAM_BOT_TOKEN is required to sign initData')
+
+        sync = _baseline_sync if options['baseline'] else sync_telegram_user
+        ids = range(options['first_id'], options['first_id'] + options['users'])
+        rng = random.Random(42)
+
+        try:
+            # Users exist before the burst, as after a broadcast
+            for telegram_id in ids:
+                sync(TelegramUser.from_dict({'id': telegram_id, 'first_name': 'Bench', 'username': f'b{telegram_id}'}))
+
+            opens = queue.Queue()
+            for n in range(options['opens']):
+                telegram_id = rng.choice(ids)
+                first_name = f'Bench{n}' if rng.random() < options['changed'] else 'Bench'
+                opens.put(_sign_init_data({'id': telegram_id, 'first_name': first_name, 'username': f'b{telegram_id}'}))
+
+            latencies, elapsed = self._burst(opens, sync, options['concurrency'], options['baseline'])
+        finally:
+            if not options['keep_users']:
+                User.objects.filter(telegram_id__in=list(ids)).delete()
+
+        latencies.sort()
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        mode = 'baseline (update_or_create)' if options['baseline'] else 'read-first'
+        self.stdout.write(
+            f"{mode}: {len(latencies)} logins, concurrency {options['concurrency']}: "
+            f"{elapsed:.2f}s ({len(latencies) / elapsed:.1f} logins/s), "
+            f"p50={statistics.median(latencies):.1f} ms, p99={p99:.1f} ms"
+        )
+
+    def _burst(self, opens: queue.Queue, sync, concurrency: int, baseline: bool) -> tuple[list[float], float]:
+        latencies: list[float] = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        init_data = opens.get_nowait()
+                    except queue.Empty:
+                        return
+                    started = time.perf_counter()
+                    # Same steps as TelegramAuthView.post
+                    validated = validate_init_data(init_data)
+                    user, _ = sync(validated.user)
+                    if not baseline:
+                        record_login(user.pk)
+                    refresh = RefreshToken.for_user(user)
+                    str(refresh.access_token)
+                    with lock:
+                        latencies.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, time.perf_counter() - started
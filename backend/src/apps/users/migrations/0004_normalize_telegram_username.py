@@ -0,0 +1,25 @@
+# Generated by Django 5.2.10 on 2026-10-19 10:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def lowercase_telegram_usernames(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    User.objects.exclude(telegram_username='').update(telegram_username=Lower('telegram_username'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_add_terms_accepted'),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_telegram_usernames, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='users_user_username_lower_idx'),
+        ),
+    ]
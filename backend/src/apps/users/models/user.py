@@ -1,6 +1,7 @@
 """User model placeholder."""
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class User(AbstractUser):
@@ -37,3 +38,14 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            # Регистронезависимый поиск по username (рассылки по @username)
+            models.Index(Lower('username'), name='users_user_username_lower_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Username в Telegram регистронезависим — храним в нижнем регистре,
+        # чтобы искать по индексу через IN (...) без iexact
+        if self.telegram_username:
+            self.telegram_username = self.telegram_username.lstrip('@').lower()
+        super().save(*args, **kwargs)
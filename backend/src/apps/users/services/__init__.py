@@ -11,6 +11,13 @@ from apps.users.services.telegram import (
     get_telegram_auth_service,
     validate_init_data,
 )
+from apps.users.services.init_data_cache import (
+    CachedInitData,
+    InitDataCache,
+    get_init_data_cache,
+)
+from apps.users.services.login import flush_last_login, record_login, sync_telegram_user
+from apps.users.services.user_cache import get_cached_user, invalidate_user
 
 __all__ = [
     'TelegramAuthService',
@@ -23,4 +30,12 @@ __all__ = [
     'ValidatedInitData',
     'get_telegram_auth_service',
     'validate_init_data',
+    'CachedInitData',
+    'InitDataCache',
+    'get_init_data_cache',
+    'flush_last_login',
+    'record_login',
+    'sync_telegram_user',
+    'get_cached_user',
+    'invalidate_user',
 ]
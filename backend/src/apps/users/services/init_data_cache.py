@@ -0,0 +1,123 @@
+"""
+Cache of validated Telegram initData.
+
+The Mini App sends the same initData string with every request of a
+session. Once it has been validated, its SHA-256 maps to the user id and
+the parsed Telegram user, so repeat requests skip parsing, the HMAC check
+and the user get_or_create.
+
+Two tiers: a per-process LRU (dictionary lookup) in front of the shared
+Django cache (Redis). Entries expire together with the initData itself,
+at auth_date + TELEGRAM_AUTH_TIMEOUT.
+"""
+import hashlib
+import logging
+import time
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.services.lru import LocalLRU
+from apps.users.services.telegram import TelegramUser, ValidatedInitData
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedInitData:
+    """Validated initData remembered for its remaining lifetime."""
+    user_id: int
+    telegram_user: TelegramUser
+    auth_date: int
+    expires_at: float
+
+
+class InitDataCache:
+    """Maps validated initData strings to users, per process and in Redis."""
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        auth_timeout: int | None = None,
+        prefix: str = 'users:init_data:',
+    ):
+        self.maxsize = maxsize or settings.TELEGRAM_INIT_DATA_CACHE_SIZE
+        self.auth_timeout = auth_timeout or settings.TELEGRAM_AUTH_TIMEOUT
+        self.prefix = prefix
+        self._local = LocalLRU(self.maxsize)
+
+    def _digest(self, init_data: str) -> str:
+        # Whole string, so no field can be changed under a cached signature
+        return hashlib.sha256(init_data.encode('utf-8')).hexdigest()
+
+    def get(self, init_data: str) -> CachedInitData | None:
+        """Cached entry for an initData string that was validated before."""
+        digest = self._digest(init_data)
+        entry = self._local.get(digest)
+        if entry is not None:
+            return entry
+
+        try:
+            stored = cache.get(f'{self.prefix}{digest}')
+        except Exception as e:
+            logger.warning(f"initData cache unavailable: {e}")
+            return None
+        if not stored:
+            return None
+
+        entry = CachedInitData(
+            user_id=stored['user_id'],
+            telegram_user=TelegramUser(**stored['telegram_user']),
+            auth_date=stored['auth_date'],
+            expires_at=stored['auth_date'] + self.auth_timeout,
+        )
+        if entry.expires_at <= time.time():
+            return None
+        self._local.set(digest, entry, entry.expires_at)
+        return entry
+
+    def set(self, init_data: str, validated: ValidatedInitData, user_id: int) -> None:
+        """Remember a successfully validated initData string."""
+        expires_at = validated.auth_date + self.auth_timeout
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            return
+
+        digest = self._digest(init_data)
+        entry = CachedInitData(
+            user_id=user_id,
+            telegram_user=validated.user,
+            auth_date=validated.auth_date,
+            expires_at=expires_at,
+        )
+        self._local.set(digest, entry, expires_at)
+        try:
+            cache.set(
+                f'{self.prefix}{digest}',
+                {'user_id': user_id, 'telegram_user': asdict(validated.user), 'auth_date': validated.auth_date},
+                timeout=ttl,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache initData: {e}")
+
+    def delete(self, init_data: str) -> None:
+        """Forget an initData string (e.g. its user no longer exists)."""
+        digest = self._digest(init_data)
+        self._local.pop(digest)
+        try:
+            cache.delete(f'{self.prefix}{digest}')
+        except Exception as e:
+            logger.warning(f"Failed to drop cached initData: {e}")
+
+
+# Singleton instance for convenience
+_cache: InitDataCache | None = None
+
+
+def get_init_data_cache() -> InitDataCache:
+    """Get or create the initData cache singleton."""
+    global _cache
+    if _cache is None:
+        _cache = InitDataCache()
+    return _cache
@@ -0,0 +1,90 @@
+"""
+Mini App login without needless writes.
+
+A Mini App launch used to run update_or_create (SELECT ... FOR UPDATE and
+an UPDATE) even when nothing changed, serializing concurrent logins on the
+user row. Now the user is read first and only changed fields are written.
+
+last_login is not written during the request: logins are buffered in a
+Redis hash and applied in one bulk UPDATE by the users.flush_last_login
+beat task.
+"""
+import logging
+from datetime import UTC, datetime
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.core.redis_clients import get_redis
+from apps.users.models import User
+from apps.users.services.telegram import TelegramUser
+
+logger = logging.getLogger(__name__)
+
+LAST_LOGIN_KEY = 'users:last_login'
+
+
+def _profile_fields(telegram_user: TelegramUser) -> dict:
+    return {
+        'first_name': telegram_user.first_name,
+        'last_name': telegram_user.last_name,
+        'username': telegram_user.username or f'tg_{telegram_user.id}',
+    }
+
+
+def sync_telegram_user(telegram_user: TelegramUser) -> tuple[User, bool]:
+    """
+    Get or create the user for a Telegram login, updating changed fields only.
+
+    Returns (user, created). An unchanged profile costs one indexed SELECT.
+    """
+    fields = _profile_fields(telegram_user)
+    user = User.objects.filter(telegram_id=telegram_user.id).first()
+
+    if user is None:
+        try:
+            with transaction.atomic():
+                return User.objects.create(telegram_id=telegram_user.id, **fields), True
+        except IntegrityError:
+            # Concurrent first launch created it meanwhile
+            user = User.objects.filter(telegram_id=telegram_user.id).first()
+            if user is None:
+                raise
+
+    changed = [name for name, value in fields.items() if getattr(user, name) != value]
+    if changed:
+        for name in changed:
+            setattr(user, name, fields[name])
+        user.save(update_fields=changed)
+    return user, False
+
+
+def record_login(user_id: int, at: datetime | None = None) -> None:
+    """Buffer a login; the latest one per user wins."""
+    at = at or timezone.now()
+    try:
+        get_redis().hset(LAST_LOGIN_KEY, str(user_id), at.timestamp())
+    except Exception as e:
+        # last_login is informational, never fail a login over it
+        logger.warning(f"Failed to buffer last_login for user {user_id}: {e}")
+
+
+def flush_last_login() -> int:
+    """Write buffered logins to the database. Returns the number of users updated."""
+    client = get_redis()
+    with client.pipeline(transaction=True) as pipe:
+        pipe.hgetall(LAST_LOGIN_KEY)
+        pipe.delete(LAST_LOGIN_KEY)
+        buffered, _ = pipe.execute()
+
+    if not buffered:
+        return 0
+
+    users = [
+        User(pk=int(user_id), last_login=datetime.fromtimestamp(float(ts), tz=UTC))
+        for user_id, ts in buffered.items()
+    ]
+    # One UPDATE ... CASE per batch; users deleted meanwhile simply match no row
+    User.objects.bulk_update(users, ['last_login'], batch_size=1000)
+    logger.info(f"Flushed last_login for {len(users)} users")
+    return len(users)
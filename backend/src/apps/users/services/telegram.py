@@ -99,6 +99,12 @@ class TelegramAuthService:
         """
         self.bot_token = bot_token or getattr(settings, 'TELEGRAM_BOT_TOKEN', '')
         self.auth_timeout = auth_timeout or getattr(settings, 'TELEGRAM_AUTH_TIMEOUT', 86400)
+        # secret_key = HMAC-SHA256("WebAppData", bot_token) depends only on the token
+        self._secret_key = hmac.new(
+            key=b'WebAppData',
+            msg=self.bot_token.encode('utf-8'),
+            digestmod=hashlib.sha256,
+        ).digest()
 
     def validate(self, init_data: str) -> ValidatedInitData:
         """
@@ -158,7 +164,7 @@ class TelegramAuthService:
         Algorithm:
         1. Sort data alphabetically by key
         2. Create data_check_string: "key1=value1\nkey2=value2\n..."
-        3. secret_key = HMAC-SHA256("WebAppData", bot_token)
+        3. secret_key = HMAC-SHA256("WebAppData", bot_token) (precomputed in __init__)
         4. hash = HMAC-SHA256(secret_key, data_check_string)
         5. Compare with received hash
         """
@@ -168,16 +174,9 @@ class TelegramAuthService:
             for key, value in sorted(data.items())
         )
 
-        # Create secret key: HMAC-SHA256 of bot token with "WebAppData" as key
-        secret_key = hmac.new(
-            key=b'WebAppData',
-            msg=self.bot_token.encode('utf-8'),
-            digestmod=hashlib.sha256,
-        ).digest()
-
         # Calculate hash
         calculated_hash = hmac.new(
-            key=secret_key,
+            key=self._secret_key,
             msg=data_check_string.encode('utf-8'),
             digestmod=hashlib.sha256,
         ).hexdigest()
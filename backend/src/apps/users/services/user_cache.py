@@ -0,0 +1,81 @@
+"""
+Cached user lookup for authentication.
+
+Authenticated API calls resolve request.user by primary key on every
+request. Users are kept in a per-process LRU (AUTH_USER_CACHE_LOCAL_TTL
+seconds) in front of the shared Django cache (AUTH_USER_CACHE_TTL
+seconds). User save/delete signals drop both tiers of the current process
+and the shared entry; other processes see the change once their local
+entry expires.
+
+Keys hold only the user id: the token carries no per-user version to key
+on, and a version looked up in Redis would cost the round trip the local
+tier saves. So in other processes a deactivated user, or a token revoked
+by a password change, stays accepted for up to AUTH_USER_CACHE_LOCAL_TTL
+(5 s by default); keep it short.
+"""
+import copy
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.services.lru import LocalLRU
+from apps.users.models import User
+
+logger = logging.getLogger(__name__)
+
+# v1 is the format of the cached value, bump when it changes
+CACHE_KEY = 'users:auth:v1:{user_id}'
+
+_local: LocalLRU | None = None
+
+
+def _local_cache() -> LocalLRU:
+    global _local
+    if _local is None:
+        _local = LocalLRU(settings.AUTH_USER_CACHE_SIZE)
+    return _local
+
+
+def get_cached_user(user_id: int) -> User:
+    """
+    Get a user by primary key through the cache.
+
+    Returns a copy, so request code may change and save it safely.
+
+    Raises:
+        User.DoesNotExist: if there is no such user
+    """
+    # JWT claims carry the id as a string; signals pass the int pk
+    user_id = User._meta.pk.to_python(user_id)
+    local = _local_cache()
+    user = local.get(user_id)
+    if user is not None:
+        return copy.copy(user)
+
+    key = CACHE_KEY.format(user_id=user_id)
+    try:
+        user = cache.get(key)
+    except Exception as e:
+        logger.warning(f"User cache unavailable: {e}")
+
+    if user is None:
+        user = User.objects.get(pk=user_id)
+        try:
+            cache.set(key, user, timeout=settings.AUTH_USER_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Failed to cache user {user_id}: {e}")
+
+    local.set(user_id, user, time.time() + settings.AUTH_USER_CACHE_LOCAL_TTL)
+    return copy.copy(user)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user (after it was saved, deactivated or deleted)."""
+    _local_cache().pop(user_id)
+    try:
+        cache.delete(CACHE_KEY.format(user_id=user_id))
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached user {user_id}: {e}")
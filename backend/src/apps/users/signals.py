@@ -0,0 +1,20 @@
+"""
+Users signals.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users.models import User
+from apps.users.services.user_cache import invalidate_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop the cached user on every change, including deactivation."""
+    invalidate_user(instance.pk)
+    # Again after commit: a concurrent request may have cached the old row meanwhile
+    transaction.on_commit(partial(invalidate_user, instance.pk))
@@ -0,0 +1,6 @@
+"""Users tasks."""
+from apps.users.tasks.last_login import flush_last_login_task
+
+__all__ = [
+    'flush_last_login_task',
+]
@@ -0,0 +1,15 @@
+"""
+Celery tasks for buffered last_login updates.
+"""
+from celery import shared_task
+
+from apps.users.services.login import flush_last_login
+
+
+@shared_task(
+    name='users.flush_last_login',
+    ignore_result=True,
+)
+def flush_last_login_task() -> int:
+    """Apply logins buffered by TelegramAuthView (runs periodically from beat)."""
+    return flush_last_login()
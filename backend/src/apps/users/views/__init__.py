@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from apps.users.models import User
+from apps.core.throttling import TokenBucketThrottle
 from apps.users.serializers import TelegramAuthSerializer, UserSerializer
 from apps.users.services import (
     TelegramAuthError,
@@ -16,6 +16,8 @@ from apps.users.services import (
     HashValidationError,
     AuthDateExpiredError,
     MissingUserDataError,
+    record_login,
+    sync_telegram_user,
     validate_init_data,
 )
 
@@ -57,9 +59,12 @@ class TelegramAuthView(APIView):
     Errors:
         400 - Invalid initData format or missing required fields
         401 - Hash validation failed or auth_date expired
+        429 - Too many requests
         500 - Server configuration error
     """
     permission_classes = [AllowAny]
+    throttle_classes = [TokenBucketThrottle]
+    throttle_scope = 'telegram_auth'
 
     def post(self, request):
         serializer = TelegramAuthSerializer(data=request.data)
@@ -91,15 +96,10 @@ class TelegramAuthView(APIView):
 
         telegram_user = validated.user
 
-        # Создаём или обновляем пользователя
-        user, created = User.objects.update_or_create(
-            telegram_id=telegram_user.id,
-            defaults={
-                'first_name': telegram_user.first_name,
-                'last_name': telegram_user.last_name,
-                'username': telegram_user.username or f'tg_{telegram_user.id}',
-            },
-        )
+        # Создаём пользователя или обновляем только изменившиеся поля
+        user, created = sync_telegram_user(telegram_user)
+        # last_login пишется пачкой задачей users.flush_last_login
+        record_login(user.pk)
 
         if created:
             logger.info(f"New user registered via Telegram: {telegram_user.id}")
@@ -1,8 +1,26 @@
-"""ASGI config for flower shop project."""
+"""
+ASGI config for flower shop project.
+
+Production entry point (uvicorn workers, see Dockerfile). Lifespan hooks
+run once per worker on its event loop.
+"""
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Apps are loaded only after get_asgi_application()
+from apps.bot.services import close_async_telegram_client  # noqa: E402
+from apps.bot.views import shutdown_application, warm_application  # noqa: E402
+from apps.core.lifespan import LifespanMiddleware  # noqa: E402
+from apps.core.redis_clients import close_async_redis  # noqa: E402
+from apps.core.services.pages import warm_pages  # noqa: E402
+
+application = LifespanMiddleware(
+    django_application,
+    on_startup=[warm_application, warm_pages],
+    on_shutdown=[shutdown_application, close_async_telegram_client, close_async_redis],
+)
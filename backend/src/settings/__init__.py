@@ -38,6 +38,9 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').exists() else []
 
+# Precomputed OpenAPI schema (python manage.py buildschema, run at image build)
+OPENAPI_SCHEMA_DIR = BASE_DIR / 'schema'
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
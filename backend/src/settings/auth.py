@@ -22,3 +22,8 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
+
+# Cached user resolution for authenticated requests (apps.users.services.user_cache)
+AUTH_USER_CACHE_TTL = env.int('AUTH_USER_CACHE_TTL', default=300)  # seconds in Redis
+AUTH_USER_CACHE_LOCAL_TTL = env.int('AUTH_USER_CACHE_LOCAL_TTL', default=5)  # seconds in process memory
+AUTH_USER_CACHE_SIZE = env.int('AUTH_USER_CACHE_SIZE', default=10000)
@@ -6,9 +6,28 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
         'LOCATION': REDIS_URL,
-    }
+    },
+    # Small, very hot values: per-process LRU in front of Redis, evicted in
+    # every process over pub/sub (apps.core.cache). Not for locks or sessions.
+    'hot': {
+        'BACKEND': 'apps.core.cache.TwoTierRedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'hot',
+        'OPTIONS': {
+            'LOCAL_MAX_ENTRIES': env.int('HOT_CACHE_LOCAL_MAX_ENTRIES', default=1000),
+            # Upper bound on local staleness if an invalidation is missed
+            'LOCAL_TIMEOUT': env.int('HOT_CACHE_LOCAL_TIMEOUT', default=60),
+        },
+    },
 }
 
+# Stampede-safe cached computations (apps.core.services.computation), seconds.
+# After the TTL a value is served stale for up to STALE_TTL while one worker
+# recomputes it. Catalog entries are also dropped by catalog signals.
+CATALOG_CACHE_TTL = env.int('CATALOG_CACHE_TTL', default=60)
+CATALOG_CACHE_STALE_TTL = env.int('CATALOG_CACHE_STALE_TTL', default=300)
+ANALYTICS_WIDGET_CACHE_TTL = env.int('ANALYTICS_WIDGET_CACHE_TTL', default=300)
+
 # Session backend
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -1,6 +1,7 @@
 from celery.schedules import crontab
 
 from settings.environment import env
+from settings.telegram import BROADCAST_SCHEDULER_TICK
 
 # Celery Configuration
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/1')
@@ -38,4 +39,19 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(hour=3, minute=0, day_of_week='sunday'),
         'kwargs': {'days': 90},
     },
+    # Досылка уведомлений из outbox, если задача после коммита не запустилась
+    'dispatch-notification-outbox': {
+        'task': 'bot.dispatch_notification_outbox',
+        'schedule': 30.0,
+    },
+    # Запись буферизованных last_login одним UPDATE
+    'flush-last-login': {
+        'task': 'users.flush_last_login',
+        'schedule': 60.0,
+    },
+    # Запуск запланированных рассылок и отправка очередной порции по окнам/лимитам
+    'run-scheduled-broadcasts': {
+        'task': 'bot.run_scheduled_broadcasts',
+        'schedule': float(BROADCAST_SCHEDULER_TICK),
+    },
 }
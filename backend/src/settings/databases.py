@@ -1,16 +1,54 @@
 from settings.environment import env
 
-DATABASES = {
-    'default': {
+# psycopg3 connection pool, one per process and alias (Django 5.1+).
+# Replaces persistent connections, which ASGI can't reuse (every request runs
+# its ORM calls in a new thread). Size it per service: API workers serve
+# concurrent requests, a Celery prefork child runs one task at a time.
+DB_POOL_ENABLED = env.bool('DB_POOL_ENABLED', default=True)
+DB_POOL_OPTIONS = {
+    'min_size': env.int('DB_POOL_MIN_SIZE', default=2),
+    'max_size': env.int('DB_POOL_MAX_SIZE', default=10),
+    # Seconds to wait for a free connection before raising
+    'timeout': env.float('DB_POOL_TIMEOUT', default=10),
+}
+
+
+def _database(host: str, port: int) -> dict:
+    options = {'connect_timeout': 10}
+    if DB_POOL_ENABLED:
+        options['pool'] = dict(DB_POOL_OPTIONS)
+    return {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': env('DB_NAME', default='flower_shop'),
         'USER': env('DB_USER', default='postgres'),
         'PASSWORD': env('DB_PASSWORD', default='postgres'),
-        'HOST': env('DB_HOST', default='localhost'),
-        'PORT': env.int('DB_PORT', default=5432),
-        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
-        'OPTIONS': {
-            'connect_timeout': 10,
-        },
+        'HOST': host,
+        'PORT': port,
+        # A pool doesn't work with persistent connections
+        'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else env.int('DB_CONN_MAX_AGE', default=60),
+        'OPTIONS': options,
     }
+
+
+DATABASES = {
+    'default': _database(env('DB_HOST', default='localhost'), env.int('DB_PORT', default=5432)),
 }
+
+# Optional streaming replica for reads (apps.core.db_router.ReplicaRouter)
+DB_REPLICA_HOST = env('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **_database(DB_REPLICA_HOST, env.int('DB_REPLICA_PORT', default=DATABASES['default']['PORT'])),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['apps.core.db_router.ReplicaRouter']
+
+# Models read from the replica: 'app_label' or 'app_label.Model'.
+# Catalog (not favorites, which users write) and analytics (admin dashboards, reports).
+DATABASE_REPLICA_READS = [
+    'products.Category',
+    'products.Product',
+    'products.ProductImage',
+    'analytics',
+]
@@ -1,6 +1,8 @@
+from settings.environment import env
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.CachedJWTAuthentication',
         'apps.core.authentication.TelegramAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -22,6 +24,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'apps.core.exceptions.custom_exception_handler',
+    # Proxies in front of the API (nginx): the client IP for throttling is the
+    # address the last of them appended to X-Forwarded-For, not one the client sent
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=1),
 }
 
 # DRF Spectacular (OpenAPI/Swagger)
@@ -33,3 +38,21 @@ SPECTACULAR_SETTINGS = {
     'SCHEMA_PATH_PREFIX': r'/api/v1/',
     'COMPONENT_SPLIT_REQUEST': True,
 }
+
+# Redis token-bucket throttling (apps.core.throttling.TokenBucketThrottle), per view throttle_scope.
+# 'client' buckets are keyed by user / session_id / IP, 'ip' buckets by IP only;
+# capacity = burst, per_minute = refill rate (> 0). A request needs a token from every bucket.
+THROTTLE_ENABLED = env.bool('THROTTLE_ENABLED', default=True)
+THROTTLE_BUCKETS = {
+    'analytics_track': {
+        'client': {'capacity': 60, 'per_minute': 120},
+        'ip': {'capacity': 300, 'per_minute': 1200},
+    },
+    'analytics_batch': {
+        'client': {'capacity': 10, 'per_minute': 30},
+        'ip': {'capacity': 60, 'per_minute': 300},
+    },
+    'telegram_auth': {
+        'ip': {'capacity': 30, 'per_minute': 120},
+    },
+}
@@ -9,3 +9,56 @@ TELEGRAM_MINI_APP_URL = env('TELEGRAM_MINI_APP_URL', default='')
 
 # Init data validation
 TELEGRAM_AUTH_TIMEOUT = env.int('TELEGRAM_AUTH_TIMEOUT', default=86400)  # 24 hours
+# Validated initData kept in the per-process LRU (entries also live in Redis until initData expires)
+TELEGRAM_INIT_DATA_CACHE_SIZE = env.int('TELEGRAM_INIT_DATA_CACHE_SIZE', default=10000)
+
+# Conversation state store for the bot (webhook mode).
+# Use 'apps.bot.services.conversation.DatabaseConversationStore' to keep state in Postgres.
+TELEGRAM_CONVERSATION_STORE = env(
+    'TELEGRAM_CONVERSATION_STORE',
+    default='apps.bot.services.conversation.RedisConversationStore',
+)
+TELEGRAM_CONVERSATION_TTL = env.int('TELEGRAM_CONVERSATION_TTL', default=86400)  # 24 hours
+
+# Inline mode search index: seconds a process trusts its index before checking the catalog version
+TELEGRAM_INLINE_INDEX_CHECK_INTERVAL = env.int('TELEGRAM_INLINE_INDEX_CHECK_INTERVAL', default=10)
+
+# Webhook update deduplication: update_ids are kept for Telegram's redelivery window;
+# an in-flight claim expires after TELEGRAM_UPDATE_CLAIM_TTL if the worker dies
+TELEGRAM_UPDATE_DEDUP_TTL = env.int('TELEGRAM_UPDATE_DEDUP_TTL', default=86400)  # 24 hours
+TELEGRAM_UPDATE_CLAIM_TTL = env.int('TELEGRAM_UPDATE_CLAIM_TTL', default=120)
+
+# Per-user token buckets for webhook updates (apps.bot.services.ratelimit).
+# Rules: 'command:<name>', 'command', update type ('message', 'inline_query', ...), 'default';
+# the most specific configured rule applies. capacity = burst, per_minute = refill rate (> 0).
+# Set a rule to None to leave it unlimited.
+TELEGRAM_RATE_LIMIT_ENABLED = env.bool('TELEGRAM_RATE_LIMIT_ENABLED', default=True)
+TELEGRAM_RATE_LIMITS = {
+    'command:start': {'capacity': 3, 'per_minute': 6},
+    'command': {'capacity': 5, 'per_minute': 20},
+    'inline_query': {'capacity': 20, 'per_minute': 120},
+    'message': {'capacity': 10, 'per_minute': 30},
+    'default': {'capacity': 20, 'per_minute': 60},
+}
+
+# Bot API HTTP client (apps.bot.services.telegram_api)
+TELEGRAM_API_BASE_URL = env('TELEGRAM_API_BASE_URL', default='https://api.telegram.org')
+TELEGRAM_API_TIMEOUT = env.float('TELEGRAM_API_TIMEOUT', default=30.0)
+TELEGRAM_API_CONNECT_TIMEOUT = env.float('TELEGRAM_API_CONNECT_TIMEOUT', default=5.0)
+TELEGRAM_API_MAX_RETRIES = env.int('TELEGRAM_API_MAX_RETRIES', default=3)
+TELEGRAM_API_RETRY_BACKOFF = env.float('TELEGRAM_API_RETRY_BACKOFF', default=0.5)  # seconds, doubled per attempt
+TELEGRAM_API_POOL_SIZE = env.int('TELEGRAM_API_POOL_SIZE', default=10)
+# Longer 429 retry_after values are returned to the caller instead of waited out
+TELEGRAM_API_MAX_RETRY_AFTER = env.int('TELEGRAM_API_MAX_RETRY_AFTER', default=5)  # seconds
+
+# Notification outbox (apps.bot.services.outbox)
+NOTIFICATION_OUTBOX_BATCH_SIZE = env.int('NOTIFICATION_OUTBOX_BATCH_SIZE', default=100)
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = env.int('NOTIFICATION_OUTBOX_MAX_ATTEMPTS', default=5)
+NOTIFICATION_OUTBOX_RATE_LIMIT = env.float('NOTIFICATION_OUTBOX_RATE_LIMIT', default=25.0)  # messages per second
+# A claimed batch is re-claimed after this long if its dispatcher died
+NOTIFICATION_OUTBOX_LEASE = env.int('NOTIFICATION_OUTBOX_LEASE', default=300)  # seconds
+# Order status notifications wait this long; later status changes replace the pending one
+ORDER_STATUS_NOTIFICATION_DELAY = env.int('ORDER_STATUS_NOTIFICATION_DELAY', default=60)  # seconds
+
+# Scheduled / windowed broadcasts: beat tick of bot.run_scheduled_broadcasts (seconds)
+BROADCAST_SCHEDULER_TICK = env.int('BROADCAST_SCHEDULER_TICK', default=60)